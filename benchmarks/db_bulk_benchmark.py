@@ -0,0 +1,104 @@
+"""
+Row-at-a-time vs bulk insert throughput against the configured database.
+
+Inserts synthetic places and reviews both ways inside a transaction that
+is rolled back afterwards, so the tables are left untouched.
+
+    python benchmarks/db_bulk_benchmark.py --places 2000 --reviews-per-place 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from config.db_handler import DatabaseHandler
+from utils.logging_setup import setup_logging
+
+
+def make_places(count, tag):
+    now = datetime.now()
+    return [{
+        'name': f"bench-{tag}-{i}",
+        'address': f"{i} Benchmark Road",
+        'phone': f"+91 484 {i:07d}",
+        'rating': round(1 + (i % 40) / 10, 1),
+        'review_count': i,
+        'category': 'benchmark',
+        'scraped_at': now,
+        'latitude': 9.9 + i / 1e6,
+        'longitude': 76.2 + i / 1e6,
+    } for i in range(count)]
+
+
+def make_reviews(place_ids, per_place):
+    now = datetime.now()
+    return [{
+        'place_id': place_id,
+        'author': f"author-{n}",
+        'rating': 4.0,
+        'text': f"review {n} for place {place_id}",
+        'date': 'a week ago',
+        'images': [],
+        'scraped_at': now,
+    } for place_id in place_ids for n in range(per_place)]
+
+
+def row_at_a_time(db, places, per_place):
+    place_ids = []
+    for place in places:
+        if not db.place_exists(place['name'], place['latitude'], place['longitude']):
+            place_ids.append(db.insert_place(place))
+    for review in make_reviews(place_ids, per_place):
+        db.cur.execute(
+            "INSERT IGNORE INTO place_reviews (place_id, author, rating, text, date, images, scraped_at) "
+            "VALUES (%(place_id)s, %(author)s, %(rating)s, %(text)s, %(date)s, '[]', %(scraped_at)s)",
+            review
+        )
+    return len(place_ids) * (1 + per_place)
+
+
+def bulk(db, places, per_place):
+    ids, inserted = db.insert_places_bulk(places)
+    reviews = make_reviews(ids.values(), per_place)
+    db.insert_reviews_bulk(reviews)
+    return inserted + len(reviews)
+
+
+def run(label, fn, places, per_place, batch_size):
+    db = DatabaseHandler(batch_size=batch_size)
+    try:
+        start = time.perf_counter()
+        rows = fn(db, places, per_place)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.conn.rollback()
+        db.close()
+    print(f"{label:<15} {rows:>7} rows in {elapsed:7.2f}s  ->  {rows / elapsed:10.0f} rows/sec")
+    return rows / elapsed
+
+
+def main():
+    setup_logging()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--places', type=int, default=1000)
+    parser.add_argument('--reviews-per-place', type=int, default=5)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    tag = uuid.uuid4().hex[:8]
+    print(f"📊 {args.places} places x {args.reviews_per_place} reviews, batch size {args.batch_size}")
+    slow = run('row-at-a-time', row_at_a_time, make_places(args.places, tag + 'a'),
+               args.reviews_per_place, args.batch_size)
+    fast = run('bulk', bulk, make_places(args.places, tag + 'b'),
+               args.reviews_per_place, args.batch_size)
+    print(f"🚀 Bulk speed-up: {fast / slow:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
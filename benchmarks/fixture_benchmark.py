@@ -0,0 +1,405 @@
+"""
+Offline extraction benchmark over saved Google Maps HTML snapshots.
+
+data/fixtures/maps_pages holds a result list and the detail panels of the
+places in it, each with its review and photo panels. A local HTTP server
+stands in for Google Maps. It serves the snapshots under the same paths
+(/maps/search/..., /maps/place/...) and injects replay.js, which makes the
+static lists grow on scroll and opens place links in a side pane. Every
+request for another host is aborted, so nothing goes online.
+
+These stages run against it:
+
+    list      AsyncGoogleMapsScraper._extract_all_businesses on the result list
+    detail    AsyncGoogleMapsScraper._extract_detail_panel_data on every place page
+    reviews   AsyncGoogleMapsScraper._extract_reviews on every place page
+    images    AsyncGoogleMapsScraper._extract_place_images on every place page
+    business  models.business_models.BusinessExtractor on the result list,
+              through Selenium's Chrome driver
+
+Each stage reports places per second and round trips per place (Playwright
+protocol calls, or WebDriver commands for the Selenium stage), plus field
+coverage for the engine stages. The business stage is skipped with a
+warning when Selenium or a Chrome driver is not available; --no-business
+skips it outright.
+
+Round trips are counted by wrapping Playwright's internal
+Channel._inner_send (checked with Playwright 1.64). The benchmark stops
+with a clear error if a Playwright release renames it. Save a run as the baseline, then compare later
+revisions against it:
+
+    python benchmarks/fixture_benchmark.py --save-baseline benchmarks/fixture_baseline.json
+    python benchmarks/fixture_benchmark.py --baseline benchmarks/fixture_baseline.json
+
+To add a snapshot of a live page, save its page.content() as
+place_<slug>.html or search_<slug>.html. The slug is the place name (or
+search query) in lower case, with every run of other characters
+replaced by "_".
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.metadata
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote_plus, urlsplit
+
+from playwright.async_api import async_playwright
+
+try:
+    from playwright._impl._connection import Channel
+except ImportError:  # Internal module, moved in some Playwright release
+    Channel = None
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scraper.coverage import PLACE_FIELDS, FieldCoverage
+from scraper.maps_scraper import AsyncGoogleMapsScraper
+from scraper.waits import RatePolicy
+from utils.logging_setup import setup_logging
+
+FIXTURE_DIR = os.path.join(project_root, 'data', 'fixtures', 'maps_pages')
+STAGES = ('list', 'detail', 'reviews', 'images', 'business')
+
+
+def fixture_slug(text):
+    return re.sub(r'[^a-z0-9]+', '_', unquote_plus(text).lower()).strip('_')
+
+
+class FixtureServer:
+    """Serves the snapshots on 127.0.0.1 under Google Maps style paths"""
+
+    def __init__(self, root=FIXTURE_DIR):
+        self.root = root
+        self.requests = 0
+        self._httpd = None
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_port}"
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def file_for(self, path):
+        """Snapshot file serving a URL path, or None"""
+        parts = [part for part in urlsplit(path).path.split('/') if part]
+        if parts == ['replay.js']:
+            name = 'replay.js'
+        elif parts[:2] == ['maps', 'place'] and len(parts) > 2:
+            name = f"place_{fixture_slug(parts[2])}.html"
+        elif parts[:2] == ['maps', 'search'] and len(parts) > 2:
+            name = f"search_{fixture_slug(parts[2])}.html"
+        elif not parts or parts == ['maps']:
+            searches = self.searches()
+            name = searches[0] if searches else ''
+        else:
+            return None
+        path = os.path.join(self.root, name)
+        return path if name and os.path.isfile(path) else None
+
+    def searches(self):
+        return sorted(name for name in os.listdir(self.root) if name.startswith('search_'))
+
+    def place_paths(self):
+        """/maps/place/ paths linked from the search snapshots, in page order"""
+        paths = []
+        for name in self.searches():
+            with open(os.path.join(self.root, name), encoding='utf-8') as fh:
+                paths += re.findall(r'href="(/maps/place/[^"]+)"', fh.read())
+        return list(dict.fromkeys(path for path in paths if self.file_for(path)))
+
+    def url(self, path):
+        return self.base_url + path
+
+    async def route(self, route):
+        """Context route: the stand-in is reachable, everything else is offline"""
+        if route.request.url.startswith(self.base_url):
+            await route.fallback()
+        else:
+            await route.abort()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                path = server.file_for(self.path)
+                if not path:
+                    self.send_error(404)
+                    return
+                with open(path, 'rb') as fh:
+                    body = fh.read()
+                if path.endswith('.html'):
+                    body = body.replace(b'</body>', b'<script src="/replay.js"></script>\n</body>', 1)
+                    content_type = 'text/html; charset=utf-8'
+                else:
+                    content_type = 'application/javascript'
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class RoundTripCounter:
+    """Counts Playwright protocol calls (client -> browser round trips) while active"""
+
+    # Answering intercepted requests is routing work, not extraction
+    IGNORED = {'continue', 'abort', 'fallback', 'fulfill'}
+
+    def __init__(self):
+        self.calls = 0
+        self._original = None
+
+    def __enter__(self):
+        original = getattr(Channel, '_inner_send', None)
+        if not callable(original):
+            raise RuntimeError(
+                "Cannot count round trips: playwright._impl._connection.Channel._inner_send "
+                f"is missing in Playwright {importlib.metadata.version('playwright')} "
+                "(the counter was written against 1.64)"
+            )
+        self._original = original
+        counter = self
+
+        async def counted(channel, method, *args, **kwargs):
+            if method not in counter.IGNORED:
+                counter.calls += 1
+            return await original(channel, method, *args, **kwargs)
+
+        Channel._inner_send = counted
+        return self
+
+    def __exit__(self, *exc):
+        Channel._inner_send = self._original
+
+
+class CommandCounter:
+    """Counts WebDriver commands (one HTTP round trip each) sent through a driver"""
+
+    def __init__(self, driver):
+        self.calls = 0
+        execute = driver.execute
+
+        def counted(command, params=None):
+            self.calls += 1
+            return execute(command, params)
+
+        # Elements send their commands through the driver too
+        driver.execute = counted
+
+
+class StageStats:
+    """Time and round trips spent in one extraction stage"""
+
+    def __init__(self, name, counter):
+        self.name = name
+        self.counter = counter
+        self.places = 0
+        self.found = 0
+        self.seconds = 0.0
+        self.round_trips = 0
+
+    @contextlib.contextmanager
+    def measure(self):
+        calls, started = self.counter.calls, time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.round_trips += self.counter.calls - calls
+
+    def as_dict(self):
+        return {
+            'places': self.places,
+            'found': self.found,
+            'seconds': round(self.seconds, 3),
+            'places_per_second': round(self.places / self.seconds, 3) if self.seconds else 0.0,
+            'round_trips_per_place': round(self.round_trips / self.places, 1) if self.places else 0.0,
+        }
+
+
+def run_business_stage(server, stats, max_results, headless=True):
+    """Drive BusinessExtractor over the result list with Selenium; False if it cannot run"""
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions
+        from selenium.webdriver.support.ui import WebDriverWait
+        from models.business_models import BusinessExtractor
+    except ImportError as e:
+        print(f"⚠️ Skipping the business stage, Selenium is not installed: {e}")
+        return False
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless=new')
+    # Same as the Playwright stages: only the stand-in server is reachable
+    options.add_argument('--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE 127.0.0.1')
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f"⚠️ Skipping the business stage, Chrome driver did not start: {e}")
+        return False
+
+    try:
+        stats.counter = CommandCounter(driver)
+        extractor = BusinessExtractor()
+        with stats.measure():
+            driver.get(server.url('/maps/search/' + server.searches()[0][len('search_'):-len('.html')]))
+            WebDriverWait(driver, 10).until(
+                expected_conditions.presence_of_element_located((By.CSS_SELECTOR, 'div[role="feed"]'))
+            )
+            elements = extractor.extract_businesses(driver)[:max_results]
+            for index, element in enumerate(elements):
+                stats.places += 1
+                if extractor.extract_business_data(element, index):
+                    stats.found += 1
+    finally:
+        driver.quit()
+    return True
+
+
+async def run_benchmark(mode='list', max_results=20, max_reviews=None, headless=True, business=True):
+    server = FixtureServer().start()
+    engine = AsyncGoogleMapsScraper(headless=headless, extraction_mode=mode, rate_policy=RatePolicy(0, 0),
+                                    extract_images=True, max_reviews=max_reviews)
+    counter = RoundTripCounter()
+    stats = {name: StageStats(name, counter) for name in STAGES}
+    detail_coverage = FieldCoverage()
+
+    # The engine minus its context pool, which would open the real Maps
+    engine.playwright = await async_playwright().start()
+    engine.browser = await engine.playwright.chromium.launch(headless=headless)
+    engine._page_slots = asyncio.Semaphore(engine.concurrency)
+    try:
+        context = await engine._new_context()
+        await context.route('**/*', server.route)
+        page = await context.new_page()
+
+        with counter:
+            stage = stats['list']
+            with stage.measure():
+                await page.goto(server.url('/maps/search/' + server.searches()[0][len('search_'):-len('.html')]))
+                places = await engine._extract_all_businesses(page, max_results, 'fixture', context)
+            stage.places = stage.found = len(places)
+
+            for path in server.place_paths()[:max_results]:
+                url = server.url(path)
+
+                stage = stats['detail']
+                with stage.measure():
+                    await page.goto(url)
+                    if await engine._wait_for_detail_panel(page, stage.places + 1):
+                        data = await engine._extract_detail_panel_data(page, 'fixture')
+                        if data:
+                            detail_coverage.record(data)
+                            stage.found += 1
+                stage.places += 1
+
+                stage = stats['reviews']
+                with stage.measure():
+                    await page.goto(url)
+                    stage.found += len(await engine._extract_reviews(page, None))
+                stage.places += 1
+
+                stage = stats['images']
+                with stage.measure():
+                    await page.goto(url)
+                    stage.found += len(await engine._extract_place_images(page))
+                stage.places += 1
+
+        if business:
+            await asyncio.to_thread(run_business_stage, server, stats['business'], max_results, headless)
+    finally:
+        await engine.browser.close()
+        await engine.playwright.stop()
+        server.stop()
+
+    return {
+        'mode': mode,
+        'stages': {name: stage.as_dict() for name, stage in stats.items()},
+        'coverage': {
+            source: coverage.as_dict() if coverage.places else {}
+            for source, coverage in (('list', engine.coverage), ('detail', detail_coverage))
+        },
+    }
+
+
+def change(now, then):
+    if not then:
+        return ''
+    return f"{100.0 * (now - then) / then:+.0f}%"
+
+
+def report(result, baseline=None):
+    base = (baseline or {}).get('stages', {})
+    print(f"\n🧪 Fixture replay ({result['mode']} mode)")
+    print(f"{'stage':<8} {'places':>6} {'found':>6} {'seconds':>8} {'places/s':>9} {'vs base':>8} "
+          f"{'trips/place':>12} {'vs base':>8}")
+    for name, stage in result['stages'].items():
+        then = base.get(name, {})
+        print(f"{name:<8} {stage['places']:>6} {stage['found']:>6} {stage['seconds']:>8.2f} "
+              f"{stage['places_per_second']:>9.2f} {change(stage['places_per_second'], then.get('places_per_second')):>8} "
+              f"{stage['round_trips_per_place']:>12.1f} "
+              f"{change(stage['round_trips_per_place'], then.get('round_trips_per_place')):>8}")
+
+    base_coverage = (baseline or {}).get('coverage', {})
+    for source, coverage in result['coverage'].items():
+        if not coverage:
+            print(f"\n⚠️ No places extracted in the {source} stage")
+            continue
+        print(f"\n📊 Field coverage, {source} stage (% found / vs base):")
+        for field in PLACE_FIELDS:
+            found = 100.0 - coverage[field]['missing']
+            then = base_coverage.get(source, {}).get(field)
+            delta = f"{found - (100.0 - then['missing']):+.1f}" if then else ''
+            print(f"   {field:<13} {found:5.1f}% {delta:>7}")
+
+
+def main():
+    setup_logging()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', default='list', choices=('click', 'list'))
+    parser.add_argument('--max-results', type=int, default=20)
+    parser.add_argument('--max-reviews', type=int, default=None)
+    parser.add_argument('--headed', action='store_true', help="show the browser")
+    parser.add_argument('--no-business', action='store_true', help="skip the Selenium BusinessExtractor stage")
+    parser.add_argument('--baseline', help="compare with a saved run")
+    parser.add_argument('--save-baseline', metavar='PATH', help="save this run as the baseline")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args.mode, args.max_results, args.max_reviews, headless=not args.headed,
+                                       business=not args.no_business))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+    report(result, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as fh:
+            json.dump(result, fh, indent=2)
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Micro-benchmark of the shared field parsers (utils/parsing.py).
+
+First checks every case of data/fixtures/parsing_cases.json and exits
+non-zero on a mismatch, then times three ways of parsing the same raw
+strings, repeated to the size of a long result list:
+
+    ad hoc    the per-element regexes the extractors used before
+    single    parse_count / parse_rating / ... called once per string
+    batch     parse_batch over the whole list
+
+    python benchmarks/parsing_benchmark.py --repeat 200 --rounds 5
+
+To cover a new format, add a case to the fixture table; tests/test_parsing.py
+asserts every case as well.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utils.parsing import PARSERS, parse_batch
+
+CASES_PATH = os.path.join(project_root, 'data', 'fixtures', 'parsing_cases.json')
+
+
+def load_cases(path=CASES_PATH):
+    with open(path, encoding='utf-8') as fh:
+        cases = json.load(fh)
+    for case in cases:
+        if case['kind'] == 'coordinates':
+            case['expected'] = tuple(case['expected'])
+    return cases
+
+
+def check(cases):
+    """Cases whose parsed value differs from the expected one"""
+    failures = []
+    for case in cases:
+        got = PARSERS[case['kind']](case['input'])
+        if got != case['expected']:
+            failures.append((case, got))
+    return failures
+
+
+# The regexes the extractors ran inline before utils/parsing.py
+def adhoc_count(text):
+    match = re.search(r'(\d{1,3}(?:,\d{3})*|\d+)', text)
+    return int(match.group(1).replace(',', '')) if match else None
+
+
+def adhoc_rating(text):
+    match = re.search(r'(\d+\.?\d*)', text)
+    if match:
+        value = float(match.group(1))
+        return value if 0 <= value <= 5 else None
+    return None
+
+
+def adhoc_phone(text):
+    match = re.search(r'(\+?\d[\d\s\-\(\)]{8,})', text)
+    return match.group(1).strip() if match else None
+
+
+def adhoc_coordinates(text):
+    for pattern in [r'/@(-?\d+\.\d+),(-?\d+\.\d+)', r'/place/[^/]+/@(-?\d+\.\d+),(-?\d+\.\d+)',
+                    r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)']:
+        match = re.search(pattern, text)
+        if match:
+            return float(match.group(1)), float(match.group(2))
+    return None, None
+
+
+ADHOC = {'count': adhoc_count, 'rating': adhoc_rating, 'phone': adhoc_phone, 'coordinates': adhoc_coordinates}
+
+
+def best_of(rounds, run):
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', default=CASES_PATH)
+    parser.add_argument('--repeat', type=int, default=200, help="copies of each fixture input per list")
+    parser.add_argument('--rounds', type=int, default=5, help="timed rounds, best one counts")
+    args = parser.parse_args()
+
+    cases = load_cases(args.cases)
+    failures = check(cases)
+    for case, got in failures:
+        print(f"❌ {case['kind']} {case['input']!r}: expected {case['expected']!r}, got {got!r}")
+    print(f"{'✅' if not failures else '⚠️'} {len(cases) - len(failures)}/{len(cases)} fixture cases parse as expected")
+
+    print(f"\n{'kind':<12} {'values':>7} {'ad hoc µs':>10} {'single µs':>10} {'batch µs':>9} "
+          f"{'ad hoc ok':>10} {'shared ok':>10}")
+    for kind in PARSERS:
+        kind_cases = [case for case in cases if case['kind'] == kind]
+        texts = [case['input'] for case in kind_cases] * args.repeat
+        parse, adhoc = PARSERS[kind], ADHOC[kind]
+
+        timings = [
+            best_of(args.rounds, lambda: [adhoc(text) for text in texts]),
+            best_of(args.rounds, lambda: [parse(text) for text in texts]),
+            best_of(args.rounds, lambda: parse_batch(kind, texts)),
+        ]
+        adhoc_ok = sum(adhoc(case['input']) == case['expected'] for case in kind_cases)
+        shared_ok = sum(parse(case['input']) == case['expected'] for case in kind_cases)
+        per_value = [1e6 * seconds / len(texts) for seconds in timings]
+        print(f"{kind:<12} {len(texts):>7} {per_value[0]:>10.2f} {per_value[1]:>10.2f} {per_value[2]:>9.2f} "
+              f"{adhoc_ok:>5}/{len(kind_cases):<4} {shared_ok:>5}/{len(kind_cases):<4}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Pages per minute: search-and-click vs loading place URLs directly.
+
+Runs one search in click mode, then scrapes the place URLs it found with
+the direct URL mode, and prints the throughput of both. Nothing is stored.
+
+    python benchmarks/place_url_benchmark.py "coffee" "Kochi" --max-results 20 --concurrency 2
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scraper.maps_scraper import AsyncGoogleMapsScraper
+from utils.logging_setup import setup_logging
+
+
+async def timed(places):
+    start = time.perf_counter()
+    results = [place async for place in places]
+    return results, time.perf_counter() - start
+
+
+def rate(count, seconds):
+    return 60 * count / seconds if seconds else 0.0
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('category')
+    parser.add_argument('location')
+    parser.add_argument('--max-results', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--reviews', action='store_true', help="include reviews in the URL run")
+    args = parser.parse_args()
+
+    engine = AsyncGoogleMapsScraper(headless=True, concurrency=args.concurrency, extraction_mode='click')
+    await engine.start()
+    try:
+        searched, search_seconds = await timed(engine.stream_search(args.category, args.location, args.max_results))
+        urls = [place['href'] for place in searched if place.get('href') and '/maps/place/' in place['href']]
+        direct, url_seconds = await timed(engine.stream_places(urls, args.category, reviews=args.reviews))
+    finally:
+        await engine.close()
+
+    print(f"\n{'path':<18} {'places':>7} {'seconds':>8} {'pages/min':>10}")
+    print(f"{'search + click':<18} {len(searched):>7} {search_seconds:>8.1f} {rate(len(searched), search_seconds):>10.1f}")
+    print(f"{'place URLs':<18} {len(direct):>7} {url_seconds:>8.1f} {rate(len(direct), url_seconds):>10.1f}")
+
+
+if __name__ == '__main__':
+    setup_logging()
+    asyncio.run(main())
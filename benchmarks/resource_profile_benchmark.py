@@ -0,0 +1,81 @@
+"""
+Bandwidth, load time and field coverage per resource profile.
+
+Runs the same search once per profile (nothing is stored) and prints the
+bytes loaded, requests blocked, average Maps page-load time, search time
+and the share of places with each field, so a lighter profile can be
+checked for coverage loss before it is made the default.
+
+    python benchmarks/resource_profile_benchmark.py "coffee" "Kochi" --max-results 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scraper.coverage import PLACE_FIELDS
+from scraper.maps_scraper import AsyncGoogleMapsScraper
+from scraper.resource_profile import PROFILES
+from utils.logging_setup import setup_logging
+
+
+async def run_profile(profile, args):
+    engine = AsyncGoogleMapsScraper(
+        headless=True, extraction_mode=args.mode,
+        resource_profile=profile, extract_images=args.images
+    )
+    await engine.start()
+    try:
+        start = time.perf_counter()
+        places = [place async for place in engine.stream_search(args.category, args.location, args.max_results)]
+        elapsed = time.perf_counter() - start
+        stats = engine.resources.metrics()
+        stats.update({
+            'places': len(places),
+            'search_seconds': elapsed,
+            'load_time_avg': engine.contexts.metrics()['load_time_avg'],
+            'coverage': {
+                field: 100.0 - shares['missing'] if places else 0.0
+                for field, shares in engine.coverage.as_dict().items()
+            },
+        })
+        return stats
+    finally:
+        await engine.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('category')
+    parser.add_argument('location')
+    parser.add_argument('--max-results', type=int, default=20)
+    parser.add_argument('--mode', default='click', choices=('click', 'list', 'network'))
+    parser.add_argument('--images', action='store_true', help="let image bytes through")
+    args = parser.parse_args()
+
+    results = {}
+    for profile in PROFILES:
+        print(f"\n📊 Profile '{profile}'")
+        results[profile] = await run_profile(profile, args)
+
+    print(f"\n{'profile':<8} {'KiB':>8} {'blocked':>8} {'load s':>7} {'search s':>9} {'places':>7}")
+    for profile, stats in results.items():
+        print(f"{profile:<8} {stats['bytes_loaded'] / 1024:8.0f} {stats['requests_blocked']:8} "
+              f"{stats['load_time_avg']:7.2f} {stats['search_seconds']:9.2f} {stats['places']:7}")
+
+    print(f"\n{'field':<13}" + ''.join(f"{profile:>8}" for profile in results))
+    for field in PLACE_FIELDS:
+        print(f"{field:<13}" + ''.join(f"{stats['coverage'][field]:7.1f}%" for stats in results.values()))
+
+    baseline, light = results['full'], results['light']
+    print(f"\n🚀 Bytes saved by 'light': {(baseline['bytes_loaded'] - light['bytes_loaded']) / 1024:.0f} KiB")
+
+
+if __name__ == '__main__':
+    setup_logging()
+    asyncio.run(main())
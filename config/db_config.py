@@ -1,19 +1,11 @@
-import os
-from dotenv import load_dotenv
-import mysql.connector
 from mysql.connector import Error
 
-load_dotenv()
+from config.db_pool import get_pool
 
 def get_db_connection():
+    """Check a connection out of the shared pool; close() returns it"""
     try:
-        connection = mysql.connector.connect(
-            host=os.getenv('DB_HOST'),
-            database=os.getenv('DB_NAME'),
-            user=os.getenv('DB_USER'),
-            password=os.getenv('DB_PASSWORD')
-        )
-        return connection
+        return get_pool().get_connection()
     except Error as e:
         print(f"Error connecting to MySQL: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -1,24 +1,64 @@
-import mysql.connector
 from mysql.connector import Error
 import os
 from dotenv import load_dotenv
 import json
 
+from config.db_pool import get_pool
+from utils.image_url import canonical_image_url, image_key
+from utils.logging_setup import get_logger
+from utils.metrics import get_metrics
+from utils.place_key import make_place_key
+from utils.review_key import review_content_key
+
 load_dotenv()
 
+log = get_logger(__name__)
+
+
 class DatabaseHandler:
-    def __init__(self):
+    # Set once the schema additions below are known to exist
+    _schema_ready = False
+
+    # Tables created on first use. Images are keyed by the hash of their
+    # canonical URL, so a photo seen at several sizes, on several places or
+    # in several scrapes is stored once.
+    TABLES = [
+        """
+        CREATE TABLE IF NOT EXISTS images (
+            url_hash CHAR(40) PRIMARY KEY,
+            url TEXT NOT NULL,
+            first_seen DATETIME
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS place_images (
+            place_id INT NOT NULL,
+            url_hash CHAR(40) NOT NULL,
+            scraped_at DATETIME,
+            PRIMARY KEY (place_id, url_hash),
+            FOREIGN KEY (place_id) REFERENCES places(id)
+        )
+        """,
+    ]
+
+    # (table, index name, DDL) triples created on first use
+    INDEXES = [
+        ('places', 'uq_places_place_key', "CREATE UNIQUE INDEX uq_places_place_key ON places (place_key)"),
+        # Keyset pagination in /api/places walks (scraped_at, id) backwards
+        ('places', 'idx_places_scraped_at_id', "CREATE INDEX idx_places_scraped_at_id ON places (scraped_at, id)"),
+        ('place_reviews', 'uq_place_reviews_key',
+         "CREATE UNIQUE INDEX uq_place_reviews_key ON place_reviews (place_id, review_key)"),
+    ]
+
+    def __init__(self, batch_size=None):
+        # Rows per executemany round trip in the *_bulk methods
+        self.batch_size = batch_size or int(os.getenv('DB_BATCH_SIZE', 500))
+        self.metrics = get_metrics()
         try:
-            self.conn = mysql.connector.connect(
-                host=os.getenv('DB_HOST', 'localhost'),
-                database=os.getenv('DB_NAME'),
-                user=os.getenv('DB_USER'),
-                password=os.getenv('DB_PASSWORD'),
-                port=int(os.getenv('DB_PORT', 3306))  # MySQL default port
-            )
+            self.conn = get_pool().get_connection()
             self.cur = self.conn.cursor(dictionary=True)  # Use dictionary cursor
         except Error as e:
-            print(f"Error connecting to MySQL: {e}")
+            log.error("Error connecting to MySQL: %s", e)
             raise
     
     def place_exists(self, name, latitude, longitude):
@@ -30,10 +70,108 @@ class DatabaseHandler:
     def clean_address(address):
         return address.replace('\ue0c8', '').replace('\n', '').strip()
 
-    def insert_place(self, place_data):
-        """Insert a new place into the database"""
+    # Re-scrapes refresh the volatile columns of the existing row in place.
+    # id = LAST_INSERT_ID(id) makes lastrowid point at that row on update.
+    PLACE_UPSERT = """
+        INSERT INTO places (
+            place_key, name, address, phone, rating, review_count, 
+            category, scraped_at, latitude, longitude
+        ) VALUES (
+            %(place_key)s, %(name)s, %(address)s, %(phone)s, %(rating)s, %(review_count)s,
+            %(category)s, %(scraped_at)s, %(latitude)s, %(longitude)s
+        )
+        ON DUPLICATE KEY UPDATE
+            id = LAST_INSERT_ID(id),
+            rating = COALESCE(VALUES(rating), rating),
+            review_count = COALESCE(VALUES(review_count), review_count),
+            address = COALESCE(address, VALUES(address)),
+            phone = COALESCE(phone, VALUES(phone)),
+            scraped_at = VALUES(scraped_at)
+        """
+
+    def ensure_schema(self):
+        """Add the key columns, TABLES and the indexes in INDEXES if they are missing.
+
+        Adding places.place_key backfills hash keys for the stored rows (see
+        _backfill_place_keys); later upserts re-key them to Google ids.
+        """
+        if DatabaseHandler._schema_ready:
+            return
 
-        # ADD THIS VALIDATION:
+        for ddl in self.TABLES:
+            self.cur.execute(ddl)
+
+        if not self._column_exists('places', 'place_key'):
+            log.info("🔧 Adding places.place_key column")
+            self.cur.execute("ALTER TABLE places ADD COLUMN place_key VARCHAR(64) NULL AFTER id")
+            self._backfill_place_keys()
+
+        if not self._column_exists('place_reviews', 'review_key'):
+            log.info("🔧 Adding place_reviews.review_key column")
+            self.cur.execute("ALTER TABLE place_reviews ADD COLUMN review_key VARCHAR(128) NULL AFTER place_id")
+            self._backfill_review_keys()
+
+        for table, index_name, ddl in self.INDEXES:
+            self.cur.execute(
+                "SELECT COUNT(*) AS n FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+                (table, index_name)
+            )
+            if not self.cur.fetchone()['n']:
+                log.info("🔧 Adding index %s", index_name)
+                self.cur.execute(ddl)
+
+        DatabaseHandler._schema_ready = True
+
+    def _column_exists(self, table, column):
+        self.cur.execute(
+            "SELECT COUNT(*) AS n FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+            (table, column)
+        )
+        return bool(self.cur.fetchone()['n'])
+
+    def _backfill_place_keys(self):
+        """Key existing rows; later duplicates of a key keep NULL.
+
+        Stored rows carry no Maps link, so every backfilled key is the
+        name+coordinate hash (h:...). Scrapes key places by their Google id
+        (cid:... / pid:...) where they have one; _adopt_hash_keys moves a
+        hash-keyed row to that id the first time the place is scraped again,
+        so the re-scrape updates the row instead of adding a second copy.
+        """
+        self.cur.execute("SELECT id, name, latitude, longitude FROM places ORDER BY id")
+        seen = set()
+        updates = []
+        for row in self.cur.fetchall():
+            key = make_place_key(row['name'], row['latitude'], row['longitude'])
+            if key not in seen:
+                seen.add(key)
+                updates.append((key, row['id']))
+        for batch in self._batches(updates):
+            self.cur.executemany("UPDATE places SET place_key = %s WHERE id = %s", batch)
+        self.conn.commit()
+
+    def _backfill_review_keys(self):
+        """Key existing reviews by content; later duplicates keep NULL"""
+        self.cur.execute("SELECT id, place_id, author, text FROM place_reviews ORDER BY id")
+        seen = set()
+        updates = []
+        for row in self.cur.fetchall():
+            key = review_content_key(row['author'], row['text'])
+            if (row['place_id'], key) not in seen:
+                seen.add((row['place_id'], key))
+                updates.append((key, row['id']))
+        for batch in self._batches(updates):
+            self.cur.executemany("UPDATE place_reviews SET review_key = %s WHERE id = %s", batch)
+        self.conn.commit()
+
+    def _batches(self, rows):
+        for start in range(0, len(rows), self.batch_size):
+            yield rows[start:start + self.batch_size]
+
+    def _normalize_place(self, place_data):
+        """Coerce scraped values into the column types"""
         # Ensure all string fields are actually strings
         for field in ['name', 'address', 'phone', 'category']:
             if field in place_data and place_data[field] is not None:
@@ -48,24 +186,119 @@ class DatabaseHandler:
         if 'review_count' in place_data and place_data['review_count'] is not None:
             place_data['review_count'] = int(place_data['review_count'])
 
+        if not place_data.get('place_key'):
+            place_data['place_key'] = make_place_key(
+                place_data['name'], place_data.get('latitude'), place_data.get('longitude'),
+                href=place_data.get('href')
+            )
+        return place_data
 
-        query = """
-        INSERT INTO places (
-            name, address, phone, rating, review_count, 
-            category, scraped_at, latitude, longitude
-        ) VALUES (
-            %(name)s, %(address)s, %(phone)s, %(rating)s, %(review_count)s,
-            %(category)s, %(scraped_at)s, %(latitude)s, %(longitude)s
-        )
+    def _adopt_hash_keys(self, places):
+        """Re-key stored h:... rows to the Google id of the same place.
+
+        A place scraped with a cid/pid key may already be stored under the
+        hash of its name and coordinates (backfilled rows, or scrapes that
+        had no link). That row is rewritten to the Google key, unless a row
+        with the Google key exists too. Coordinates that drifted by more
+        than the hash's rounding are not matched.
         """
+        hash_keys = {}
+        for place in places:
+            if not place['place_key'].startswith('h:'):
+                hash_key = make_place_key(place['name'], place.get('latitude'), place.get('longitude'))
+                hash_keys[hash_key] = place['place_key']
+        if not hash_keys:
+            return 0
+
+        stored = self.get_place_ids(hash_keys)
+        if not stored:
+            return 0
+        taken = self.get_place_ids(hash_keys[key] for key in stored)
+        updates = [(hash_keys[key], place_id) for key, place_id in stored.items() if hash_keys[key] not in taken]
+        for batch in self._batches(updates):
+            self.cur.executemany("UPDATE places SET place_key = %s WHERE id = %s", batch)
+        if updates:
+            log.debug("🔑 Re-keyed %d hash-keyed places to their Google ids", len(updates))
+        return len(updates)
+
+    def insert_place(self, place_data):
+        """Insert a place, or refresh the stored row with the same place_key"""
+        self.ensure_schema()
+        self._normalize_place(place_data)
         try:
-            self.cur.execute(query, place_data)
+            self._adopt_hash_keys([place_data])
+            self.cur.execute(self.PLACE_UPSERT, place_data)
             return self.cur.lastrowid
         except Exception as e:
-            print(f"Database insertion error: {e}")
-            print(f"Problematic data: {place_data}")
+            log.error("Database insertion error: %s", e)
+            log.debug("Problematic data: %s", place_data)
             raise
     
+    def get_place_ids(self, place_keys):
+        """Resolve place keys to place ids in one query per batch"""
+        place_keys = list(set(place_keys))
+        found = {}
+        for batch in self._batches(place_keys):
+            self.cur.execute(
+                "SELECT id, place_key FROM places WHERE place_key IN (%s)" %
+                ','.join(['%s'] * len(batch)),
+                batch
+            )
+            found.update({row['place_key']: row['id'] for row in self.cur.fetchall()})
+        return found
+
+    def get_place_freshness(self, place_keys):
+        """{place_key: row with id, rating, review_count, scraped_at} for the known keys"""
+        self.ensure_schema()
+        place_keys = list({key for key in place_keys if key})
+        found = {}
+        for batch in self._batches(place_keys):
+            self.cur.execute(
+                "SELECT id, place_key, rating, review_count, scraped_at FROM places WHERE place_key IN (%s)" %
+                ','.join(['%s'] * len(batch)),
+                batch
+            )
+            found.update({row['place_key']: row for row in self.cur.fetchall()})
+        return found
+
+    def get_review_keys(self, place_key):
+        """Keys of the reviews stored for a place"""
+        self.ensure_schema()
+        self.cur.execute(
+            "SELECT r.review_key FROM place_reviews r JOIN places p ON p.id = r.place_id "
+            "WHERE p.place_key = %s AND r.review_key IS NOT NULL",
+            (place_key,)
+        )
+        return {row['review_key'] for row in self.cur.fetchall()}
+
+    def insert_places_bulk(self, places):
+        """Upsert places in executemany batches.
+
+        Returns ({place_key: place id}, number of newly inserted places).
+        """
+        self.ensure_schema()
+
+        # Last scrape of a key wins within one call
+        rows = {}
+        for place in places:
+            place = self._normalize_place(place)
+            rows[place['place_key']] = place
+        rows = list(rows.values())
+
+        inserted = 0
+        with self.metrics.timer('db_write', table='places'):
+            self._adopt_hash_keys(rows)
+            for batch in self._batches(rows):
+                self.cur.executemany(self.PLACE_UPSERT, batch)
+                # Affected rows count 1 per insert and 2 per update; scraped_at
+                # always changes, so no upserted row is ever left untouched
+                inserted += 2 * len(batch) - self.cur.rowcount
+            place_ids = self.get_place_ids(row['place_key'] for row in rows)
+        self.metrics.inc('rows_written', len(rows), table='places')
+        self.metrics.inc('rows_inserted', inserted, table='places')
+
+        return place_ids, inserted
+
     def insert_categories(self, place_id, categories):
         """Insert place categories into place_categories table"""
         if not categories:
@@ -110,31 +343,110 @@ class DatabaseHandler:
         media_data['videos'] = json.dumps(media_data.get('videos', []))
         self.cur.execute(query, media_data)
     
+    def insert_images_bulk(self, place_images, scraped_at=None):
+        """Link places to their images: {place_id: [url, ...]}.
+
+        URLs are canonicalized first; returns the number of images not seen before.
+        """
+        self.ensure_schema()
+        images = {}
+        links = {}
+        for place_id, urls in place_images.items():
+            for url in urls or []:
+                canonical = canonical_image_url(url)
+                if canonical:
+                    key = image_key(canonical)
+                    images[key] = canonical
+                    links[(place_id, key)] = (place_id, key, scraped_at)
+        if not images:
+            return 0
+
+        new_images = 0
+        with self.metrics.timer('db_write', table='images'):
+            for batch in self._batches([(key, url, scraped_at) for key, url in images.items()]):
+                self.cur.executemany(
+                    "INSERT IGNORE INTO images (url_hash, url, first_seen) VALUES (%s, %s, %s)", batch
+                )
+                new_images += self.cur.rowcount
+            for batch in self._batches(list(links.values())):
+                self.cur.executemany(
+                    "INSERT INTO place_images (place_id, url_hash, scraped_at) VALUES (%s, %s, %s) "
+                    "ON DUPLICATE KEY UPDATE scraped_at = VALUES(scraped_at)",
+                    batch
+                )
+        self.metrics.inc('rows_written', len(links), table='place_images')
+        self.metrics.inc('rows_inserted', new_images, table='images')
+        return new_images
+
+    def insert_categories_bulk(self, place_categories):
+        """Link many places to their categories: {place_id: [category, ...]}"""
+        names = sorted({c for categories in place_categories.values() for c in categories if c})
+        if not names:
+            return
+
+        for batch in self._batches(names):
+            self.cur.executemany(
+                "INSERT IGNORE INTO categories (name) VALUES (%s)",
+                [(name,) for name in batch]
+            )
+
+        category_ids = {}
+        for batch in self._batches(names):
+            self.cur.execute(
+                "SELECT id, name FROM categories WHERE name IN (%s)" %
+                ','.join(['%s'] * len(batch)),
+                batch
+            )
+            category_ids.update({row['name']: row['id'] for row in self.cur.fetchall()})
+
+        links = [
+            (place_id, category_ids[category])
+            for place_id, categories in place_categories.items()
+            for category in categories if category in category_ids
+        ]
+        for batch in self._batches(links):
+            self.cur.executemany(
+                "INSERT IGNORE INTO place_categories (place_id, category_id) VALUES (%s, %s)",
+                batch
+            )
+
     def insert_reviews(self, place_id, reviews):
         """Insert place reviews into place_reviews table"""
+        self.insert_reviews_bulk([dict(review, place_id=place_id) for review in reviews or []])
+
+    def insert_reviews_bulk(self, reviews):
+        """Insert reviews for any number of places; each review carries its place_id.
+        A review whose (place_id, review_key) is already stored is skipped."""
         if not reviews:
             return
+        self.ensure_schema()
 
         query = """
         INSERT IGNORE INTO place_reviews (
-            place_id, author, rating, text, date, images, scraped_at
+            place_id, review_key, author, rating, text, date, images, scraped_at
         ) VALUES (
-            %(place_id)s, %(author)s, %(rating)s, %(text)s, %(date)s, %(images)s, %(scraped_at)s
+            %(place_id)s, %(review_key)s, %(author)s, %(rating)s, %(text)s, %(date)s, %(images)s, %(scraped_at)s
         )
         """
 
-        for review in reviews:
-            review_data = {
-                'place_id': place_id,
-                'author': review.get('author'),
-                'rating': review.get('rating'),
-                'text': review.get('text'),
-                'date': review.get('date'),
-                'images': json.dumps(review.get('images', [])),
-                'scraped_at': review.get('scraped_at')
-            }
-            print("blah blah")
-            self.cur.execute(query, review_data)
+        rows = [{
+            'place_id': review.get('place_id'),
+            'review_key': review.get('review_key') or review_content_key(review.get('author'), review.get('text')),
+            'author': review.get('author'),
+            'rating': review.get('rating'),
+            'text': review.get('text'),
+            'date': review.get('date'),
+            'images': json.dumps(review.get('images', [])),
+            'scraped_at': review.get('scraped_at')
+        } for review in reviews]
+
+        inserted = 0
+        with self.metrics.timer('db_write', table='reviews'):
+            for batch in self._batches(rows):
+                self.cur.executemany(query, batch)
+                inserted += self.cur.rowcount
+        self.metrics.inc('rows_written', len(rows), table='reviews')
+        self.metrics.inc('rows_inserted', inserted, table='reviews')
   
     def get_places_by_category(self, category):
         """Retrieve places by category"""
@@ -202,19 +514,28 @@ class DatabaseHandler:
         } for row in rows]
 
     def get_media_by_place_id(self, place_id):
-        query = "SELECT images, videos FROM place_media WHERE place_id = %s"
-        self.cur.execute(query, (place_id,))
-        row = self.cur.fetchone()
-        if row:
-            return {
-                'images': json.loads(row[0]) if row[0] else [],
-                'videos': json.loads(row[1]) if row[1] else []
-            }
-        return {'images': [], 'videos': []}
+        """Images from the images table, plus any stored as a place_media blob"""
+        self.ensure_schema()
+        self.cur.execute(
+            "SELECT i.url FROM place_images pi JOIN images i ON i.url_hash = pi.url_hash "
+            "WHERE pi.place_id = %s ORDER BY pi.scraped_at",
+            (place_id,)
+        )
+        images = [row['url'] for row in self.cur.fetchall()]
+        videos = []
+        self.cur.execute("SELECT images, videos FROM place_media WHERE place_id = %s", (place_id,))
+        for row in self.cur.fetchall():
+            images += [canonical_image_url(url) for url in json.loads(row['images'] or '[]')]
+            videos += json.loads(row['videos'] or '[]')
+        return {'images': list(dict.fromkeys(images)), 'videos': list(dict.fromkeys(videos))}
 
     def commit(self):
         self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
     
     def close(self):
+        """Close the cursor and hand the connection back to the pool"""
         self.cur.close()
         self.conn.close()
\ No newline at end of file
@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+import mysql.connector
+from mysql.connector import Error
+
+load_dotenv()
+
+
+class PoolExhausted(Error):
+    """No connection became free within the pool timeout"""
+
+
+class PooledConnection:
+    """Connection proxy whose close() hands the connection back to its pool"""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise Error("Connection already returned to the pool")
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool._release(conn)
+
+    def discard(self):
+        """Close the underlying connection instead of returning it for reuse"""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool._discard(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ConnectionPool:
+    """Thread-safe MySQL connection pool with health checks and metrics.
+
+    Idle connections are reused newest-first. One that sat idle longer than
+    `ping_after` seconds is pinged (and reconnected if stale) before it is
+    handed out.
+    """
+
+    def __init__(self, size=None, timeout=None, ping_after=None, **connect_args):
+        self.size = size or int(os.getenv('DB_POOL_SIZE', 5))
+        self.timeout = float(os.getenv('DB_POOL_TIMEOUT', 30)) if timeout is None else timeout
+        self.ping_after = float(os.getenv('DB_POOL_PING_AFTER', 30)) if ping_after is None else ping_after
+        self.connect_args = connect_args or {
+            'host': os.getenv('DB_HOST', 'localhost'),
+            'database': os.getenv('DB_NAME'),
+            'user': os.getenv('DB_USER'),
+            'password': os.getenv('DB_PASSWORD'),
+            'port': int(os.getenv('DB_PORT', 3306)),
+        }
+        self._idle = []  # (connection, released_at)
+        self._open = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'misses': 0,        # checkouts that found no idle connection
+            'waits': 0,         # checkouts that had to block for a release
+            'timeouts': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'created': 0,
+            'reconnects': 0,
+            'discarded': 0,
+        }
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self.connect_args)
+        with self._cond:
+            self._stats['created'] += 1
+        return conn
+
+    def _revive(self, conn):
+        """Ping a long-idle connection, replacing it if the server dropped it"""
+        try:
+            conn.ping(reconnect=True, attempts=2, delay=0)
+            return conn
+        except Error:
+            with self._cond:
+                self._stats['reconnects'] += 1
+            try:
+                conn.close()
+            except Error:
+                pass
+            return self._connect()
+
+    def get_connection(self):
+        start = time.perf_counter()
+        with self._cond:
+            miss = not self._idle
+            waited = False
+            while True:
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    conn, released_at = None, None
+                    break
+                remaining = self.timeout - (time.perf_counter() - start)
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolExhausted(f"No database connection free after {self.timeout}s")
+                waited = True
+                self._cond.wait(remaining)
+
+            wait_time = time.perf_counter() - start
+            self._stats['checkouts'] += 1
+            self._stats['misses'] += miss
+            self._stats['waits'] += waited
+            self._stats['wait_time_total'] += wait_time
+            self._stats['wait_time_max'] = max(self._stats['wait_time_max'], wait_time)
+
+        try:
+            if conn is None:
+                conn = self._connect()
+            elif time.monotonic() - released_at > self.ping_after:
+                conn = self._revive(conn)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, conn)
+
+    def _release(self, conn):
+        try:
+            # Never hand a half-finished transaction to the next caller
+            if conn.in_transaction:
+                conn.rollback()
+        except Error:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, conn):
+        with self._cond:
+            self._open -= 1
+            self._stats['discarded'] += 1
+            self._cond.notify()
+        try:
+            conn.close()
+        except Error:
+            pass
+
+    def metrics(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle),
+                'wait_time_avg': stats['wait_time_total'] / stats['checkouts'] if stats['checkouts'] else 0.0,
+            })
+        return stats
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Error:
+                pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Process-wide pool shared by the scraper, CLI and Flask backend"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
@@ -0,0 +1,108 @@
+// Injected into every snapshot by the fixture server. Gives static HTML
+// the bits of Maps behaviour the scraper relies on:
+//   data-replay-batch="N"     only N items are attached at first; scrolling
+//                             the list to its end attaches the next N after
+//                             a short delay, like Maps fetching a page
+//   data-replay-items="sel"   which children are list items (default: all)
+//   data-replay-end="html"    appended once every item is attached
+//   data-replay-toggle="sel"  clicking shows the target
+//   data-replay-sort="sel"    clicking sorts that list by data-<replay-key>,
+//                             newest (largest) first, then closes its menu
+//   data-replay-expand="txt"  clicking replaces the truncated text before it
+//   data-replay-pane="sel"    place links in this list open in that pane, the
+//                             way Maps opens a detail panel next to the feed;
+//                             Escape closes it again
+// Recorded snapshots without these attributes still get a lazy result feed.
+(() => {
+    const DELAY_MS = 250;
+    const DEFAULT_LAZY = [['div[role="feed"]', 7]];
+
+    const lazyList = (list, batch) => {
+        if (list.__replay) return;
+        const selector = list.getAttribute('data-replay-items') || ':scope > *';
+        const items = Array.from(list.querySelectorAll(selector));
+        const state = {batch, items, shown: 0, loading: false, ended: false};
+        list.__replay = state;
+        items.forEach(item => item.remove());
+
+        state.render = (count) => {
+            state.items.forEach(item => item.remove());
+            state.shown = Math.min(count, state.items.length);
+            state.items.slice(0, state.shown).forEach(item => list.appendChild(item));
+            if (state.shown >= state.items.length && !state.ended && list.hasAttribute('data-replay-end')) {
+                state.ended = true;
+                list.insertAdjacentHTML('beforeend', list.getAttribute('data-replay-end'));
+            }
+        };
+        const more = () => {
+            if (state.loading || state.shown >= state.items.length) return;
+            if (list.scrollTop + list.clientHeight < list.scrollHeight - 200) return;
+            state.loading = true;
+            setTimeout(() => {
+                state.loading = false;
+                state.render(state.shown + state.batch);
+            }, DELAY_MS);
+        };
+        list.addEventListener('scroll', more);
+        state.render(batch);
+    };
+
+    const init = (root) => {
+        root.querySelectorAll('[data-replay-batch]').forEach(list =>
+            lazyList(list, parseInt(list.getAttribute('data-replay-batch'), 10)));
+        DEFAULT_LAZY.forEach(([selector, batch]) =>
+            root.querySelectorAll(selector).forEach(list => lazyList(list, batch)));
+    };
+
+    const openInPane = async (pane, href) => {
+        const response = await fetch(href);
+        const doc = new DOMParser().parseFromString(await response.text(), 'text/html');
+        const panel = doc.querySelector('div[role="main"]');
+        pane.replaceChildren(document.importNode(panel, true));
+        history.pushState({pane: true}, '', href);
+        init(pane);
+    };
+
+    document.addEventListener('click', (event) => {
+        const target = event.target.closest(
+            '[data-replay-toggle], [data-replay-sort], [data-replay-expand], a[href*="/maps/place/"]');
+        if (!target) return;
+
+        if (target.matches('a[href*="/maps/place/"]')) {
+            const list = target.closest('[data-replay-pane]');
+            if (!list) return;
+            event.preventDefault();
+            openInPane(document.querySelector(list.getAttribute('data-replay-pane')), target.href);
+        } else if (target.hasAttribute('data-replay-toggle')) {
+            const shown = document.querySelector(target.getAttribute('data-replay-toggle'));
+            if (shown) shown.hidden = false;
+        } else if (target.hasAttribute('data-replay-sort')) {
+            const list = document.querySelector(target.getAttribute('data-replay-sort'));
+            const key = target.getAttribute('data-replay-key');
+            const state = list && list.__replay;
+            if (state && key) {
+                state.items.sort((a, b) => Number(b.dataset[key]) - Number(a.dataset[key]));
+                state.render(state.shown);
+            }
+            const menu = target.closest('[role="menu"]');
+            if (menu) menu.hidden = true;
+        } else {
+            const text = target.previousElementSibling;
+            if (text) text.textContent = target.getAttribute('data-replay-expand');
+            target.remove();
+        }
+    });
+
+    document.addEventListener('keydown', (event) => {
+        if (event.key !== 'Escape') return;
+        document.querySelectorAll('[data-replay-pane]').forEach(list => {
+            const pane = document.querySelector(list.getAttribute('data-replay-pane'));
+            if (pane && pane.childElementCount) {
+                pane.replaceChildren();
+                history.pushState({}, '', list.getAttribute('data-replay-home') || '/');
+            }
+        });
+    });
+
+    init(document);
+})();
@@ -1,7 +1,11 @@
 // Global variables
+const API_BASE = 'http://127.0.0.1:5000/api';
+const PAGE_SIZE = 100;
+
 let allPlaces = [];
 let filteredPlaces = [];
 let categories = [];
+let nextCursor = null;
 
 // DOM elements
 const searchInput = document.getElementById('searchInput');
@@ -13,21 +17,28 @@ const exportCsvBtn = document.getElementById('exportCsvBtn');
 const exportPdfBtn = document.getElementById('exportPdfBtn');
 const tableBody = document.getElementById('tableBody');
 const tableDescription = document.getElementById('tableDescription');
+const loadMoreBtn = document.getElementById('loadMoreBtn');
 
 // Initialize the application
 document.addEventListener('DOMContentLoaded', function() {
     // loadSampleData(); // Load sample data for demo
+    updateStats();
     loadRealData();
     setupEventListeners();
 });
 
 // Setup event listeners
 function setupEventListeners() {
-    searchInput.addEventListener('input', debounce(filterData, 300));
-    categoryFilter.addEventListener('change', filterData);
-    ratingFilter.addEventListener('change', filterData);
+    // Filtering happens on the server, so every change reloads the first page
+    searchInput.addEventListener('input', debounce(() => loadRealData(), 300));
+    categoryFilter.addEventListener('change', () => loadRealData());
+    ratingFilter.addEventListener('change', () => loadRealData());
     // refreshBtn.addEventListener('click', loadSampleData);
-    refreshBtn.addEventListener('click', loadRealData);
+    refreshBtn.addEventListener('click', () => {
+        updateStats();
+        loadRealData();
+    });
+    loadMoreBtn.addEventListener('click', () => loadRealData(true));
     exportCsvBtn.addEventListener('click', () => exportData('csv'));
     exportPdfBtn.addEventListener('click', () => exportData('pdf'));
 }
@@ -45,10 +56,28 @@ function debounce(func, wait) {
     };
 }
 
-function loadRealData() {
-    showLoading();
+// Query string for the current search and filter inputs
+function buildFilterParams() {
+    const params = new URLSearchParams();
+    const searchTerm = searchInput.value.trim();
+    if (searchTerm) params.set('q', searchTerm);
+    if (categoryFilter.value !== 'all') params.set('category', categoryFilter.value);
+    if (ratingFilter.value !== 'all') params.set('min_rating', ratingFilter.value);
+    return params;
+}
+
+// Load the first page, or the next one when `append` is true
+function loadRealData(append = false) {
+    if (!append) {
+        showLoading();
+    }
+    loadMoreBtn.disabled = true;
+
+    const params = buildFilterParams();
+    params.set('limit', PAGE_SIZE);
+    if (append && nextCursor) params.set('cursor', nextCursor);
 
-    fetch('http://127.0.0.1:5000/api/places')
+    fetch(`${API_BASE}/places?${params}`)
         .then(response => {
             if (!response.ok) {
                 throw new Error('Failed to fetch data');
@@ -56,7 +85,7 @@ function loadRealData() {
             return response.json();
         })
         .then(data => {
-            allPlaces = data.places.map(place => {
+            const page = data.places.map(place => {
                 let cleanedRating = parseFloat(place.rating);
 
                 // If parseFloat fails (NaN), default to 0
@@ -70,15 +99,15 @@ function loadRealData() {
                 };
             });
 
-            // Extract unique categories
-            // categories = [...new Set(allPlaces.flatMap(place => place.categories))].sort();
+            allPlaces = append ? allPlaces.concat(page) : page;
+            nextCursor = data.next_cursor;
 
-            populateCategoryFilter();
-            updateStats();
             filterData();
             hideLoading();
 
-            showToast('Data loaded successfully', 'success');
+            if (!append) {
+                showToast('Data loaded successfully', 'success');
+            }
         })
         .catch(error => {
             console.error('Error loading data:', error);
@@ -105,92 +134,55 @@ function showLoading() {
 // Hide loading state
 function hideLoading() {
     // Loading will be replaced by actual data
+    loadMoreBtn.disabled = false;
+    loadMoreBtn.hidden = !nextCursor;
 }
 
-// Populate category filter dropdown
+// Populate category filter dropdown from the server's category list
 function populateCategoryFilter() {
-    // Step 1: Create a Set to store unique categories
-    const categoriesSet = new Set();
-
-    // Step 2: Loop through all places to collect categories
-    allPlaces.forEach(place => {
-        // Check if place.categories exists and is an array
-        if (place.categories && Array.isArray(place.categories)) {
-            // Loop through each category in the place
-            place.categories.forEach(category => {
-                if (category) { // Skip if category is null or undefined
-                    categoriesSet.add(category.trim()); // Add category to Set
-                }
-            });
-        }
-    });
+    // Keep the current choice across reloads
+    const selected = categoryFilter.value;
 
-    // Step 3: Convert the Set to an Array (Sets cannot be looped with forEach directly)
-    const uniqueCategories = Array.from(categoriesSet);
-
-    // Step 4: Clear the existing options and add "All Categories" option
+    // Clear the existing options and add "All Categories" option
     categoryFilter.innerHTML = '<option value="all">All Categories</option>';
 
-    // Step 5: Add each unique category as an option to the dropdown
-    uniqueCategories.forEach(category => {
+    // Add each category as an option to the dropdown
+    categories.filter(Boolean).forEach(category => {
         const option = document.createElement('option'); // Create an option element
         option.value = category; // Set the value (what will be used in filtering)
         option.textContent = category; // Set the visible text in the dropdown
         categoryFilter.appendChild(option); // Add the option to the dropdown
     });
+
+    categoryFilter.value = categories.includes(selected) ? selected : 'all';
 }
 
-// Update statistics
+// Update statistics from the cached server-side aggregates
 function updateStats() {
-    const totalPlaces = allPlaces.length;
-
-    // Calculate unique categories
-    const categoriesSet = new Set();
-    allPlaces.forEach(place => {
-        if (place.categories && Array.isArray(place.categories)) {
-            place.categories.forEach(category => {
-                if (category) {
-                    categoriesSet.add(category.trim());
-                }
-            });
-        }
-    });
-    const totalCategories = categoriesSet.size;
-
-    // Calculate average rating (no need to filter now)
-    const validRatings = allPlaces.filter(place => place.rating > 0);
-    const avgRating = validRatings.length > 0
-        ? (validRatings.reduce((sum, place) => sum + place.rating, 0) / validRatings.length).toFixed(1)
-        : '0.0';
+    return fetch(`${API_BASE}/stats`)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('Failed to fetch stats');
+            }
+            return response.json();
+        })
+        .then(stats => {
+            categories = stats.categories.map(category => category.name);
+            populateCategoryFilter();
 
-    document.getElementById('totalPlaces').textContent = totalPlaces.toLocaleString();
-    document.getElementById('totalCategories').textContent = totalCategories;
-    document.getElementById('avgRating').textContent = avgRating;
+            const avgRating = stats.average_rating !== null ? stats.average_rating.toFixed(1) : '0.0';
+            document.getElementById('totalPlaces').textContent = stats.total.toLocaleString();
+            document.getElementById('totalCategories').textContent = categories.length;
+            document.getElementById('avgRating').textContent = avgRating;
+        })
+        .catch(error => {
+            console.error('Error loading stats:', error);
+        });
 }
 
-// Filter data based on search and filters
+// The server already applied search and filters to the loaded pages
 function filterData() {
-    const searchTerm = searchInput.value.toLowerCase();
-    const categoryValue = categoryFilter.value;
-    const ratingValue = ratingFilter.value;
-
-    filteredPlaces = allPlaces.filter(place => {
-        // Search filter
-        const matchesSearch = !searchTerm || 
-            place.name?.toLowerCase().includes(searchTerm) ||
-            place.address?.toLowerCase().includes(searchTerm) ||
-            place.categories?.some(cat => cat.toLowerCase().includes(searchTerm));
-
-        // Category filter
-        const matchesCategory = categoryValue === 'all' || 
-            place.categories.includes(categoryValue);
-
-        // Rating filter
-        const matchesRating = ratingValue === 'all' || 
-            place.rating >= parseFloat(ratingValue);
-
-        return matchesSearch && matchesCategory && matchesRating;
-    });
+    filteredPlaces = allPlaces;
 
     updateFilteredCount();
     renderTable();
@@ -199,7 +191,9 @@ function filterData() {
 // Update filtered count
 function updateFilteredCount() {
     document.getElementById('filteredCount').textContent = filteredPlaces.length.toLocaleString();
-    tableDescription.textContent = `Showing ${filteredPlaces.length} of ${allPlaces.length} places`;
+    tableDescription.textContent = nextCursor
+        ? `Showing the first ${filteredPlaces.length} matching places`
+        : `Showing all ${filteredPlaces.length} matching places`;
 }
 
 // Render the data table
@@ -278,10 +272,10 @@ function exportData(format) {
     button.disabled = true;
     button.innerHTML = `<i class="fas fa-spinner fa-spin"></i> Exporting...`;
 
-    setTimeout(() => {
+    setTimeout(async () => {
         try {
             if (format === 'csv') {
-                exportCSV();
+                await exportCSV();
             } else if (format === 'pdf') {
                 exportPDF();
             }
@@ -298,8 +292,33 @@ function exportData(format) {
     }, 500);
 }
 
+// Stream every matching place from the NDJSON export endpoint
+async function fetchAllMatchingPlaces() {
+    const params = buildFilterParams();
+    params.set('format', 'ndjson');
+
+    const response = await fetch(`${API_BASE}/places?${params}`);
+    if (!response.ok) throw new Error('Failed to export data');
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const places = [];
+    let buffered = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        buffered += decoder.decode(value || new Uint8Array(), { stream: !done });
+        const lines = buffered.split('\n');
+        buffered = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => places.push(JSON.parse(line)));
+        if (done) break;
+    }
+    return places;
+}
+
 // Export as CSV
-function exportCSV() {
+async function exportCSV() {
+    const exportPlaces = nextCursor ? await fetchAllMatchingPlaces() : filteredPlaces;
     const headers = [
         'Name', 'Address', 'Phone', 'Rating', 'Review Count', 
         'Categories', 'Scraped Date', 'Latitude', 'Longitude'
@@ -307,7 +326,7 @@ function exportCSV() {
 
     const csvContent = [
         headers.join(','),
-        ...filteredPlaces.map(place => [
+        ...exportPlaces.map(place => [
             `"${place.name.replace(/"/g, '""')}"`,
             `"${(place.address || '').replace(/"/g, '""')}"`,
             `"${place.phone || ''}"`,
@@ -433,9 +452,8 @@ async function fetchDataFromAPI() {
         
         const data = await response.json();
         allPlaces = data.places;
-        categories = data.categories;
+        nextCursor = data.next_cursor;
         
-        populateCategoryFilter();
         updateStats();
         filterData();
         
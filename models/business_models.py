@@ -5,7 +5,9 @@ Contains all business-related data processing and extraction logic
 
 from selenium.webdriver.common.by import By
 from datetime import datetime
-import re
+
+from utils.parsing import parse_count, parse_phone, parse_rating
+from utils.selector_health import get_selector_health
 
 
 class BusinessExtractor:
@@ -19,6 +21,7 @@ class BusinessExtractor:
             "div.hfpxzc",
             "div[jsaction*='pane.selectResult']",
         ]
+        self.selectors = get_selector_health()
         
         self.ui_patterns = [
             "Collapse side panel", "stars", "Map · Use arrow keys",
@@ -27,12 +30,15 @@ class BusinessExtractor:
 
     def extract_businesses(self, driver):
         """Find actual business listings, filtering out UI elements"""
-        for selector in self.business_selectors:
+        selectors = self.selectors.order('selenium.business', self.business_selectors)
+        for i, selector in enumerate(selectors):
             elements = driver.find_elements(By.CSS_SELECTOR, selector)
             if elements:
                 print(f"✅ Found {len(elements)} business elements using: {selector}")
+                self.selectors.record('selenium.business', selectors, i)
                 return elements
         
+        self.selectors.record('selenium.business', selectors, None)
         print("🔄 No matches from primary selectors. Falling back to filtered elements...")
         return self._filter_generic_elements(driver)
 
@@ -123,10 +129,9 @@ class BusinessExtractor:
         ]
         for selector in selectors:
             try:
-                elem = element.find_element(By.CSS_SELECTOR, selector)
-                text = elem.text.strip()
-                if text and text.replace('.', '').isdigit():
-                    return float(text)
+                rating = parse_rating(element.find_element(By.CSS_SELECTOR, selector).text)
+                if rating is not None:
+                    return rating
             except:
                 continue
         return None
@@ -149,26 +154,20 @@ class BusinessExtractor:
         return "Business"
 
     def _extract_phone(self, element):
+        # One read of the card's text instead of an XPath query plus a
+        # .text call for every element that happens to contain a digit
         try:
-            elems = element.find_elements(
-                By.XPATH,
-                ".//*[contains(text(), '+91') or contains(text(), '0471') or contains(text(), '9')]"
-            )
-            for elem in elems:
-                text = elem.text.strip()
-                if len(text) >= 10 and any(char.isdigit() for char in text):
-                    return text
+            return parse_phone(element.text)
         except:
-            pass
-        return None
+            return None
 
     def _extract_reviews_count(self, element):
         try:
             elems = element.find_elements(By.XPATH, ".//*[contains(text(), 'review')]")
             for elem in elems:
-                numbers = re.findall(r'\d+', elem.text.strip())
-                if numbers:
-                    return int(numbers[0])
+                count = parse_count(elem.text)
+                if count is not None:
+                    return count
         except:
             pass
         return None
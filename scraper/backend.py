@@ -1,74 +1,237 @@
-from flask import Flask, jsonify, request
+import base64
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from flask import Flask, Response, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import pymysql
+from mysql.connector import Error
+
+# Fix the import path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from config.db_config import get_db_connection
+from config.db_pool import get_pool
+from utils.logging_setup import setup_logging
+from utils.metrics import load_snapshots, render_prometheus
+from utils.selector_health import get_selector_health
 
 app = Flask(__name__)
 CORS(app)  # Enable Cross-Origin Resource Sharing
 
-# Database configuration
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': 'ponnarukannan',
-    'database': 'google_maps_data'
+# Columns a client may ask for with ?fields=
+PLACE_COLUMNS = {
+    'id': 'p.id',
+    'name': 'p.name',
+    'address': 'p.address',
+    'phone': 'p.phone',
+    'rating': 'p.rating',
+    'review_count': 'p.review_count',
+    'scraped_at': 'p.scraped_at',
+    'latitude': 'p.latitude',
+    'longitude': 'p.longitude',
+    'categories': 'p.category',
 }
 
-def get_db_connection():
-    try:
-        return pymysql.connect(**DB_CONFIG)
-    except Exception as e:
-        return None
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_FETCH_SIZE = 500
+
+
+class StatsCache:
+    """Dashboard aggregates, recomputed when the places table changes.
+
+    Every scraper write sets scraped_at, so MAX(scraped_at) (one index
+    lookup) moves whenever new rows are committed. The TTL covers changes
+    it cannot see, such as deletes.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = float(os.getenv('STATS_CACHE_TTL', 300)) if ttl is None else ttl
+        self._stats = None
+        self._version = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, connection):
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT MAX(scraped_at) AS version FROM places")
+            version = cursor.fetchone()['version']
+
+            with self._lock:
+                fresh = time.monotonic() - self._loaded_at < self.ttl
+                if self._stats is not None and version == self._version and fresh:
+                    return self._stats, True
+
+            stats = self._compute(cursor)
+        finally:
+            cursor.close()
+
+        with self._lock:
+            self._stats, self._version, self._loaded_at = stats, version, time.monotonic()
+        return stats, False
+
+    def _compute(self, cursor):
+        cursor.execute("SELECT COUNT(*) AS total, AVG(rating) AS average_rating FROM places")
+        totals = cursor.fetchone()
+
+        cursor.execute("""
+            SELECT category AS name, COUNT(*) AS count
+            FROM places
+            WHERE category IS NOT NULL
+            GROUP BY category
+            ORDER BY category
+        """)
+        categories = cursor.fetchall()
+
+        # Half-star buckets: 4.5 holds ratings from 4.5 up to (not incl.) 5.0
+        cursor.execute("""
+            SELECT FLOOR(rating * 2) / 2 AS bucket, COUNT(*) AS count
+            FROM places
+            WHERE rating IS NOT NULL
+            GROUP BY bucket
+            ORDER BY bucket
+        """)
+        histogram = [{'bucket': float(row['bucket']), 'count': row['count']} for row in cursor.fetchall()]
+
+        average = totals['average_rating']
+        return {
+            'total': totals['total'],
+            'average_rating': round(float(average), 2) if average is not None else None,
+            'categories': categories,
+            'rating_histogram': histogram,
+            'generated_at': datetime.now().isoformat(),
+        }
+
+
+stats_cache = StatsCache()
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return DefaultJSONProvider.default(value)
+
+
+class ApiJSONProvider(DefaultJSONProvider):
+    """jsonify() with the NDJSON stream's encoding: ISO 8601 dates, numeric decimals"""
+
+    default = staticmethod(_json_default)
+
+
+app.json = ApiJSONProvider(app)
+
+
+def encode_cursor(row):
+    """Opaque keyset cursor for the (scraped_at, id) of the last row sent"""
+    scraped_at = row['scraped_at'].isoformat() if row['scraped_at'] is not None else None
+    raw = json.dumps([scraped_at, row['id']])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    scraped_at, place_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return (datetime.fromisoformat(scraped_at) if scraped_at is not None else None), int(place_id)
+
+
+def build_places_query(args, paginate=True):
+    """SELECT for /api/places from the request's filters, cursor and projection"""
+    fields = [f for f in args.get('fields', '').split(',') if f in PLACE_COLUMNS] or list(PLACE_COLUMNS)
+    # id and scraped_at drive the keyset even when they are not returned
+    columns = sorted(set(fields) | {'id', 'scraped_at'}, key=list(PLACE_COLUMNS).index)
+    select = ', '.join(f"{PLACE_COLUMNS[c]} AS {'category' if c == 'categories' else c}" for c in columns)
+
+    where, params = [], []
+    if args.get('category') and args['category'] != 'all':
+        where.append("p.category = %s")
+        params.append(args['category'])
+    if args.get('min_rating') and args['min_rating'] != 'all':
+        where.append("p.rating >= %s")
+        params.append(float(args['min_rating']))
+    if args.get('q'):
+        like = f"%{args['q']}%"
+        where.append("(p.name LIKE %s OR p.address LIKE %s OR p.category LIKE %s)")
+        params.extend([like, like, like])
+    if paginate and args.get('cursor'):
+        scraped_at, place_id = decode_cursor(args['cursor'])
+        # MySQL sorts NULL scraped_at last in DESC order, after every dated row
+        if scraped_at is None:
+            where.append("(p.scraped_at IS NULL AND p.id < %s)")
+            params.append(place_id)
+        else:
+            where.append("(p.scraped_at < %s OR (p.scraped_at = %s AND p.id < %s) OR p.scraped_at IS NULL)")
+            params.extend([scraped_at, scraped_at, place_id])
+
+    query = f"SELECT {select} FROM places p"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    # Served by idx_places_scraped_at_id
+    query += " ORDER BY p.scraped_at DESC, p.id DESC"
+    return query, params, fields
+
+
+def shape_place(row, fields):
+    """Keep the requested fields, with categories as a list"""
+    if 'categories' in fields:
+        category = row.pop('category', None)
+        row['categories'] = [category] if category else []
+    return {key: value for key, value in row.items() if key in fields}
+
 
 @app.route('/api/places', methods=['GET'])
 def get_places():
+    """Keyset-paginated places; ?format=ndjson streams every matching row.
+
+    Query parameters: limit, cursor, category, min_rating, q, fields, format.
+    """
+    try:
+        if request.args.get('format') == 'ndjson':
+            query, params, fields = build_places_query(request.args, paginate=False)
+        else:
+            query, params, fields = build_places_query(request.args)
+            limit = max(1, min(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE))
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid query parameters'}), 400
+
     connection = get_db_connection()
     if not connection:
         return jsonify({'error': 'Database connection failed'}), 500
 
+    if request.args.get('format') == 'ndjson':
+        # Run the query before the 200 goes out, so a failure still gets a 500
+        try:
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            cursor.execute(query, params)
+        except Exception:
+            connection.discard()
+            return jsonify({'error': 'Failed to fetch data'}), 500
+        response = Response(stream_with_context(stream_places(connection, cursor, fields)),
+                            mimetype='application/x-ndjson')
+        # Covers a client that leaves before the stream starts; no-op after it
+        response.call_on_close(connection.discard)
+        return response
+
     try:
-        # with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-        #     cursor.execute("""
-        #         SELECT 
-        #             p.id, p.name, p.address, p.phone, p.rating, 
-        #             p.review_count, p.scraped_at, p.latitude, p.longitude, 
-        #             GROUP_CONCAT(c.name) AS categories
-        #         FROM places p
-        #         LEFT JOIN place_categories pc ON p.id = pc.place_id
-        #         LEFT JOIN categories c ON pc.category_id = c.id
-        #         GROUP BY p.id
-        #         ORDER BY p.scraped_at DESC
-        #     """)
-        #     places = cursor.fetchall()
-
-        #     # Process categories
-        #     for place in places:
-        #         place['categories'] = place['categories'].split(',') if place['categories'] else []
-
-        #     cursor.execute("SELECT DISTINCT name FROM categories ORDER BY name")
-        #     categories = [row['name'] for row in cursor.fetchall()]
-        
-        # return jsonify({'places': places, 'categories': categories})
-        with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-            cursor.execute("""
-                SELECT 
-                    p.id, p.name, p.address, p.phone, p.rating, 
-                    p.review_count, p.scraped_at, p.latitude, p.longitude, 
-                    p.category AS category
-                FROM places p
-                ORDER BY p.scraped_at DESC
-            """)
-            places = cursor.fetchall()
-
-            # Process categories (convert string to list for consistency)
-            for place in places:
-                place['categories'] = [place['category']] if place['category'] else []
-                del place['category']  # Optional: remove 'category' key if not needed
-
-            # Fetch distinct categories for dropdown
-            cursor.execute("SELECT DISTINCT category FROM places ORDER BY category")
-            categories = [row['category'] for row in cursor.fetchall()]
-
-        return jsonify({'places': places, 'categories': categories})
+        cursor = connection.cursor(dictionary=True)
+        try:
+            # One extra row tells us whether another page exists
+            cursor.execute(query + " LIMIT %s", params + [limit + 1])
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        places = [shape_place(row, fields) for row in rows[:limit]]
+
+        return jsonify({'places': places, 'next_cursor': next_cursor})
 
 
     except Exception as e:
@@ -76,5 +239,72 @@ def get_places():
     finally:
         connection.close()
 
+
+def stream_places(connection, cursor, fields):
+    """Yield NDJSON lines straight off an executed unbuffered cursor.
+
+    An error after the first line can no longer change the status; the
+    stream then just ends early.
+    """
+    finished = False
+    try:
+        while True:
+            rows = cursor.fetchmany(STREAM_FETCH_SIZE)
+            if not rows:
+                break
+            yield "".join(json.dumps(shape_place(row, fields), default=_json_default) + "\n" for row in rows)
+        finished = True
+    finally:
+        if finished:
+            cursor.close()
+            connection.close()
+        else:
+            # A client that hung up (or an error) left unread rows on the
+            # wire; a rollback would not clear them, so the connection is
+            # closed rather than handed back to the pool
+            connection.discard()
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Totals, category counts and rating histogram for the dashboard"""
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    try:
+        stats, cached = stats_cache.get(connection)
+        return jsonify({**stats, 'cached': cached})
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch stats'}), 500
+    finally:
+        connection.close()
+
+@app.route('/api/pool', methods=['GET'])
+def get_pool_metrics():
+    """Connection pool counters for sizing DB_POOL_SIZE"""
+    return jsonify(get_pool().metrics())
+
+@app.route('/metrics', methods=['GET'])
+def get_scraper_metrics():
+    """Scraper stage timers and counters in the Prometheus text format.
+
+    Sums the latest snapshot of every scraper process in SCRAPER_METRICS_DIR.
+    """
+    return Response(render_prometheus(load_snapshots()), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/metrics', methods=['GET'])
+def get_scraper_metrics_json():
+    """The same snapshots as JSON, one entry per scraper process"""
+    return jsonify(load_snapshots())
+
+@app.route('/api/selectors', methods=['GET'])
+def get_selector_health_report():
+    """Hit rate of every extraction selector, dead ones flagged"""
+    health = get_selector_health()
+    health.flush(force=True)  # Also reloads what the scrapers wrote
+    rows = health.report()
+    return jsonify({'selectors': rows, 'dead': [row for row in rows if row['dead']]})
+
 if __name__ == '__main__':
+    setup_logging()
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Headless batch mode over the persistent job queue.
+
+    python scraper/main.py --batch data/input.csv     # queue the file, then run
+    python scraper/main.py --batch                    # resume the queued jobs
+
+Places are stored in small batches and checkpointed right after each
+commit, so an interrupted run loses at most one batch of work. A search
+that fails part way stays pending and is retried. Its retry gets the
+checkpointed place keys, so it neither opens the detail panels of places
+already harvested nor stores them again.
+"""
+
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from config.db_handler import DatabaseHandler
+from scraper.job_queue import JobQueue
+from utils.metrics import get_metrics
+from utils.place_key import make_place_key
+
+
+def place_key_of(place):
+    """The key DatabaseHandler will store a place under"""
+    if not place.get('place_key'):
+        place['place_key'] = make_place_key(
+            place['name'], place.get('latitude'), place.get('longitude'), href=place.get('href')
+        )
+    return place['place_key']
+
+
+class BatchRunner:
+    """Works through a JobQueue with one scraper until no job is pending"""
+
+    def __init__(self, scraper, job_queue=None, store_batch_size=None):
+        self.scraper = scraper
+        self.jobs = job_queue or JobQueue()
+        self.store_batch_size = store_batch_size or int(os.getenv('SCRAPER_STORE_BATCH', 10))
+
+    def run(self):
+        recovered = self.jobs.recover()
+        if recovered:
+            print(f"♻️ Resuming {recovered} jobs interrupted by the last run")
+        print(f"📋 Job queue: {self.jobs.counts()}")
+
+        while True:
+            job = self.jobs.claim()
+            if not job:
+                break
+            label = job['url'] if job['kind'] == 'place' else f"{job['category']} in {job['location']}"
+            print(f"\n🧾 Job {job['id']} (attempt {job['attempts'] + 1}): {label}")
+            try:
+                if job['kind'] == 'place':
+                    self._run_place(job)
+                else:
+                    self._run_search(job)
+                self.jobs.complete(job['id'])
+            except KeyboardInterrupt:
+                # Left running on purpose: the next run recovers it
+                print("\n⚠️ Interrupted, progress is checkpointed")
+                raise
+            except Exception as e:
+                print(f"❌ Job {job['id']} failed: {e}")
+                self.jobs.fail(job['id'], e)
+                get_metrics().inc('retries', stage='job')
+
+        counts = self.jobs.counts()
+        print(f"\n🏁 Batch finished: {counts['done']} done, {counts['failed']} failed, {counts['pending']} pending")
+        return counts
+
+    def _run_search(self, job):
+        harvested = self.jobs.harvested(job['id'])
+        seen = skipped = 0
+        batch = []
+        places = self.scraper.stream_search(job['category'], job['location'], job['max_results'] or 20,
+                                            skip_keys=harvested)
+        try:
+            for place in places:
+                seen += 1
+                if place_key_of(place) in harvested:
+                    skipped += 1
+                    continue
+                batch.append(place)
+                if len(batch) >= self.store_batch_size:
+                    self._store(job, batch)
+                    batch = []
+        except Exception:
+            # Checkpoint what the failed attempt did get, so the retry skips it
+            if batch:
+                self._store(job, batch)
+            raise
+        if batch:
+            self._store(job, batch)
+
+        if skipped:
+            print(f"⏭️ Skipped {skipped} places already harvested by an earlier attempt")
+        # A retry may find nothing new, but a first attempt must find something
+        if not seen and not harvested:
+            raise RuntimeError("search returned no places")
+
+    def _run_place(self, job):
+        place = self.scraper.scrape_place(job['url'], job['category'])
+        if not place:
+            raise RuntimeError("no detail panel data")
+        self._store(job, [place])
+
+    def _store(self, job, places):
+        db = DatabaseHandler()
+        try:
+            _, inserted = db.insert_places_bulk(places)
+            db.commit()
+        finally:
+            db.close()
+        # Only checkpoint what is committed
+        self.jobs.checkpoint(job['id'], [place_key_of(place) for place in places])
+        print(f"💾 Stored {len(places)} places ({inserted} new)")
@@ -0,0 +1,252 @@
+"""
+Warm pool of browser contexts for Maps searches.
+
+Every pooled context has a page already sitting on the Maps home page with
+the search box rendered, so a search only has to type its query. Consent
+cookies are accepted once and saved with storage_state; later contexts
+(and later runs) start from that file and never see the dialog.
+
+Returned contexts are reset in the background: the page goes back to the
+Maps home page and extra pages are closed. Place-URL work never uses the
+search box, so lease(home=False) skips that reload; a search that later
+gets such a context loads the home page before it is handed out. A
+context is replaced after `max_uses` leases, or as soon as it fails a
+health check.
+
+Only the first context is opened under the consent lock, until consent
+is settled and the storage state is written; the rest open concurrently.
+"""
+
+import asyncio
+import contextlib
+import os
+import time
+
+from scraper.waits import wait_for_selector
+from utils.logging_setup import get_logger
+from utils.paths import env_path
+
+log = get_logger(__name__)
+
+
+MAPS_URL = "https://www.google.com/maps"
+SEARCH_BOX = 'input#searchboxinput'
+CONSENT_BUTTON = '#L2AGLb'
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STATE_PATH = os.path.join(project_root, 'data', 'browser_state.json')
+
+
+class PooledContext:
+    """A leased context and its ready Maps page"""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        # Cleared by the search when something went wrong on the page
+        self.healthy = True
+        # The page shows the Maps home page with its search box
+        self.at_home = True
+
+
+class ContextPool:
+    """Hands out pre-loaded browser contexts and recycles them"""
+
+    def __init__(self, new_context, waits, size=1, max_uses=None, state_path=None):
+        self._new_context = new_context
+        self.waits = waits
+        self.size = max(1, int(size))
+        self.max_uses = max_uses or int(os.getenv('SCRAPER_CONTEXT_MAX_USES', 25))
+        self.state_path = state_path or env_path('SCRAPER_STORAGE_STATE', DEFAULT_STATE_PATH)
+        self._idle = asyncio.Queue()
+        self._open = 0
+        self._consent_lock = asyncio.Lock()
+        self._consent_settled = False
+        self._resets = set()
+        self._stats = {
+            'leases': 0,
+            'reused': 0,
+            'created': 0,
+            'recycled': 0,
+            'discarded': 0,
+            'consent_clicks': 0,
+            'loads': 0,
+            'load_time_total': 0.0,
+        }
+
+    async def start(self):
+        """Open `size` warm contexts up front"""
+        # The first context settles consent and writes the storage state
+        await self._add_idle()
+        await asyncio.gather(*[self._add_idle() for _ in range(self.size - 1)])
+        log.info("🔥 %d browser contexts warmed up", self._idle.qsize())
+        return self
+
+    @contextlib.asynccontextmanager
+    async def lease(self, home=True):
+        """Lend a context; home=False when the page will not need the search box"""
+        entry = await self._acquire(home)
+        try:
+            yield entry
+        finally:
+            entry.at_home = False
+            task = asyncio.create_task(self._reset(entry, home))
+            self._resets.add(task)
+            task.add_done_callback(self._resets.discard)
+
+    async def _add_idle(self):
+        self._open += 1
+        try:
+            self._idle.put_nowait(await self._create())
+        except Exception as e:
+            self._open -= 1
+            log.warning("⚠️ Could not warm a browser context: %s", e)
+
+    async def _create(self):
+        if not self._consent_settled:
+            # Later contexts wait for the first one's consent and storage state
+            async with self._consent_lock:
+                if not self._consent_settled:
+                    entry = await self._open_context(settling=True)
+                    self._consent_settled = True
+                    return entry
+        return await self._open_context()
+
+    async def _open_context(self, settling=False):
+        """A new context with its page on the Maps home page.
+
+        `settling` means the caller holds the consent lock already.
+        """
+        has_state = os.path.exists(self.state_path)
+        context = await self._new_context(storage_state=self.state_path if has_state else None)
+        try:
+            page = await context.new_page()
+            started = time.perf_counter()
+            await page.goto(MAPS_URL, timeout=60000)
+            # A saved state normally skips the dialog, so only wait for it
+            # when there is no state yet; otherwise just check for it
+            if has_state:
+                button = await page.query_selector(CONSENT_BUTTON)
+            else:
+                button = await wait_for_selector(page, CONSENT_BUTTON, self.waits.get('cookies'))
+            if button:
+                await button.click()
+                self._stats['consent_clicks'] += 1
+                log.info("✅ Accepted cookies")
+                await wait_for_selector(page, CONSENT_BUTTON, self.waits.get('cookies'), state='detached')
+            if button or not has_state:
+                if settling:
+                    await self._save_state(context)
+                else:
+                    async with self._consent_lock:
+                        await self._save_state(context)
+            await page.wait_for_selector(SEARCH_BOX, timeout=self.waits.get('search_box'))
+            self._record_load(started)
+        except Exception:
+            await context.close()
+            raise
+        self._stats['created'] += 1
+        return PooledContext(context, page)
+
+    async def _save_state(self, context):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        await context.storage_state(path=self.state_path)
+
+    async def _go_home(self, entry):
+        started = time.perf_counter()
+        await entry.page.goto(MAPS_URL, timeout=60000)
+        await entry.page.wait_for_selector(SEARCH_BOX, timeout=self.waits.get('search_box'))
+        self._record_load(started)
+        entry.at_home = True
+
+    def _record_load(self, started):
+        self._stats['loads'] += 1
+        self._stats['load_time_total'] += time.perf_counter() - started
+
+    async def _is_healthy(self, entry):
+        try:
+            if entry.page.is_closed():
+                return False
+            if not entry.at_home:
+                return True
+            return await entry.page.query_selector(SEARCH_BOX) is not None
+        except Exception:
+            return False
+
+    async def _acquire(self, home=True):
+        while True:
+            if self._idle.empty() and self._open < self.size:
+                self._open += 1
+                try:
+                    entry = await self._create()
+                except Exception:
+                    self._open -= 1
+                    raise
+            else:
+                try:
+                    # Re-check now and then in case a replacement failed to open
+                    entry = await asyncio.wait_for(self._idle.get(), timeout=5)
+                except asyncio.TimeoutError:
+                    continue
+
+            if await self._is_healthy(entry):
+                if home and not entry.at_home:
+                    # Last used for place URLs, so it was left where it was
+                    try:
+                        await self._go_home(entry)
+                    except Exception as e:
+                        log.warning("⚠️ Browser context failed to load Maps: %s", e)
+                        self._stats['discarded'] += 1
+                        await self._close(entry)
+                        continue
+                entry.uses += 1
+                self._stats['leases'] += 1
+                self._stats['reused'] += entry.uses > 1
+                return entry
+            self._stats['discarded'] += 1
+            await self._close(entry)
+
+    async def _reset(self, entry, home=True):
+        """Put a returned context back (on the Maps home page if `home`), or replace it"""
+        if entry.healthy and entry.uses < self.max_uses:
+            try:
+                for page in entry.context.pages:
+                    if page is not entry.page:
+                        await page.close()
+                if home:
+                    await self._go_home(entry)
+                self._idle.put_nowait(entry)
+                return
+            except Exception as e:
+                log.warning("⚠️ Browser context failed to reset: %s", e)
+                self._stats['discarded'] += 1
+        else:
+            self._stats['recycled' if entry.healthy else 'discarded'] += 1
+
+        await self._close(entry)
+        await self._add_idle()
+
+    async def _close(self, entry):
+        self._open -= 1
+        try:
+            await entry.context.close()
+        except Exception:
+            pass
+
+    def metrics(self):
+        stats = dict(self._stats)
+        stats.update({
+            'size': self.size,
+            'open': self._open,
+            'idle': self._idle.qsize(),
+            'load_time_avg': stats['load_time_total'] / stats['loads'] if stats['loads'] else 0.0,
+        })
+        return stats
+
+    async def close(self):
+        for task in list(self._resets):
+            task.cancel()
+        await asyncio.gather(*self._resets, return_exceptions=True)
+        while not self._idle.empty():
+            await self._close(self._idle.get_nowait())
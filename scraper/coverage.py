@@ -0,0 +1,53 @@
+"""
+Per-field coverage bookkeeping for scraped places.
+
+Tracks, for every place field, whether the value came from the result
+list, had to be fetched from the detail panel, or stayed missing.
+"""
+
+from utils.logging_setup import get_logger
+
+log = get_logger(__name__)
+
+PLACE_FIELDS = ('name', 'address', 'phone', 'rating', 'review_count', 'latitude', 'longitude')
+
+SOURCES = ('list', 'detail', 'missing')
+
+
+class FieldCoverage:
+    """Counts where each place field was found"""
+
+    def __init__(self):
+        self.places = 0
+        self.counts = {field: {source: 0 for source in SOURCES} for field in PLACE_FIELDS}
+
+    def record(self, place, list_fields=()):
+        """Record one place; `list_fields` are the fields read from its result card"""
+        self.places += 1
+        for field in PLACE_FIELDS:
+            if place.get(field) is None:
+                source = 'missing'
+            elif field in list_fields:
+                source = 'list'
+            else:
+                source = 'detail'
+            self.counts[field][source] += 1
+
+    def merge(self, other):
+        self.places += other.places
+        for field in PLACE_FIELDS:
+            for source in SOURCES:
+                self.counts[field][source] += other.counts[field][source]
+
+    def as_dict(self):
+        """Share of places per field and source, as percentages"""
+        total = self.places or 1
+        return {
+            field: {source: round(100.0 * n / total, 1) for source, n in sources.items()}
+            for field, sources in self.counts.items()
+        }
+
+    def report(self):
+        log.info("📊 Field coverage over %d places (list / detail / missing):", self.places)
+        for field, shares in self.as_dict().items():
+            log.info("   %-13s %5.1f%% / %5.1f%% / %5.1f%%", field, shares['list'], shares['detail'], shares['missing'])
@@ -0,0 +1,168 @@
+"""
+Optional local cache of place photo thumbnails.
+
+Files are content-addressed: a thumbnail is stored under the SHA-256 of
+its bytes, so the same photo reached through different URLs is kept once.
+A small SQLite index maps canonical URL hashes to files and records when
+each file was last used. Once the cache grows past its size limit, the
+least recently used files are evicted. Downloads share one bounded
+semaphore and go through Playwright's request API, outside any page.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+
+from utils.image_url import canonical_image_url, image_key, sized_image_url
+from utils.logging_setup import get_logger
+from utils.paths import env_path
+
+log = get_logger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(project_root, 'data', 'image_cache')
+
+EXTENSIONS = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/webp': '.webp', 'image/gif': '.gif'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blobs_last_used ON blobs (last_used);
+CREATE TABLE IF NOT EXISTS urls (
+    url_hash TEXT PRIMARY KEY,
+    digest TEXT NOT NULL
+);
+"""
+
+
+class ImageCache:
+    """Content-addressed thumbnail cache with bounded concurrent downloads"""
+
+    def __init__(self, root=None, max_bytes=None, concurrency=None, width=None):
+        self.root = root or env_path('SCRAPER_IMAGE_CACHE', DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes or int(float(os.getenv('SCRAPER_IMAGE_CACHE_MB', 512)) * 1024 * 1024)
+        self.concurrency = concurrency or int(os.getenv('SCRAPER_IMAGE_DOWNLOADS', 4))
+        self.width = width or int(os.getenv('SCRAPER_IMAGE_THUMB_WIDTH', 400))
+        os.makedirs(self.root, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(self.root, 'index.sqlite3'))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self.request = None
+        self._slots = None
+        self.stats = {'hits': 0, 'downloaded': 0, 'failed': 0, 'evicted': 0, 'bytes': 0}
+
+    async def start(self, playwright):
+        self.request = await playwright.request.new_context()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def fetch_many(self, urls):
+        """Cache the thumbnails of `urls`; returns {canonical url: local path} for the ones available"""
+        urls = list(dict.fromkeys(canonical_image_url(url) for url in urls if url))
+        paths = await asyncio.gather(*(self.fetch(url) for url in urls))
+        self._evict()
+        return {url: path for url, path in zip(urls, paths) if path}
+
+    async def fetch(self, url):
+        """Local path of one URL's thumbnail, downloading it on a miss; None on failure"""
+        url_hash = image_key(url)
+        path = self._lookup(url_hash)
+        if path:
+            self.stats['hits'] += 1
+            return path
+
+        try:
+            async with self._slots:
+                response = await self.request.get(sized_image_url(canonical_image_url(url), self.width),
+                                                  timeout=15000)
+                if not response.ok:
+                    self.stats['failed'] += 1
+                    return None
+                body = await response.body()
+                content_type = response.headers.get('content-type', '').split(';')[0].strip()
+        except Exception as e:
+            log.debug("⚠️ Could not download image %s: %s", url, e)
+            self.stats['failed'] += 1
+            return None
+
+        path = self._store(url_hash, body, EXTENSIONS.get(content_type, '.img'))
+        self.stats['downloaded'] += 1
+        self.stats['bytes'] += len(body)
+        return path
+
+    def _lookup(self, url_hash):
+        row = self.conn.execute(
+            "SELECT b.digest, b.path FROM urls u JOIN blobs b ON b.digest = u.digest WHERE u.url_hash = ?",
+            (url_hash,)
+        ).fetchone()
+        if not row:
+            return None
+        if not os.path.exists(row[1]):
+            self.conn.execute("DELETE FROM blobs WHERE digest = ?", (row[0],))
+            self.conn.commit()
+            return None
+        self.conn.execute("UPDATE blobs SET last_used = ? WHERE digest = ?", (time.time(), row[0]))
+        self.conn.commit()
+        return row[1]
+
+    def _store(self, url_hash, body, extension):
+        digest = hashlib.sha256(body).hexdigest()
+        path = os.path.join(self.root, digest[:2], digest + extension)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write aside and rename, so a crash never leaves half a file in place
+            partial = f"{path}.part"
+            with open(partial, 'wb') as fh:
+                fh.write(body)
+            os.replace(partial, path)
+        self.conn.execute(
+            "INSERT INTO blobs (digest, path, size, last_used) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(digest) DO UPDATE SET last_used = excluded.last_used",
+            (digest, path, len(body), time.time())
+        )
+        self.conn.execute("INSERT OR REPLACE INTO urls (url_hash, digest) VALUES (?, ?)", (url_hash, digest))
+        self.conn.commit()
+        return path
+
+    def size(self):
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _evict(self):
+        """Drop least recently used files until the cache is back under 90% of max_bytes"""
+        total = self.size()
+        if total <= self.max_bytes:
+            return 0
+        target = self.max_bytes * 0.9
+        evicted = []
+        rows = self.conn.execute("SELECT digest, path, size FROM blobs ORDER BY last_used").fetchall()
+        for digest, path, size in rows:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            evicted.append((digest,))
+            total -= size
+        self.conn.executemany("DELETE FROM urls WHERE digest = ?", evicted)
+        self.conn.executemany("DELETE FROM blobs WHERE digest = ?", evicted)
+        self.conn.commit()
+        self.stats['evicted'] += len(evicted)
+        return len(evicted)
+
+    def report(self):
+        stats = self.stats
+        log.info("🖼️ Image cache: %d downloaded (%.0f KB), %d cached, %d failed, %d evicted, %.1f MB on disk",
+                 stats['downloaded'], stats['bytes'] / 1024, stats['hits'], stats['failed'], stats['evicted'],
+                 self.size() / (1024 * 1024))
+
+    async def close(self):
+        if self.request:
+            await self.request.dispose()
+        self.conn.close()
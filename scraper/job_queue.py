@@ -0,0 +1,185 @@
+"""
+Durable job queue for long scrape campaigns, kept in a local SQLite file.
+
+A job is either a search (category + location) or a single place URL.
+Jobs move pending -> running -> done, or back to pending on failure
+until they run out of attempts and stay failed. Places are checkpointed
+per job as they are stored, so a search that was interrupted halfway
+skips the places it already harvested when it runs again. Jobs left
+running by a crash are put back to pending by recover().
+"""
+
+import csv
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from utils.paths import env_path
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_QUEUE_PATH = os.path.join(project_root, 'data', 'jobs.sqlite3')
+
+STATES = ('pending', 'running', 'done', 'failed')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    category TEXT,
+    location TEXT,
+    url TEXT,
+    max_results INTEGER,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    places INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, id);
+CREATE TABLE IF NOT EXISTS harvested (
+    job_id INTEGER NOT NULL,
+    place_key TEXT NOT NULL,
+    PRIMARY KEY (job_id, place_key)
+);
+"""
+
+
+class JobQueue:
+    """SQLite-backed queue of search and place-URL jobs"""
+
+    def __init__(self, path=None, max_attempts=None):
+        self.path = path or env_path('SCRAPER_JOB_QUEUE', DEFAULT_QUEUE_PATH)
+        self.max_attempts = max_attempts or int(os.getenv('SCRAPER_JOB_ATTEMPTS', 3))
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Autocommit; multi-statement changes open their own transaction
+        self.conn = sqlite3.connect(self.path, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def _now(self):
+        return datetime.now().isoformat(timespec='seconds')
+
+    def _add(self, job_key, kind, category=None, location=None, url=None, max_results=None):
+        now = self._now()
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (job_key, kind, category, location, url, max_results, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_key, kind, category, location, url, max_results, now, now)
+        )
+        return cursor.rowcount
+
+    def add_search(self, category, location, max_results=20):
+        """Queue a search; returns 0 if the same search is already queued"""
+        job_key = f"search:{category.strip().lower()}|{location.strip().lower()}"
+        return self._add(job_key, 'search', category.strip(), location.strip(), max_results=max_results)
+
+    def add_place(self, url, category=None):
+        """Queue one place URL; returns 0 if it is already queued"""
+        return self._add(f"place:{url.strip()}", 'place', category, url=url.strip())
+
+    def import_file(self, path, max_results=20):
+        """Queue jobs from a CSV or JSONL file.
+
+        Rows with a `url` become place jobs; rows with `category` and
+        `location` (and optionally `max_results`) become search jobs.
+        Returns the number of new jobs.
+        """
+        with open(path, encoding='utf-8', newline='') as fh:
+            if path.lower().endswith(('.jsonl', '.ndjson')):
+                rows = [json.loads(line) for line in fh if line.strip()]
+            else:
+                rows = list(csv.DictReader(fh))
+
+        added = 0
+        self.conn.execute('BEGIN')
+        try:
+            for row in rows:
+                url = (row.get('url') or '').strip()
+                category = (row.get('category') or '').strip()
+                location = (row.get('location') or '').strip()
+                if url and '/maps/place/' in url:
+                    added += self.add_place(url, category or None)
+                elif category and location:
+                    limit = str(row.get('max_results') or '').strip()
+                    added += self.add_search(category, location, int(limit) if limit.isdigit() else max_results)
+                else:
+                    print(f"⚠️ Skipping input row without a place URL or category/location: {row}")
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return added
+
+    def recover(self):
+        """Put jobs a crashed run left running back to pending"""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET state = 'pending', updated_at = ? WHERE state = 'running'", (self._now(),)
+        )
+        return cursor.rowcount
+
+    def claim(self):
+        """Mark the oldest pending job running and return it, or None"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            job = self.conn.execute(
+                "SELECT * FROM jobs WHERE state = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if job:
+                self.conn.execute(
+                    "UPDATE jobs SET state = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (self._now(), job['id'])
+                )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return dict(job) if job else None
+
+    def checkpoint(self, job_id, place_keys):
+        """Record places of a job that are safely stored"""
+        self.conn.execute('BEGIN')
+        try:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO harvested (job_id, place_key) VALUES (?, ?)",
+                [(job_id, key) for key in place_keys]
+            )
+            self.conn.execute(
+                "UPDATE jobs SET places = (SELECT COUNT(*) FROM harvested WHERE job_id = ?), updated_at = ? "
+                "WHERE id = ?",
+                (job_id, self._now(), job_id)
+            )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+    def harvested(self, job_id):
+        """Place keys already stored for a job"""
+        rows = self.conn.execute("SELECT place_key FROM harvested WHERE job_id = ?", (job_id,))
+        return {row['place_key'] for row in rows}
+
+    def complete(self, job_id):
+        self.conn.execute(
+            "UPDATE jobs SET state = 'done', error = NULL, updated_at = ? WHERE id = ?", (self._now(), job_id)
+        )
+
+    def fail(self, job_id, error):
+        """Send a job back to pending, or to failed once out of attempts"""
+        self.conn.execute(
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, updated_at = ? WHERE id = ?",
+            (self.max_attempts, str(error)[:500], self._now(), job_id)
+        )
+
+    def counts(self):
+        counts = dict.fromkeys(STATES, 0)
+        for row in self.conn.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"):
+            counts[row['state']] = row['n']
+        return counts
+
+    def close(self):
+        self.conn.close()
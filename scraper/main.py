@@ -1,3 +1,5 @@
+import argparse
+import csv
 import sys
 import os
 from datetime import datetime
@@ -9,6 +11,9 @@ sys.path.insert(0, project_root)
 # Import your modules
 from scraper.maps_scraper import GoogleMapsScraper
 from config.db_handler import DatabaseHandler
+from scraper.batch_runner import BatchRunner
+from scraper.job_queue import JobQueue
+from utils.logging_setup import setup_logging
 
 def get_user_input():
     """Get search parameters from user"""
@@ -150,8 +155,75 @@ def query_data(db):
 
     print("\n✅ Query complete.")
 
+def run_batch(path, queue_path=None, max_results=20):
+    """Headless batch mode: queue the jobs in `path` (if given) and work through the queue"""
+    jobs = JobQueue(queue_path)
+    if path:
+        added = jobs.import_file(path, max_results=max_results)
+        print(f"📥 Queued {added} new jobs from {path}")
+
+    scraper = GoogleMapsScraper(
+        headless=os.getenv('HEADLESS_MODE', 'true').lower() == 'true',
+        concurrency=int(os.getenv('SCRAPER_CONCURRENCY', 1)),
+        extraction_mode=os.getenv('SCRAPER_EXTRACTION_MODE', 'click')
+    )
+    try:
+        BatchRunner(scraper, jobs).run()
+    except KeyboardInterrupt:
+        print("⚠️ Batch stopped; run again with --batch to resume")
+    finally:
+        scraper.close()
+        jobs.close()
+
+def load_place_urls(path):
+    """Place URLs from the `url` column of a CSV file"""
+    with open(path, encoding='utf-8', newline='') as fh:
+        urls = [row['url'].strip() for row in csv.DictReader(fh) if (row.get('url') or '').strip()]
+    place_urls = [url for url in urls if '/maps/place/' in url]
+    if len(place_urls) < len(urls):
+        print(f"⚠️ Ignoring {len(urls) - len(place_urls)} URLs that are not /maps/place/ links")
+    return place_urls
+
+def run_place_urls(path, category=None, reviews=False, images=False):
+    """Refresh known places straight from their URLs, skipping search and scroll"""
+    urls = load_place_urls(path)
+    if not urls:
+        print(f"❌ No place URLs found in {path}")
+        return
+
+    scraper = GoogleMapsScraper(
+        headless=os.getenv('HEADLESS_MODE', 'true').lower() == 'true',
+        concurrency=int(os.getenv('SCRAPER_CONCURRENCY', 1)),
+        extract_images=images
+    )
+    try:
+        print(f"🔗 Scraping {len(urls)} place URLs from {path}")
+        scraper.scrape_urls(urls, category, reviews=reviews)
+    finally:
+        scraper.close()
+
 def main():
     """Main application loop"""
+    setup_logging()
+    parser = argparse.ArgumentParser(description="Google Maps scraper")
+    parser.add_argument('--batch', nargs='?', const='', metavar='FILE',
+                        help="run headless over a CSV/JSONL of searches or place URLs; "
+                             "without FILE, resume the queued jobs")
+    parser.add_argument('--queue', help="job queue database (default data/jobs.sqlite3)")
+    parser.add_argument('--max-results', type=int, default=20, help="default per search in batch mode")
+    parser.add_argument('--urls', nargs='?', const=os.path.join(project_root, 'data', 'input.csv'), metavar='CSV',
+                        help="scrape the place URLs in a CSV `url` column directly (default data/input.csv)")
+    parser.add_argument('--category', help="category stored with places scraped by --urls")
+    parser.add_argument('--reviews', action='store_true', help="also scrape reviews in --urls mode")
+    parser.add_argument('--images', action='store_true', help="also scrape the photo gallery in --urls mode")
+    args = parser.parse_args()
+    if args.batch is not None:
+        run_batch(args.batch or None, args.queue, args.max_results)
+        return
+    if args.urls:
+        run_place_urls(args.urls, args.category, args.reviews, args.images)
+        return
+
     print("🚀 Initializing Google Maps Scraper...")
     
     # Initialize components
@@ -159,7 +231,11 @@ def main():
         db = DatabaseHandler()
         print("✅ Database connected")
         
-        scraper = GoogleMapsScraper(headless=False)  # Set True for headless mode
+        scraper = GoogleMapsScraper(
+            headless=False,  # Set True for headless mode
+            concurrency=int(os.getenv('SCRAPER_CONCURRENCY', 1)),
+            extraction_mode=os.getenv('SCRAPER_EXTRACTION_MODE', 'click')
+        )
         print("✅ Scraper initialized")
         
     except Exception as e:
@@ -1,11 +1,11 @@
-import time
+import asyncio
+import contextlib
+import logging
 import random
-from datetime import datetime
-from playwright.sync_api import sync_playwright
-import re
+from datetime import datetime, timedelta
+from playwright.async_api import async_playwright
 import os
 import sys
-import time
 
 
 # Fix the import path
@@ -13,17 +13,141 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 from config.db_handler import DatabaseHandler
-
-class GoogleMapsScraper:
-    
-    def __init__(self, headless=True):
+from scraper.context_pool import ContextPool
+from scraper.image_cache import ImageCache
+from scraper.coverage import PLACE_FIELDS, FieldCoverage
+from scraper.resource_profile import ResourceProfile
+from scraper.response_parser import ResponseCollector
+from scraper.scroller import AdaptiveScroller
+from scraper.panel_selectors import (
+    DETAIL_EXTRACTOR_JS, DETAIL_FIELDS, GALLERY_TICK_JS, IMAGE_SOURCES,
+    REVIEW_HARVEST_JS, REVIEW_SELECTORS, extractor_args, is_playwright_only, match_text,
+    parse_detail_fields
+)
+from scraper.waits import RatePolicy, WaitBudget, wait_for_dom_quiet, wait_for_selector
+from utils.image_url import canonical_images
+from utils.logging_setup import get_logger
+from utils.metrics import get_metrics
+from utils.parsing import (
+    parse_coordinates, parse_count, parse_fields, parse_phone, parse_rating, parse_records
+)
+from utils.place_key import make_place_key
+from utils.review_key import make_review_key, review_content_key
+from utils.selector_health import get_selector_health
+
+log = get_logger(__name__)
+
+# Reads one result card. Values are returned raw and parsed in Python by
+# _parse_card.
+_CARD_READ_JS = """
+card => {
+    const text = (sel) => {
+        const el = card.querySelector(sel);
+        return el ? el.textContent.trim() : null;
+    };
+    const link = card.querySelector('a.hfpxzc, a[href*="/maps/place/"]');
+    const rows = Array.from(card.querySelectorAll('.W4Efsd .W4Efsd')).map(row =>
+        Array.from(row.querySelectorAll(':scope > span'))
+            .map(span => span.textContent.replace(/^[\\s\u00b7]+/, '').trim())
+            .filter(part => part.length > 0)
+    );
+    return {
+        name: (link && link.getAttribute('aria-label')) || text('.qBF1Pd'),
+        href: link ? link.href : null,
+        rating: text('span.MW4etd'),
+        reviews: text('span.UY7F9'),
+        phone: text('span.UsdlK'),
+        rows: rows
+    };
+}
+"""
+
+# Reads the result cards rendered since index `start` in one round trip
+_CARD_HARVEST_JS = (
+    "(start) => Array.from(document.querySelectorAll('div.Nv2PK')).slice(start).map("
+    + _CARD_READ_JS + ")"
+)
+
+# Reads the result card around a clickable card element
+_CARD_SUMMARY_JS = "el => (" + _CARD_READ_JS + ")(el.closest('div.Nv2PK') || el)"
+
+# Tried in order to find the clickable result cards (reordered by hit rate at run time)
+CARD_SELECTORS = [
+    'a[data-cid]',
+    'div[role="article"]',
+    'div[data-result-index]',
+    'div.section-result',
+    'div.Nv2PK',
+    'a[aria-label][href*="/maps/place/"]',
+    'div[jsaction*="pane.focusResult"]'
+]
+
+# Raw result card keys and how they parse (see utils.parsing)
+CARD_PARSERS = {
+    'coordinates': ('coordinates', 'href'),
+    'rating': ('rating', 'rating'),
+    'review_count': ('count', 'reviews'),
+    'phone': ('phone', 'phone'),
+}
+
+# Returns the elements matching a selector from index `start` on
+_NEW_ELEMENTS_JS = """
+([selector, start]) => Array.from(document.querySelectorAll(selector)).slice(start)
+"""
+
+class AsyncGoogleMapsScraper:
+    """Asyncio scraping engine that drives several pages of one browser at once"""
+
+    def __init__(self, headless=True, concurrency=1, wait_budget=None, rate_policy=None,
+                 extraction_mode='click', scroller=None, resource_profile=None, extract_images=False,
+                 fresh_ttl_hours=None, max_reviews=None, download_images=None):
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.1 Safari/605.1.15"
         ]
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=headless,
+        self.headless = headless
+        self.concurrency = max(1, int(concurrency))
+        self.waits = wait_budget or WaitBudget()
+        self.rate_policy = rate_policy or RatePolicy()
+        # 'click' opens every card's detail panel; 'list' reads the result
+        # cards and opens the panel only for fields the card lacked;
+        # 'network' parses the search payloads Maps fetches while scrolling.
+        self.extraction_mode = extraction_mode
+        self.coverage = FieldCoverage()
+        self.scroller = scroller or AdaptiveScroller(max_wait=self.waits.get('scroll'))
+        self.scroll_reports = []
+        self.store_batch_size = int(os.getenv('SCRAPER_STORE_BATCH', 10))
+        # Image bytes are only worth loading when images are being extracted
+        self.extract_images = extract_images
+        self.resources = ResourceProfile(
+            resource_profile or os.getenv('SCRAPER_RESOURCE_PROFILE', 'light'),
+            allow_images=extract_images
+        )
+        # Places scraped within this many hours whose card rating and review
+        # count are unchanged are not re-extracted (0 re-extracts everything)
+        self.fresh_ttl_hours = float(os.getenv('SCRAPER_FRESH_TTL_HOURS', 0)) if fresh_ttl_hours is None else fresh_ttl_hours
+        self.fresh_skipped = 0
+        # Newest reviews read per place; reading also stops at the first
+        # review that is already stored
+        self.max_reviews = max_reviews or int(os.getenv('SCRAPER_MAX_REVIEWS', 100))
+        # Keep local thumbnails of place photos in an ImageCache
+        self.download_images = (os.getenv('SCRAPER_DOWNLOAD_IMAGES', '0') == '1'
+                                if download_images is None else download_images)
+        self.image_cache = None
+        self.gallery_max_ticks = 20
+        self.metrics = get_metrics()
+        self.selectors = get_selector_health()
+        self.playwright = None
+        self.browser = None
+        self._page_slots = None
+        self._slot_gather = None
+        self.contexts = None
+
+    async def start(self):
+        """Launch the shared browser"""
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,
             args=[
                 '--disable-blink-features=AutomationControlled',
                 '--disable-infobars',
@@ -31,147 +155,244 @@ class GoogleMapsScraper:
                 f'--user-agent={random.choice(self.user_agents)}'
             ]
         )
-        
-    def _accept_cookies(self, page):
-        """Handle cookie consent dialogs"""
-        try:
-            accept_button = page.wait_for_selector('#L2AGLb', timeout=5000)
-            if accept_button:
-                accept_button.click()
-                print("✅ Accepted cookies")
-                time.sleep(2)
-        except:
-            print("⚠️ No cookie dialog found or already accepted")
+        # One slot per page that may be open at the same time
+        self._page_slots = asyncio.Semaphore(self.concurrency)
+        self._slot_gather = asyncio.Lock()
+        # Searches lease a context whose page already shows the Maps search box
+        self.contexts = ContextPool(
+            self._new_context, self.waits,
+            size=int(os.getenv('SCRAPER_CONTEXT_POOL_SIZE', self.concurrency))
+        )
+        await self.contexts.start()
+        if self.download_images:
+            self.image_cache = await ImageCache().start(self.playwright)
+        return self
 
-    def search_and_scrape(self, category, location, max_results=20):
-        """Search Google Maps and scrape results"""
-        context = self.browser.new_context(
+    async def _new_context(self, storage_state=None):
+        context = await self.browser.new_context(
             user_agent=random.choice(self.user_agents),
-            viewport={'width': 1366, 'height': 768}
+            viewport={'width': 1366, 'height': 768},
+            storage_state=storage_state
         )
-        page = context.new_page()
-        
-        try:
-            print("🌐 Loading Google Maps...")
-            page.goto("https://www.google.com/maps", timeout=60000)
-            
-            # Handle cookies
-            self._accept_cookies(page)
-            
-            # Wait for search box and search
-            search_query = f"{category} in {location}"
-            print(f"🔍 Searching for: {search_query}")
-            
-            search_box = page.wait_for_selector('input#searchboxinput', timeout=15000)
-            search_box.fill(search_query)
-            search_box.press("Enter")
-            
-            print("✅ Search submitted, waiting for results...")
-            time.sleep(5)
-            
-            # Wait for results panel to load
-            try:
-                page.wait_for_selector('div[role="main"]', timeout=15000)
-                print("✅ Results panel loaded")
-            except:
-                print("⚠️ Results panel timeout, continuing...")
-            
-            # Scroll to load more results
-            print("🔄 Starting scroll using mouse wheel...")
-            final_count = self._scroll_with_mouse_wheel(page, max_results)
-            print(f"📊 Final scroll result: {final_count} places found")
+        await self.resources.apply(context)
+        return context
 
-            
-            # Get all business cards from the sidebar
-            results = self._extract_all_businesses(page, max_results, category)
-            
-            print(f"🎉 Successfully scraped {len(results)} places")
-            
-            # Store results in database
-            if results:
-                self._store_results(results)
-            
-            return results
-            
+    async def scrape_many(self, searches):
+        """Run several (category, location, max_results) searches concurrently"""
+        tasks = [
+            self.search_and_scrape(*search) for search in searches
+        ]
+        return await asyncio.gather(*tasks)
+
+    async def search_and_scrape(self, category, location, max_results=20):
+        """Search Google Maps, storing results in batches as they arrive"""
+        return await self._collect_and_store(self.stream_search(category, location, max_results))
+
+    async def scrape_urls(self, urls, category=None, reviews=False):
+        """Scrape known place URLs without searching, storing results in batches"""
+        return await self._collect_and_store(self.stream_places(urls, category, reviews))
+
+    async def _collect_and_store(self, places):
+        results = []
+        batch = []
+        try:
+            async for place in places:
+                results.append(place)
+                batch.append(place)
+                if len(batch) >= self.store_batch_size:
+                    await asyncio.to_thread(self._store_results, batch)
+                    batch = []
+                    self.metrics.flush()
         except Exception as e:
-            print(f"❌ Error in search_and_scrape: {str(e)}")
-            page.screenshot(path=f'error_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png')
-            return []
-        finally:
-            context.close()
-
-    def _scroll_with_working_container(self, page, working_method, max_results):
-        """Scroll using the identified working method"""
-        if not working_method:
-            print("❌ No working method provided")
-            return len(page.query_selector_all('div.Nv2PK'))
-        
-        initial_count = len(page.query_selector_all('div.Nv2PK'))
-        last_count = initial_count
-        max_scrolls = 25  # Increase for more results
-        
-        print(f"🔄 Starting full scroll with {working_method['type']} method...")
-        print(f"📊 Initial: {initial_count}, Target: {max_results}")
-        
-        for i in range(max_scrolls):
+            # Interactive runs keep what was scraped before the failure
+            log.warning("⚠️ Search stopped early after %d places: %s", len(results), e)
+        if batch:
+            await asyncio.to_thread(self._store_results, batch)
+
+        log.info("🎉 Successfully scraped %d places", len(results))
+        self.coverage.report()
+        return results
+
+    async def stream_search(self, category, location, max_results=20, skip_keys=None):
+        """Search Google Maps and yield places as soon as they are extracted.
+
+        Cards whose place key is in `skip_keys` (places an earlier attempt
+        already harvested) are not opened, but count towards max_results.
+        Errors are logged and re-raised, so callers can tell a failed search
+        from a finished one.
+        """
+        # List mode opens detail panels on a companion page next to the feed,
+        # which takes a slot of its own (or shares this one at concurrency 1)
+        pages = 2 if self.extraction_mode == 'list' else 1
+        async with self._hold_slots(pages), self.contexts.lease() as lease:
+            context, page = lease.context, lease.page
+            collector = None
+            if self.extraction_mode == 'network':
+                collector = ResponseCollector(category).attach(page)
+
             try:
-                # Use the working method
-                if working_method['type'] == 'document':
-                    page.evaluate('window.scrollBy(0, 1000)')
-                elif working_method['type'] == 'container':
-                    working_method['container'].evaluate('el => el.scrollTop += 1000')
-                elif working_method['type'] == 'mouse_wheel':
-                    working_method['container'].click()
-                    page.mouse.wheel(0, 1000)
-                
-                time.sleep(random.uniform(2, 3))
-                
-                current_count = len(page.query_selector_all('div.Nv2PK'))
-                
-                if current_count > last_count:
-                    print(f"✅ Progress: {current_count} results (+{current_count - last_count})")
-                    last_count = current_count
-                    
-                    if current_count >= max_results:
-                        print(f"🎯 Reached target: {current_count} results")
-                        break
+                # Search from the leased page, already on Maps
+                search_query = f"{category} in {location}"
+                log.info("🔍 Searching for: %s", search_query)
+
+                with self.metrics.timer('navigation', step='search'):
+                    search_box = await page.wait_for_selector('input#searchboxinput', timeout=self.waits.get('search_box'))
+                    await search_box.fill(search_query)
+                    await search_box.press("Enter")
+
+                    log.debug("✅ Search submitted, waiting for results...")
+
+                    # Wait for the result feed (or a single-place panel) to render
+                    results_loaded = await wait_for_selector(page, 'div[role="feed"] div.Nv2PK, h1.DUwDvf',
+                                                             self.waits.get('results'))
+                if results_loaded:
+                    log.debug("✅ Results panel loaded")
                 else:
-                    print(f"⏳ No new results: {current_count} total")
-                    
+                    log.warning("⚠️ Results panel timeout, continuing...")
+
+                if collector:
+                    async def enough_places(state):
+                        return len(collector.places()) >= max_results
+
+                    await self._scroll_results(page, max_results, on_tick=enough_places)
+                    await collector.drain()
+                    places = collector.places(max_results)
+                    log.info("📡 Parsed %d places from %d Maps responses", len(places), collector.responses_seen)
+                    for place in places:
+                        # Search payloads are the list view in structured form
+                        self.coverage.record(place, PLACE_FIELDS)
+                        yield place
+                    if places:
+                        return
+
+                # Extract cards from the sidebar while it is still scrolling
+                async for place in self._stream_cards(page, context, category, max_results, skip_keys):
+                    await self._cache_images(place)
+                    yield place
+
             except Exception as e:
-                print(f"⚠️ Scroll error: {e}")
-                break
-        
-        final_count = len(page.query_selector_all('div.Nv2PK'))
-        print(f"📊 Final result count: {final_count}")
-        return final_count
-   
-    def _scroll_with_mouse_wheel(self, page, max_results):
-        main_area = page.query_selector('div[role="main"]')
-        if not main_area:
-            print("❌ Main area not found for scrolling")
-            return 0
-
-        main_area.click()
-        last_count = 0
-
-        for i in range(25):  # Adjust scroll attempts if needed
-            page.mouse.wheel(0, 1000)
-            time.sleep(random.uniform(2, 3))
-            current_count = len(page.query_selector_all('div.Nv2PK'))
-
-            if current_count > last_count:
-                print(f"✅ Scroll progress: {current_count} results (+{current_count - last_count})")
-                last_count = current_count
-                if current_count >= max_results:
-                    print("🎯 Reached target result count.")
+                log.error("❌ Error in stream_search: %s", e)
+                lease.healthy = False
+                try:
+                    await page.screenshot(path=f'error_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png')
+                except Exception:
+                    pass
+                raise
+            finally:
+                if collector:
+                    collector.detach(page)
+
+    @contextlib.asynccontextmanager
+    async def _hold_slots(self, count):
+        """Hold `count` page slots (at most `concurrency`) for one block.
+
+        Only one task at a time gathers several slots, so two searches can
+        never deadlock each holding one slot and waiting for a second.
+        """
+        count = min(count, self.concurrency)
+        held = 0
+        try:
+            if count == 1:
+                await self._page_slots.acquire()
+                held = 1
+            else:
+                async with self._slot_gather:
+                    while held < count:
+                        await self._page_slots.acquire()
+                        held += 1
+            yield
+        finally:
+            for _ in range(held):
+                self._page_slots.release()
+
+    async def scrape_place(self, url, category=None):
+        """Scrape one /maps/place/ URL straight from its detail panel"""
+        async with self._page_slots, self.contexts.lease(home=False) as lease:
+            return await self._scrape_place_page(lease.page, url, 1, category)
+
+    async def stream_places(self, urls, category=None, reviews=False):
+        """Yield places read straight from their /maps/place/ URLs.
+
+        Skips search and scrolling entirely; up to `concurrency` pages work
+        through the URLs at once and places are yielded as they complete.
+        """
+        queue = asyncio.Queue()
+        for i, url in enumerate(urls, 1):
+            queue.put_nowait((i, url))
+        out = asyncio.Queue()
+
+        workers = [
+            asyncio.create_task(self._place_url_worker(queue, out, len(urls), category, reviews))
+            for _ in range(min(self.concurrency, len(urls)))
+        ]
+
+        async def finish():
+            await asyncio.gather(*workers, return_exceptions=True)
+            await out.put(None)
+
+        finisher = asyncio.create_task(finish())
+        try:
+            while True:
+                place = await out.get()
+                if place is None:
                     break
+                await self._cache_images(place)
+                yield place
+        finally:
+            tasks = [finisher, *workers]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _place_url_worker(self, queue, out, total, category, reviews):
+        while True:
+            try:
+                i, url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            # One lease per URL, so searches and other URL workers on this
+            # engine get a context between places rather than after the queue.
+            # Place pages never need the search box, so no home reload between.
+            async with self._page_slots, self.contexts.lease(home=False) as lease:
+                log.debug("🏪 Processing place %d/%d", i, total)
+                place = await self._scrape_place_page(lease.page, url, i, category, reviews)
+            if place:
+                out.put_nowait(place)
+                log.info("✅ Extracted: %s", place['name'])
             else:
-                print("⏳ No new results loaded")
+                log.warning("⚠️ No data found for place %d", i)
+            await self.rate_policy.pause()
 
-        return last_count
-   
-    def _is_business_card(self, element):
+    async def _scrape_place_page(self, page, url, index, category=None, reviews=False):
+        """Open a place URL and read its panel, plus reviews and gallery when asked"""
+        place = await self._extract_by_url(page, url, index, category)
+        if not place or not place.get('name'):
+            return None
+        if reviews:
+            place_key = make_place_key(place['name'], place.get('latitude'), place.get('longitude'),
+                                       href=place.get('href') or url)
+            known = await asyncio.to_thread(self._known_review_keys, place_key)
+            place['reviews'] = await self._extract_reviews(page, None, known)
+        if self.extract_images:
+            gallery = await self._extract_place_images(page)
+            place['images'] = canonical_images((place.get('images') or []) + gallery)
+        self.coverage.record(place)
+        return place
+
+    async def _scroll_results(self, page, max_results, on_tick=None, lock=None):
+        """Scroll the result feed until it holds max_results cards or stops growing.
+
+        Raises when a scroll tick failed, so a crashed feed fails the search
+        instead of ending it like a finished list.
+        """
+        with self.metrics.timer('scroll'):
+            report = await self.scroller.scroll(page, max_results, on_tick=on_tick, lock=lock)
+        self.scroll_reports.append(report)
+        if report['stop_reason'] == 'error':
+            raise RuntimeError(f"result feed scroll failed: {report['error']}")
+        return report['cards']
+
+    async def _is_business_card(self, element):
         """Check if element is actually a business card"""
         try:
             business_indicators = [
@@ -180,170 +401,482 @@ class GoogleMapsScraper:
                 'aria-label',
                 'data-result-index'
             ]
-            
+
             for indicator in business_indicators:
                 if 'href' in indicator:
-                    href = element.get_attribute('href')
+                    href = await element.get_attribute('href')
                     if href and '/maps/place/' in href:
                         return True
                 else:
-                    if element.get_attribute(indicator.replace('*=', '').replace('"', '')):
+                    if await element.get_attribute(indicator.replace('*=', '').replace('"', '')):
                         return True
-            
+
             try:
-                text_content = element.inner_text().strip()
-                if len(text_content) > 10 and not any(ui_word in text_content.lower() for ui_word in 
+                text_content = (await element.inner_text()).strip()
+                if len(text_content) > 10 and not any(ui_word in text_content.lower() for ui_word in
                                                     ['stars', 'collapse', 'arrow keys', 'search options']):
                     return True
             except:
                 pass
-                
+
             return False
-            
+
         except:
             return False
 
-    def _extract_all_businesses(self, page, max_results, category=None):
-        """Extract business information from all visible cards"""
-        results = []
-        
+    async def _card_href(self, element):
+        """Return the /maps/place/ link of a result card, if any"""
         try:
-            time.sleep(5)
-            
-            business_elements = []
-            
-            selectors_to_try = [
-                'a[data-cid]',
-                'div[role="article"]',
-                'div[data-result-index]',
-                'div.section-result',
-                'div.Nv2PK',
-                'a[aria-label][href*="/maps/place/"]',
-                'div[jsaction*="pane.focusResult"]'
-            ]
-            
-            for selector in selectors_to_try:
-                elements = page.query_selector_all(selector)
-                if elements:
-                    print(f"✅ Found {len(elements)} elements with selector: {selector}")
-                    business_elements = elements
+            href = await element.get_attribute('href')
+            if href and '/maps/place/' in href:
+                return href
+            link = await element.query_selector('a[href*="/maps/place/"]')
+            if link:
+                return await link.get_attribute('href')
+        except:
+            pass
+        return None
+
+    def _parse_card(self, raw, category=None, parsed=None):
+        """Turn one harvested result card into a place dict; `parsed` is its
+        CARD_PARSERS result when the caller parsed a whole batch"""
+        data = {
+            'name': None,
+            'address': None,
+            'phone': None,
+            'rating': None,
+            'review_count': None,
+            'category': category or 'general',
+            'scraped_at': datetime.now(),
+            'latitude': None,
+            'longitude': None
+        }
+
+        if raw.get('name'):
+            data['name'] = raw['name'].strip()
+
+        parsed = parsed or parse_fields(raw, CARD_PARSERS)
+        data['href'] = raw.get('href') or None
+        data['latitude'], data['longitude'] = parsed['coordinates']
+        data['rating'] = parsed['rating']
+        data['review_count'] = parsed['review_count']
+        data['phone'] = parsed['phone']
+
+        # First detail row reads "Category · Address"
+        rows = raw.get('rows') or []
+        if rows and len(rows[0]) > 1:
+            address = self._clean_address(rows[0][-1])
+            if len(address) > 5:
+                data['address'] = address
+
+        return data
+
+    async def _harvest_cards(self, page, start, category=None):
+        """Read the result cards rendered since index `start` in one evaluate call"""
+        try:
+            raw_cards = await page.evaluate(_CARD_HARVEST_JS, start)
+        except Exception as e:
+            log.warning("⚠️ Error harvesting result cards: %s", e)
+            return []
+
+        cards = []
+        for raw, parsed in zip(raw_cards, parse_records(raw_cards, CARD_PARSERS)):
+            place = self._parse_card(raw, category, parsed)
+            list_fields = {field for field in PLACE_FIELDS if place.get(field) is not None}
+            cards.append((raw.get('href'), place, list_fields))
+        return cards
+
+    async def _new_card_elements(self, page, cursor):
+        """Handles for the clickable cards rendered since the last call"""
+        if cursor['selector'] is None:
+            selectors = self.selectors.order('card', CARD_SELECTORS)
+            for i, selector in enumerate(selectors):
+                if await page.query_selector(selector):
+                    log.debug("✅ Found result cards with selector: %s", selector)
+                    cursor['selector'] = selector
+                    self._record_cascade('card', selectors, i)
                     break
-            
-            if not business_elements:
-                print("⚠️ No business elements found")
+            else:
+                self._record_cascade('card', selectors, None)
                 return []
-            
-            print(f"📊 Processing {min(len(business_elements), max_results)} businesses")
-            business_elements = business_elements[:max_results]
-            
-            processed_places = set()
-            
-            for i, element in enumerate(business_elements, 1):
-                try:
-                    print(f"🏪 Processing business {i}/{len(business_elements)}")
 
-                    if not self._is_business_card(element):
-                        print(f"   Skipping non-business element {i}")
-                        continue
+        handle = await page.evaluate_handle(_NEW_ELEMENTS_JS, [cursor['selector'], cursor['offset']])
+        try:
+            properties = await handle.get_properties()
+        finally:
+            await handle.dispose()
+        elements = [prop.as_element() for prop in properties.values()]
+        return [element for element in elements if element]
+
+    async def _next_cards(self, page, cursor, seen, category=None):
+        """Queue items for the cards that appeared since the last call"""
+        items = []
+
+        if self.extraction_mode == 'list':
+            cards = await self._harvest_cards(page, cursor['offset'], category)
+            cursor['offset'] += len(cards)
+            for href, place, list_fields in cards:
+                if not place['name'] or place['name'] in seen:
+                    self.metrics.inc('cards_skipped', reason='duplicate' if place['name'] else 'no_name')
+                    continue
+                seen.add(place['name'])
+                items.append((None, href, (place, list_fields)))
+            return items
 
-                    # Extract name directly from the card for de-duplication
-                    name_element = element.query_selector('[aria-label]')
-                    if name_element:
-                        name = name_element.get_attribute('aria-label').strip()
-                        if name in processed_places:
-                            print(f"⚠️ Skipping already processed place: {name}")
-                            continue
-                        processed_places.add(name)
-                    else:
-                        print(f"⚠️ Could not find name, skipping this element.")
-                        continue
+        elements = await self._new_card_elements(page, cursor)
+        cursor['offset'] += len(elements)
+        for element in elements:
+            try:
+                if not await self._is_business_card(element):
+                    self.metrics.inc('cards_skipped', reason='not_business')
+                    await element.dispose()
+                    continue
 
-                    # Primary method - click and extract detailed data
-                    business_data = self._extract_by_clicking(page, element, i, category)
-
-                    # Fallback: Try direct extraction if clicking fails
-                    if not business_data or not business_data.get('name'):
-                        print(f"   Trying fallback extraction for business {i}")
-                        business_data = self._extract_card_data(element, category)
-
-                    if business_data and business_data.get('name'):
-                        results.append(business_data)
-                        print(f"✅ Extracted: {business_data['name']}")
-                        if business_data.get('address'):
-                            print(f"   📍 Address: {business_data['address']}")
-                        if business_data.get('phone'):
-                            print(f"   📞 Phone: {business_data['phone']}")
-                        if business_data.get('latitude') and business_data.get('longitude'):
-                            print(f"   🌍 Location: {business_data['latitude']}, {business_data['longitude']}")
-                    else:
-                        print(f"⚠️ No data found for business {i}")
+                # Extract name directly from the card for de-duplication
+                name_element = await element.query_selector('[aria-label]')
+                name = (await name_element.get_attribute('aria-label')).strip() if name_element else None
+                if not name or name in seen:
+                    self.metrics.inc('cards_skipped', reason='duplicate' if name else 'no_name')
+                    await element.dispose()
+                    continue
+                seen.add(name)
 
-                    time.sleep(random.uniform(1, 2))  # Increased delay
-                    
-                except Exception as e:
-                    print(f"⚠️ Error processing business {i}: {str(e)}")
+                items.append((element, await self._card_href(element), None))
+            except Exception as e:
+                log.warning("⚠️ Error reading result card: %s", e)
+        return items
+
+    async def _produce_cards(self, page, queue, category, max_results, page_lock, skip_keys=None):
+        """Scroll the feed and queue each new card as soon as it renders.
+
+        Stops once max_results cards are queued; a full queue pauses the
+        scrolling until the extraction workers catch up.
+        """
+        cursor = {'selector': None, 'offset': 0}
+        seen = set()
+        queued = 0
+        skipped = {'fresh': 0, 'harvested': 0}
+
+        async def queue_new_cards(state=None):
+            nonlocal queued
+            async with page_lock:
+                items = await self._next_cards(page, cursor, seen, category)
+                reasons = await self._skippable_cards(items, skip_keys) \
+                    if (self.fresh_ttl_hours or skip_keys) and items else []
+            for n, (element, href, card) in enumerate(items):
+                reason = reasons[n] if n < len(reasons) else None
+                if queued >= max_results or reason:
+                    if element:
+                        await element.dispose()
+                    if reason and queued < max_results:
+                        # Skipped places still count towards max_results
+                        queued += 1
+                        skipped[reason] += 1
+                        self.metrics.inc('cards_skipped', reason=reason)
                     continue
-            
+                queued += 1
+                await queue.put((queued, element, href, card))
+            return queued >= max_results
+
+        try:
+            async with page_lock:
+                await wait_for_dom_quiet(page, 'div[role="feed"]', self.waits.get('settle'))
+            if not await queue_new_cards():
+                await self._scroll_results(page, max_results, on_tick=queue_new_cards, lock=page_lock)
         except Exception as e:
-            print(f"❌ Error extracting businesses: {str(e)}")
-        
-        return results
+            log.error("❌ Error reading result cards: %s", e)
+            raise
+        log.info("📊 Queued %d result cards for extraction", queued - sum(skipped.values()))
+        if self.fresh_ttl_hours:
+            log.info("⏭️ Skipped %d unchanged places scraped in the last %sh", skipped['fresh'], self.fresh_ttl_hours)
+        if skipped['harvested']:
+            log.info("⏭️ Skipped %d places already harvested by an earlier attempt", skipped['harvested'])
+        self.fresh_skipped += skipped['fresh']
+
+    async def _skippable_cards(self, items, skip_keys=None):
+        """Why each card need not be opened: 'harvested' when its place key is
+        in skip_keys, 'fresh' when the place was scraped within the TTL and
+        the card's rating and review count still match the stored row, else None"""
+        cards = []
+        for element, href, card in items:
+            if card is not None:
+                place = card[0]
+            else:
+                place = self._parse_card(await element.evaluate(_CARD_SUMMARY_JS))
+            key = make_place_key(place['name'], place['latitude'], place['longitude'],
+                                 href=place.get('href') or href)
+            cards.append((key, place['rating'], place['review_count']))
+
+        skip_keys = skip_keys or set()
+        known = {}
+        if self.fresh_ttl_hours:
+            known = await asyncio.to_thread(self._known_places, [key for key, _, _ in cards if key not in skip_keys])
+            cutoff = datetime.now() - timedelta(hours=self.fresh_ttl_hours)
+        reasons = []
+        for key, rating, review_count in cards:
+            row = known.get(key)
+            if key in skip_keys:
+                reasons.append('harvested')
+            elif (row is not None and row['scraped_at'] is not None and row['scraped_at'] >= cutoff
+                  and (None if row['rating'] is None else float(row['rating'])) == rating
+                  and row['review_count'] == review_count):
+                reasons.append('fresh')
+            else:
+                reasons.append(None)
+        return reasons
 
-    def _extract_by_clicking(self, page, element, index, category=None):
-        """Extract data by clicking on the business card"""
+    def _known_places(self, place_keys):
         try:
-            print(f"   🖱️ Clicking business {index} for detailed data...")
+            db = DatabaseHandler()
+            try:
+                return db.get_place_freshness(place_keys)
+            finally:
+                db.close()
+        except Exception as e:
+            log.warning("⚠️ Could not look up known places: %s", e)
+            return {}
+
+    async def _stream_cards(self, page, context, category, max_results, skip_keys=None):
+        """Yield places while the feed is still being scrolled.
+
+        A producer task scrolls and queues cards into a bounded queue, and
+        up to `concurrency` workers extract them. Places are yielded in the
+        order they complete.
+        """
+        context = context or page.context
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        out = asyncio.Queue()
+        # The producer and the search-page worker take turns on the page
+        page_lock = asyncio.Lock()
+
+        producer = asyncio.create_task(
+            self._produce_cards(page, queue, category, max_results, page_lock, skip_keys)
+        )
+        # The results page itself always works the queue, so a search makes
+        # progress even when every other page slot is taken.
+        workers = [asyncio.create_task(
+            self._detail_worker(queue, out, max_results, category, page=page, context=context, lock=page_lock)
+        )]
+        for _ in range(self.concurrency - 1):
+            workers.append(asyncio.create_task(
+                self._detail_worker(queue, out, max_results, category, context=context)
+            ))
+
+        async def finish():
+            try:
+                await producer
+                await queue.join()
+            finally:
+                await out.put(None)
 
-            # Scroll element into view
-            element.scroll_into_view_if_needed()
-            time.sleep(1)
+        finisher = asyncio.create_task(finish())
+        try:
+            while True:
+                place = await out.get()
+                if place is None:
+                    break
+                yield place
+            # Raises what stopped the producer, so a broken scroll is not a finished search
+            await finisher
+        finally:
+            tasks = [finisher, producer, *workers]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _extract_all_businesses(self, page, max_results, category=None, context=None):
+        """Extract business information from the result cards"""
+        return [place async for place in self._stream_cards(page, context, category, max_results)]
+
+    async def _detail_worker(self, queue, out, total, category, page=None, context=None, lock=None):
+        """Pull cards off the queue and extract them on one page.
+
+        The results page clicks cards in place; extra pages borrow a page slot
+        and open the card's place URL directly.
+        """
+        if page is not None:
+            if self.extraction_mode != 'list':
+                await self._drain_queue(queue, out, total, category, page, clicking=True, lock=lock)
+                return
+            # The feed is still scrolling, so list mode opens panels on a
+            # companion page of the search instead of navigating it away.
+            # stream_search took a page slot for it along with its own.
+            detail_page = await context.new_page()
+            try:
+                await self._drain_queue(queue, out, total, category, detail_page, clicking=False)
+            finally:
+                await detail_page.close()
+            return
 
-            # Click the element
-            element.click(timeout=5000)
+        async with self._page_slots:
+            detail_page = await context.new_page()
+            try:
+                await self._drain_queue(queue, out, total, category, detail_page, clicking=False)
+            finally:
+                await detail_page.close()
+
+    async def _drain_queue(self, queue, out, total, category, page, clicking, lock=None):
+        lock = lock or contextlib.nullcontext()
+        while True:
+            i, element, href, card = await queue.get()
 
-            # Wait for detailed view to load
             try:
-                page.wait_for_selector('h1.DUwDvf.lfPIob', timeout=10000)
-                print(f"   ✅ Details panel loaded for business {index}")
-            except:
-                print(f"   ⚠️ Details panel didn't load for business {index}")
+                log.debug("🏪 Processing business %d/%d", i, total)
+                list_fields = ()
+                opened_page = True
+
+                async with lock:
+                    if card is not None:
+                        # List mode - only open the panel for what the card lacked
+                        business_data, list_fields = card
+                        opened_page = await self._complete_from_detail(page, business_data, href, i, category)
+                    else:
+                        # Primary method - click (or open) and extract detailed data
+                        if clicking:
+                            business_data = await self._extract_by_clicking(page, element, i, category)
+                        elif href:
+                            business_data = await self._extract_by_url(page, href, i, category)
+                        else:
+                            business_data = None
+
+                        # Fallback: Try direct extraction if clicking fails
+                        if not business_data or not business_data.get('name'):
+                            log.debug("   Trying fallback extraction for business %d", i)
+                            self.metrics.inc('retries', stage='card_fallback')
+                            business_data = await self._extract_card_data(element, category)
+                            list_fields = PLACE_FIELDS
+
+                if business_data and business_data.get('name'):
+                    self.coverage.record(business_data, list_fields)
+                    self.metrics.inc('places_extracted', mode=self.extraction_mode)
+                    out.put_nowait(business_data)
+                    log.info("✅ Extracted: %s", business_data['name'])
+                    log.debug("   📍 Address: %s | 📞 Phone: %s | 🌍 Location: %s, %s",
+                              business_data.get('address'), business_data.get('phone'),
+                              business_data.get('latitude'), business_data.get('longitude'))
+                else:
+                    log.warning("⚠️ No data found for business %d", i)
+
+                if opened_page:
+                    await self.rate_policy.pause()
+
+            except Exception as e:
+                log.warning("⚠️ Error processing business %d: %s", i, e)
+            finally:
+                if element is not None:
+                    try:
+                        await element.dispose()
+                    except Exception:
+                        pass
+                queue.task_done()
+
+    async def _complete_from_detail(self, page, place, href, index, category=None):
+        """Fill the fields a result card lacked from the place's detail panel.
+
+        Returns True when the panel had to be opened.
+        """
+        missing = [field for field in PLACE_FIELDS if place.get(field) is None]
+        if not missing or not href:
+            return False
+
+        log.debug("   🔎 Opening detail panel for missing fields: %s", missing)
+        detail = await self._extract_by_url(page, href, index, category)
+        if detail:
+            for field in missing:
+                if detail.get(field) is not None:
+                    place[field] = detail[field]
+        return True
+
+    async def _extract_by_clicking(self, page, element, index, category=None):
+        """Extract data by clicking on the business card"""
+        try:
+            log.debug("   🖱️ Clicking business %d for detailed data...", index)
+
+            with self.metrics.timer('click'):
+                # Scroll element into view
+                await element.scroll_into_view_if_needed()
+
+                # Click the element
+                await element.click(timeout=5000)
+
+                # Wait for detailed view to load
+                panel_loaded = await self._wait_for_detail_panel(page, index)
+            if not panel_loaded:
                 return None
-            time.sleep(3)
 
             # Extract data from the details panel
-            data = self._extract_detail_panel_data(page, category)
+            data = await self._extract_detail_panel_data(page, category)
             if not data:
-                print(f"   ⚠️ Failed to extract detail panel data for business {index}")
+                log.warning("   ⚠️ Failed to extract detail panel data for business %d", index)
                 return None
 
             # Go back to results
             try:
+                async def click_back_button():
+                    back_button = await page.query_selector('button[aria-label*="Back"]')
+                    if back_button:
+                        await back_button.click()
+
                 back_methods = [
                     lambda: page.keyboard.press("Escape"),
                     lambda: page.go_back(),
-                    lambda: page.query_selector('button[aria-label*="Back"]').click() if page.query_selector('button[aria-label*="Back"]') else None
+                    click_back_button
                 ]
 
-                for method in back_methods:
+                for attempt, method in enumerate(back_methods):
+                    if attempt:
+                        self.metrics.inc('retries', stage='back')
                     try:
-                        method()
-                        time.sleep(2)
+                        await method()
+                        await wait_for_selector(page, 'div[role="feed"]', self.waits.get('back'))
                         break
                     except:
                         continue
             except Exception as e:
-                print(f"   ⚠️ Error going back: {e}")
+                log.warning("   ⚠️ Error going back: %s", e)
 
             return data
 
         except Exception as e:
-            print(f"   ⚠️ Error in click extraction: {e}")
+            log.warning("   ⚠️ Error in click extraction: %s", e)
             return None
 
-    
-    def _extract_place_images(self, page):
+    async def _wait_for_detail_panel(self, page, index):
+        """Wait for the place heading, then for the panel to stop changing"""
+        if not await wait_for_selector(page, 'h1.DUwDvf.lfPIob', self.waits.get('panel')):
+            log.warning("   ⚠️ Details panel didn't load for business %d", index)
+            return False
+        log.debug("   ✅ Details panel loaded for business %d", index)
+        await wait_for_dom_quiet(page, 'div[role="main"]', self.waits.get('settle'))
+        return True
+
+    async def _extract_by_url(self, page, href, index, category=None):
+        """Extract data by opening the card's place URL on a separate page"""
+        try:
+            log.debug("   🔗 Opening business %d on a parallel page...", index)
+            with self.metrics.timer('navigation', step='place'):
+                await page.goto(href, timeout=60000)
+                panel_loaded = await self._wait_for_detail_panel(page, index)
+            if not panel_loaded:
+                return None
+
+            data = await self._extract_detail_panel_data(page, category)
+            if not data:
+                log.warning("   ⚠️ Failed to extract detail panel data for business %d", index)
+                return None
+            return data
+
+        except Exception as e:
+            log.warning("   ⚠️ Error in URL extraction: %s", e)
+            return None
+
+
+    async def _extract_place_images(self, page):
         """Extract place images including background-style images"""
-        images = []
+        with self.metrics.timer('images'):
+            return await self._read_place_images(page)
+
+    async def _read_place_images(self, page):
         try:
             # Possible buttons to open gallery
             photos_button_selectors = [
@@ -359,229 +892,146 @@ class GoogleMapsScraper:
 
             for selector in photos_button_selectors:
                 try:
-                    button = page.query_selector(selector)
-                    if button and button.is_visible():
-                        button.click(timeout=5000)
-                        time.sleep(3)
+                    button = await page.query_selector(selector)
+                    if button and await button.is_visible():
+                        await button.click(timeout=5000)
+                        await wait_for_selector(page, 'div[role="img"].U39Pmb, img[src*="googleusercontent"]',
+                                                self.waits.get('images'), state='attached')
                         photos_button_clicked = True
                         break
                 except Exception as e:
-                    print(f"⚠️ Error clicking button {selector}: {e}")
+                    log.debug("⚠️ Error clicking button %s: %s", selector, e)
                     continue
 
             if not photos_button_clicked:
-                print("⚠️ Photos button not found or not clickable. Trying to extract background images directly.")
-
-            # Scroll gallery even if photos button was not clicked
-            for _ in range(10):
-                page.mouse.wheel(0, 1000)
-                time.sleep(2)
-
-            image_urls = set()
-
-            # Extract <img> images
-            img_elements = page.query_selector_all('img[src^="https://"]')
-            for img in img_elements:
-                src = img.get_attribute('src')
-                if src and 'googleusercontent' in src:
-                    image_urls.add(src)
-
-            # Extract background-image URLs from style attributes
-            bg_elements = page.query_selector_all('div[role="img"].U39Pmb')
-            for bg in bg_elements:
-                style = bg.get_attribute('style')
-                if style and 'background-image' in style:
-                    match = re.search(r'url\(&quot;(.*?)&quot;\)', style)
-                    if match:
-                        url = match.group(1)
-                        if url.startswith('https://'):
-                            image_urls.add(url)
+                log.debug("⚠️ Photos button not found or not clickable. Trying to extract background images directly.")
+
+            # Scroll the gallery (or the panel, if it did not open) until
+            # it stops growing. Each tick is one evaluate that scrolls,
+            # waits for new photos and reads every photo URL. Virtualized
+            # galleries drop photos scrolled out of view, so URLs accumulate.
+            image_urls = {}
+            idle = 0
+            ticks = 0
+            while ticks < self.gallery_max_ticks and idle < 2:
+                found = await page.evaluate(GALLERY_TICK_JS, {
+                    'images': IMAGE_SOURCES, 'scroll': ticks > 0, 'timeout': self.waits.get('settle'),
+                })
+                ticks += 1
+                before = len(image_urls)
+                image_urls.update(dict.fromkeys(canonical_images(found)))
+                idle = idle + 1 if len(image_urls) == before else 0
 
             if not image_urls:
-                print("⚠️ No images found with known selectors.")
+                log.warning("⚠️ No images found with known selectors.")
                 return []
 
-            print(f"✅ Total unique images found: {len(image_urls)}")
+            log.debug("✅ Total unique images found: %d in %d gallery ticks", len(image_urls), ticks)
             return list(image_urls)
 
         except Exception as e:
-            print(f"⚠️ Error extracting images: {e}")
+            log.warning("⚠️ Error extracting images: %s", e)
             return []
 
-    def _extract_detail_panel_data(self, page, category=None):
-        """IMPROVED: Extract comprehensive data from the opened business details panel"""
+    async def _cache_images(self, place):
+        """Download the thumbnails of a place's photos when the image cache is on"""
+        if self.image_cache and place.get('images'):
+            files = await self.image_cache.fetch_many(place['images'])
+            place['image_files'] = [files[url] for url in place['images'] if url in files]
+
+    async def _extract_detail_panel_data(self, page, category=None):
+        """Extract comprehensive data from the opened business details panel.
+
+        The whole DETAIL_FIELDS cascade runs in one page.evaluate call; the
+        per-selector Playwright walk is only used for what the page could not
+        evaluate.
+        """
+        with self.metrics.timer('panel'):
+            return await self._read_detail_panel(page, category)
+
+    async def _read_detail_panel(self, page, category=None):
+        fields = self.selectors.order_fields('detail', DETAIL_FIELDS)
         try:
-            data = {}
+            try:
+                raw = await page.evaluate(DETAIL_EXTRACTOR_JS, extractor_args(fields))
+            except Exception as e:
+                log.warning("   ⚠️ In-page extractor failed, using selector fallback: %s", e)
+                raw = await self._query_detail_fields(page, fields)
+                for field, spec in fields.items():
+                    self._record_cascade(f'detail.{field}', spec['selectors'], raw['matched'][field])
+                raw['latitude'], raw['longitude'] = parse_coordinates(page.url)
+            else:
+                leftovers = {}
+                for field, spec in fields.items():
+                    # The page skips Playwright-only selectors (e.g. :has-text),
+                    # so only the selectors it could run count as tried there
+                    in_page = [sel for sel in spec['selectors'] if not is_playwright_only(sel)]
+                    hit = raw['matched'].get(field)
+                    self._record_cascade(f'detail.{field}', in_page,
+                                         None if hit is None else in_page.index(spec['selectors'][hit]))
+
+                    # ...and give them a go for fields that are still empty
+                    playwright_selectors = [sel for sel in spec['selectors'] if is_playwright_only(sel)]
+                    if not raw.get(field) and playwright_selectors:
+                        leftovers[field] = {**spec, 'selectors': playwright_selectors}
+                if leftovers:
+                    found = await self._query_detail_fields(page, leftovers)
+                    for field, spec in leftovers.items():
+                        self._record_cascade(f'detail.{field}', spec['selectors'], found['matched'][field])
+                        if found[field]:
+                            raw[field] = found[field]
+
             data = {
-                'name': None,
-                'address': None,
-                'phone': None,
-                'rating': None,
-                'review_count': None,
                 'category': category or 'general',
                 'scraped_at': datetime.now(),
-                'latitude': None,
-                'longitude': None
+                'images': canonical_images(raw.get('images')),
+                'href': page.url,
+                **parse_detail_fields(raw)
             }
-            
-            # Extract name - Multiple selectors
-            name_selectors = [
-                'h1.DUwDvf.lfPIob',
-                'h1.fontHeadlineLarge',
-                'h1[data-attrid="title"]',
-                'h1',
-                '.DUwDvf',
-                '.lfPIob'
-            ]
-            
-            for selector in name_selectors:
-                try:
-                    element = page.query_selector(selector)
-                    if element:
-                        name = element.inner_text().strip()
-                        if name and len(name) > 0:
-                            data['name'] = name
-                            print(f"   ✅ Found name: {name}")
-                            break
-                except:
-                    continue
-            
-            # Extract coordinates from URL
-            try:
-                current_url = page.url
-                # Look for coordinates in various URL patterns
-                coord_patterns = [
-                    r'/@(-?\d+\.\d+),(-?\d+\.\d+)',
-                    r'/place/[^/]+/@(-?\d+\.\d+),(-?\d+\.\d+)',
-                    r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)'
-                ]
-                
-                for pattern in coord_patterns:
-                    match = re.search(pattern, current_url)
-                    if match:
-                        data['latitude'] = float(match.group(1))
-                        data['longitude'] = float(match.group(2))
-                        print(f"   ✅ Found coordinates: {data['latitude']}, {data['longitude']}")
-                        break
-            except Exception as e:
-                print(f"   ⚠️ Error extracting coordinates: {e}")
-
-            # Extract address - Multiple approaches
-            address_selectors = [
-                'button[data-item-id="address"]',
-                'div[data-item-id="address"]',
-                '.rogA2c .Io6YTe',  # New Google Maps class
-                '.rogA2c',
-                'button[jsaction*="address"]',
-                'div[aria-label*="Address"]',
-                '.fontBodyMedium:has-text("Address")',
-                '.CsEnBe[aria-label*="Address"]'
-            ]
-            
-            for selector in address_selectors:
-                try:
-                    elements = page.query_selector_all(selector)
-                    for element in elements:
-                        address_text = element.inner_text().strip()
-                        # Filter out obvious non-addresses
-                        if (address_text and len(address_text) > 5 and 
-                            not any(word in address_text.lower() for word in ['website', 'phone', 'directions', 'save'])):
-                            data['address'] = address_text
-                            print(f"   ✅ Found address: {address_text}")
-                            break
-                    if data['address']:
-                        break
-                except:
-                    continue
-            
-            # Extract phone - Multiple approaches
-            phone_selectors = [
-                'button[data-item-id="phone"]',
-                'div[data-item-id="phone"]',
-                'button[jsaction*="phone"]',
-                'a[href^="tel:"]',
-                'div[aria-label*="Phone"]',
-                '.fontBodyMedium:has-text("+")',
-                '.CsEnBe[aria-label*="Phone"]'
-            ]
-            
-            for selector in phone_selectors:
+
+            if log.isEnabledFor(logging.DEBUG):
+                for field in ('name', 'address', 'phone', 'rating', 'review_count'):
+                    if data[field] is not None:
+                        log.debug("   ✅ Found %s: %s", field.replace('_', ' '), data[field])
+                if data['latitude'] is not None:
+                    log.debug("   ✅ Found coordinates: %s, %s", data['latitude'], data['longitude'])
+
+            return data if data['name'] else None
+
+        except Exception as e:
+            log.error("   ❌ Error extracting detail panel data: %s", e)
+            return None
+
+    async def _query_detail_fields(self, page, fields):
+        """Selector-by-selector fallback over a DETAIL_FIELDS-style table.
+
+        Like the in-page extractor, raw['matched'][field] is the index of the
+        selector that produced the value, or None.
+        """
+        raw = {'matched': {}}
+        for field, spec in fields.items():
+            raw[field] = None
+            raw['matched'][field] = None
+            for index, selector in enumerate(spec['selectors']):
                 try:
-                    elements = page.query_selector_all(selector)
+                    if spec.get('all_matches'):
+                        elements = await page.query_selector_all(selector)
+                    else:
+                        element = await page.query_selector(selector)
+                        elements = [element] if element else []
                     for element in elements:
-                        phone_text = element.inner_text().strip()
-                        phone_pattern = r'(\+?\d[\d\s\-\(\)]{8,})'  # Better phone pattern
-                        phone_match = re.search(phone_pattern, phone_text)
-                        if phone_match:
-                            clean_phone = phone_match.group(1).strip()
-                            data['phone'] = clean_phone
-                            print(f"   ✅ Found phone: {clean_phone}")
+                        value = match_text(spec, (await element.inner_text()).strip())
+                        if value:
+                            raw[field] = value
+                            raw['matched'][field] = index
                             break
-                    if data['phone']:
+                    if raw[field]:
                         break
                 except:
                     continue
-    
-            # Extract rating and reviews
-            try:
-                # Rating
-                rating_selectors = [
-                    # '.MW4etd',
-                    # '.ceNzKf',
-                    # 'span[aria-hidden="true"]:has-text(".")',
-                    'div.F7nice span span[aria-hidden="true"]'
-                ]
-                
-                for selector in rating_selectors:
-                    try:
-                        element = page.query_selector(selector)
-                        if element:
-                            rating_text = element.inner_text().strip()
-                            rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                            if rating_match:
-                                rating_value = float(rating_match.group(1))
-                                rating_value = rating_value
-                                if 0 <= rating_value <= 5:  # Valid rating range
-                                    data['rating'] = rating_value
-                                    print(f"   ✅ Found rating: {rating_value}")
-                                break
-                    except:
-                        continue
-                
-                # Review count
-                review_selectors = [
-                    # '.UY7F9',
-                    # '.ceNzKf',
-                    # 'button:has-text("reviews")',
-                    # 'span:has-text("reviews")'
-                    'div.F7nice span span span[aria-label]'
+        return raw
 
-                ]
-                
-                for selector in review_selectors:
-                    try:
-                        element = page.query_selector(selector)
-                        if element:
-                            review_text = element.inner_text().strip()
-                            review_match = re.search(r'(\d{1,3}(?:,\d{3})*|\d+)', review_text)
-                            if review_match:
-                                review_count = int(review_match.group(1).replace(',', ''))
-                                data['review_count'] = review_count
-                                print(f"   ✅ Found review count: {review_count}")
-                                break
-                    except:
-                        continue
-                        
-            except Exception as e:
-                print(f"   ⚠️ Error extracting rating/reviews: {e}")
-            
-            return data if data['name'] else None
-            
-        except Exception as e:
-            print(f"   ❌ Error extracting detail panel data: {e}")
-            return None
-
-    def _extract_card_data(self, element, category):
+    async def _extract_card_data(self, element, category):
         """FALLBACK: Extract basic data from business card element"""
         try:
             data = {
@@ -598,25 +1048,24 @@ class GoogleMapsScraper:
 
             # Extract coordinates from href
             try:
-                map_link = element.query_selector('a[href*="maps/place"], a[href*="/@"]')
+                map_link = await element.query_selector('a[href*="maps/place"], a[href*="/@"]')
                 if map_link:
-                    href = map_link.get_attribute('href')
-                    match = re.search(r'/@(-?\d+\.\d+),(-?\d+\.\d+)', href)
-                    if match:
-                        data['latitude'] = float(match.group(1))
-                        data['longitude'] = float(match.group(2))
-                        print(f"   Found coordinates: {data['latitude']}, {data['longitude']}")
+                    href = await map_link.get_attribute('href')
+                    data['href'] = href
+                    data['latitude'], data['longitude'] = parse_coordinates(href)
+                    if data['latitude'] is not None:
+                        log.debug("   Found coordinates: %s, %s", data['latitude'], data['longitude'])
             except Exception as e:
-                print(f"   Error extracting coordinates: {e}")
+                log.debug("   Error extracting coordinates: %s", e)
 
             # Extract name from aria-label
             try:
-                aria_label = element.get_attribute('aria-label')
+                aria_label = await element.get_attribute('aria-label')
                 if aria_label:
                     ui_elements = ['stars', 'Collapse side panel', 'Map ·', 'Available search options', 'Use arrow keys']
                     if not any(ui_text in aria_label for ui_text in ui_elements):
                         data['name'] = aria_label.strip()
-                        print(f"   Found name via aria-label: {data['name']}")
+                        log.debug("   Found name via aria-label: %s", data['name'])
             except:
                 pass
 
@@ -631,240 +1080,325 @@ class GoogleMapsScraper:
                     ]
                     
                     for selector in heading_selectors:
-                        name_element = element.query_selector(selector)
+                        name_element = await element.query_selector(selector)
                         if name_element:
-                            name_text = name_element.inner_text().strip()
+                            name_text = (await name_element.inner_text()).strip()
                             if name_text and len(name_text) > 2:
                                 data['name'] = name_text
-                                print(f"   Found name via selector {selector}: {data['name']}")
+                                log.debug("   Found name via selector %s: %s", selector, data['name'])
                                 break
                 except:
                     pass
 
             # Extract address
             try:
-                address_element = element.query_selector('div[class*="address"], span[class*="address"]')
+                address_element = await element.query_selector('div[class*="address"], span[class*="address"]')
                 if address_element:
-                    address_text = address_element.inner_text().strip()
+                    address_text = (await address_element.inner_text()).strip()
                     if address_text and len(address_text) > 5:
                         data['address'] = address_text
-                        print(f"   Found address: {data['address']}")
+                        log.debug("   Found address: %s", data['address'])
             except:
                 pass
 
             # Extract phone
             try:
-                phone_element = element.query_selector('span:has-text("+")')
+                phone_element = await element.query_selector('span:has-text("+")')
                 if phone_element:
-                    phone_text = phone_element.inner_text().strip()
-                    phone_match = re.search(r'(\+?\d[\d\s\-\(\)]{8,})', phone_text)
-                    if phone_match:
-                        data['phone'] = phone_match.group(1).strip()
-                        print(f"   Found phone: {data['phone']}")
+                    data['phone'] = parse_phone(await phone_element.inner_text())
+                    if data['phone']:
+                        log.debug("   Found phone: %s", data['phone'])
             except:
                 pass
 
             # Extract rating
             try:
-                rating_element = element.query_selector('span[class*="MW4etd"], span[class*="ceNzKf"]')
+                rating_element = await element.query_selector('span[class*="MW4etd"], span[class*="ceNzKf"]')
                 if rating_element:
-                    rating_text = rating_element.inner_text().strip()
-                    rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                    if rating_match:
-                        rating_value = float(rating_match.group(1))
-                        if 0 <= rating_value <= 5:
-                            data['rating'] = rating_value
-                            print(f"   Found rating: {data['rating']}")
+                    data['rating'] = parse_rating(await rating_element.inner_text())
+                    if data['rating'] is not None:
+                        log.debug("   Found rating: %s", data['rating'])
             except:
                 pass
 
             # Extract review count
             try:
-                review_element = element.query_selector('span[class*="UY7F9"], span[class*="ceNzKf"]')
+                review_element = await element.query_selector('span[class*="UY7F9"], span[class*="ceNzKf"]')
                 if review_element:
-                    review_text = review_element.inner_text().strip()
-                    review_match = re.search(r'(\d{1,3}(?:,\d{3})*|\d+)', review_text)
-                    if review_match:
-                        data['review_count'] = int(review_match.group(1).replace(',', ''))
-                        print(f"   Found review count: {data['review_count']}")
+                    data['review_count'] = parse_count(await review_element.inner_text())
+                    if data['review_count'] is not None:
+                        log.debug("   Found review count: %s", data['review_count'])
             except:
                 pass
 
             return data if data['name'] else None
 
         except Exception as e:
-            print(f"   Error extracting card data: {str(e)}")
+            log.warning("   Error extracting card data: %s", e)
             return None
 
 
-    def _extract_reviews(self, page, place_id):
-        """Robust review extractor with smart container scrolling and fallbacks"""
+    async def _extract_reviews(self, page, place_id, known_keys=None, max_reviews=None):
+        """Read the newest reviews until a stored one, the budget or the end of the list.
+
+        Reviews are sorted newest first, so the first review whose key is in
+        known_keys marks where the previous scrape left off. If sorting
+        fails the list stays in relevance order, so known reviews are only
+        skipped and reading goes on to the budget. Every scroll step is a
+        single page.evaluate that also reads the new cards.
+        """
+        with self.metrics.timer('reviews'):
+            return await self._read_reviews(page, place_id, known_keys or set(), max_reviews or self.max_reviews)
+
+    async def _read_reviews(self, page, place_id, known_keys, max_reviews):
         reviews = []
+        sel = {
+            **REVIEW_SELECTORS,
+            'cards': self.selectors.order('review.card', REVIEW_SELECTORS['cards']),
+            **{field: self.selectors.order(f'review.{field}', REVIEW_SELECTORS[field])
+               for field in ('author', 'rating', 'text', 'date')},
+        }
         try:
-            # Click on the reviews button if it exists
-            reviews_button = page.query_selector('button[aria-label*="reviews"]')
+            reviews_button = await page.query_selector(sel['tab'])
             if reviews_button:
-                reviews_button.click()
-                time.sleep(3)
-
-            # Confirm reviews panel has opened
-            reviews_container = page.query_selector('div[aria-label="Reviews"]')
-            if not reviews_container:
-                print("⚠️ Reviews container not found. Falling back to page scroll.")
-                for _ in range(10):
-                    page.mouse.wheel(0, 1000)
-                    time.sleep(2)
-            else:
-                # Scroll the reviews container specifically
-                for _ in range(15):
-                    reviews_container.evaluate('el => el.scrollBy(0, 1000)')
-                    time.sleep(1.5)
-
-            # Try to load more reviews by clicking "Show more" buttons
-            while True:
-                try:
-                    more_button = page.query_selector('button[aria-label*="Show more reviews"]')
-                    if more_button:
-                        more_button.click()
-                        time.sleep(2)
-                    else:
+                await reviews_button.click()
+                await wait_for_selector(page, sel['cards'][0], self.waits.get('reviews'), state='attached')
+            newest_first = await self._sort_reviews_newest(page)
+
+            seen = set()
+            start = 0
+            scroll = False
+            idle = 0
+            stop_reason = 'budget'
+            while len(reviews) < max_reviews:
+                batch = await page.evaluate(REVIEW_HARVEST_JS, {
+                    'sel': sel, 'start': start, 'scroll': scroll,
+                    'timeout': self.waits.get('scroll'),
+                })
+                if not scroll:
+                    self._record_cascade('review.card', sel['cards'], batch['card_selector'])
+                scroll = True
+                start = batch['total']
+                if not batch['cards']:
+                    idle += 1
+                    if idle >= 2:
+                        stop_reason = 'end_of_list'
                         break
-                except:
-                    break
-
-            # Review card selectors (updated)
-            card_selectors = [
-                'div[data-review-id]',               # Most stable review card
-                'div.jftiEf',                        # Common container
-                'div[aria-label="User review"]',     # Seen in some newer layouts
-                'div[jscontroller="e6Mltc"]'         # Fallback structured container
-            ]
-
-            review_cards = []
-            for selector in card_selectors:
-                review_cards = page.query_selector_all(selector)
-                if review_cards:
-                    print(f"✅ Found {len(review_cards)} reviews using selector: {selector}")
-                    break
-
-            if not review_cards:
-                print("⚠️ No review cards found with known selectors.")
-                return []
-
-            for card in review_cards:
-                try:
-                    # AUTHOR
-                    author_selectors = [
-                        'div.KFi5wf span',
-                        '.TSUbDb .d4r55',
-                        'div[class*="d4r55"]',
-                        'div[class*="X5PpBb"] span'
-                    ]
-                    author = 'Unknown'
-                    for sel in author_selectors:
-                        el = card.query_selector(sel)
-                        if el:
-                            author = el.inner_text().strip()
-                            break
-
-                    # RATING
-                    rating = None
-                    rating_selectors = ['span[role="img"]', 'div.gws-localreviews__rating']
-                    for sel in rating_selectors:
-                        el = card.query_selector(sel)
-                        if el:
-                            label = el.get_attribute('aria-label') or el.inner_text()
-                            match = re.search(r'(\d+(\.\d+)?)', label)
-                            if match:
-                                rating = float(match.group(1))
-                                break
+                    continue
+                idle = 0
 
-                    # TEXT
-                    text = ''
-                    text_selectors = ['span.wiI7pd', '.review-full-text', '.Jtu6Td', 'div.MyEned span']
-                    for sel in text_selectors:
-                        el = card.query_selector(sel)
-                        if el:
-                            text = el.inner_text().strip()
+                for raw in batch['cards']:
+                    for field, index in raw['matched'].items():
+                        self._record_cascade(f'review.{field}', sel[field], index)
+                    review = self._parse_review(raw, place_id)
+                    if review is None or review['review_key'] in seen:
+                        continue
+                    seen.add(review['review_key'])
+                    if review['review_key'] in known_keys or review_content_key(review['author'], review['text']) in known_keys:
+                        if newest_first:
+                            stop_reason = 'known_review'
                             break
+                        # Relevance order: newer reviews may still follow
+                        continue
+                    reviews.append(review)
+                    if len(reviews) >= max_reviews:
+                        break
+                if stop_reason == 'known_review':
+                    break
 
-                    # DATE
-                    date = ''
-                    date_selectors = ['span.rsqaWe', '.dehysf']
-                    for sel in date_selectors:
-                        el = card.query_selector(sel)
-                        if el:
-                            date = el.inner_text().strip()
-                            break
+            log.info("💬 %d new reviews (stopped: %s)", len(reviews), stop_reason)
 
-                    # IMAGES
-                    image_elements = card.query_selector_all('img[src^="https://"]')
-                    images = [img.get_attribute('src') for img in image_elements if img.get_attribute('src')]
+        except Exception as e:
+            log.error("❌ Error extracting reviews: %s", e)
 
-                    # Skip empty reviews
-                    if not text and not rating:
-                        print(f"⚠️ Skipping empty review (no text and no rating)")
-                        continue
+        return reviews
 
-                    reviews.append({
-                        'place_id': place_id,
-                        'author': author,
-                        'rating': rating,
-                        'text': text,
-                        'date': date,
-                        'images': images,
-                        'scraped_at': datetime.now()
-                    })
+    async def _sort_reviews_newest(self, page):
+        """Switch the review list to newest first; keeps the default order on failure"""
+        try:
+            sort_button = await page.query_selector(REVIEW_SELECTORS['sort_button'])
+            if not sort_button:
+                return False
+            await sort_button.click()
+            if not await wait_for_selector(page, REVIEW_SELECTORS['sort_option'], self.waits.get('settle')):
+                return False
+            options = await page.query_selector_all(REVIEW_SELECTORS['sort_option'])
+            newest = None
+            for option in options:
+                if 'newest' in (await option.inner_text()).lower():
+                    newest = option
+                    break
+            # Maps lists Most relevant, Newest, Highest, Lowest
+            if newest is None and len(options) > 1:
+                newest = options[1]
+            if newest is None:
+                return False
+            await newest.click()
+            await wait_for_dom_quiet(page, REVIEW_SELECTORS['container'], self.waits.get('settle'))
+            return True
+        except Exception as e:
+            log.warning("⚠️ Could not sort reviews by newest: %s", e)
+            return False
 
-                except Exception as e:
-                    print(f"⚠️ Error extracting a review: {e}")
-                    continue
+    def _record_cascade(self, group, selectors, hit):
+        """Feed one selector cascade outcome to the metrics and the health registry"""
+        self.metrics.cascade(group, selectors, hit)
+        self.selectors.record(group, selectors, hit)
 
+    def _parse_review(self, raw, place_id):
+        """Turn one harvested review card into a place_reviews row, or None if empty"""
+        rating = parse_rating(raw.get('rating'))
+        text = raw.get('text') or ''
+        if not text and not rating:
+            return None
+        author = raw.get('author') or 'Unknown'
+        return {
+            'place_id': place_id,
+            'review_key': make_review_key(raw.get('id'), author, text),
+            'author': author,
+            'rating': rating,
+            'text': text,
+            'date': raw.get('date') or '',
+            'images': [src for src in raw.get('images') or [] if src],
+            'scraped_at': datetime.now()
+        }
+
+    def _known_review_keys(self, place_key):
+        try:
+            db = DatabaseHandler()
+            try:
+                return db.get_review_keys(place_key)
+            finally:
+                db.close()
         except Exception as e:
-            print(f"❌ Error extracting reviews: {e}")
-
-        return reviews
+            log.warning("⚠️ Could not look up stored reviews: %s", e)
+            return set()
 
 
     def _store_results(self, results):
         """Store results in database"""
-        for place in results:
-            print(f"🔹 Name: {place['name']}, Address: {place['address']}, Rating: {place['rating']}, Category: {place['category']}")
+        if log.isEnabledFor(logging.DEBUG):
+            for place in results:
+                log.debug("🔹 Name: %s, Address: %s, Rating: %s, Category: %s",
+                          place['name'], place['address'], place['rating'], place['category'])
 
 
         try:
             db = DatabaseHandler()
-            stored_count = 0
-            
-            for place_data in results:
+            failed = 0
+            try:
                 try:
-                    if not db.place_exists(place_data['name'], place_data['latitude'], place_data['longitude']):
-
-                        place_id = db.insert_place(place_data)
-                        if place_id:
-                            stored_count += 1
-                            print(f"✅ Stored: {place_data['name']}")
-                        else:
-                            print(f"❌ Failed to store: {place_data['name']}")
-                    else:
-                        print(f"⚠️ Already exists: {place_data['name']}")
+                    stored_count = self._write_places(db, results)
+                    db.commit()
                 except Exception as e:
-                    print(f"❌ Error storing {place_data['name']}: {e}")
-            
-            db.commit()
-            db.close()
-            print(f"🎉 Successfully stored {stored_count} new places!")
+                    # One bad place fails the whole upsert; keep the others
+                    log.warning("⚠️ Batch of %d places failed (%s), storing them one by one", len(results), e)
+                    db.rollback()
+                    stored_count = 0
+                    for place in results:
+                        try:
+                            stored_count += self._write_places(db, [place])
+                            db.commit()
+                        except Exception as e:
+                            db.rollback()
+                            failed += 1
+                            log.error("❌ Database error storing %s: %s", place.get('name'), e)
+            finally:
+                db.close()
+            log.info("⚠️ Already existed: %d places", len(results) - stored_count - failed)
+            log.info("🎉 Successfully stored %d new places!", stored_count)
             
         except Exception as e:
-            print(f"❌ Database error: {e}")
+            log.error("❌ Database error: %s", e)
+
+    def _write_places(self, db, places):
+        """Upsert places with their reviews and images; returns the number of new places"""
+        place_ids, stored_count = db.insert_places_bulk(places)
+        # Reviews and gallery images are only present when requested
+        db.insert_reviews_bulk([
+            dict(review, place_id=place_ids[place['place_key']])
+            for place in places if place['place_key'] in place_ids
+            for review in place.get('reviews') or []
+        ])
+        if self.extract_images:
+            new_images = db.insert_images_bulk({
+                place_ids[place['place_key']]: place['images']
+                for place in places if place.get('images') and place['place_key'] in place_ids
+            }, datetime.now())
+            log.info("🖼️ Stored %d new images", new_images)
+        return stored_count
 
     def _clean_address(self, address):
         return address.replace('\ue0c8', '').replace('\n', '').strip()
 
-    def close(self):
+    async def close(self):
         """Clean up resources"""
         try:
-            self.browser.close()
-            self.playwright.stop()
+            if self.contexts:
+                log.info("📊 Context pool: %s", self.contexts.metrics())
+                await self.contexts.close()
+            if self.image_cache:
+                self.image_cache.report()
+                await self.image_cache.close()
+            self.metrics.flush(force=True)
+            self.selectors.flush(force=True)
+            self.resources.report()
+            await self.browser.close()
+            await self.playwright.stop()
         except:
-            pass
\ No newline at end of file
+            pass
+
+
+class GoogleMapsScraper:
+    """Blocking facade over AsyncGoogleMapsScraper for the CLI and scripts"""
+
+    def __init__(self, headless=True, concurrency=1, wait_budget=None, rate_policy=None,
+                 extraction_mode='click', scroller=None, resource_profile=None, extract_images=False,
+                 fresh_ttl_hours=None, max_reviews=None, download_images=None):
+        self._loop = asyncio.new_event_loop()
+        self.engine = AsyncGoogleMapsScraper(
+            headless=headless, concurrency=concurrency,
+            wait_budget=wait_budget, rate_policy=rate_policy,
+            extraction_mode=extraction_mode, scroller=scroller,
+            resource_profile=resource_profile, extract_images=extract_images,
+            fresh_ttl_hours=fresh_ttl_hours, max_reviews=max_reviews,
+            download_images=download_images
+        )
+        self._loop.run_until_complete(self.engine.start())
+
+    def search_and_scrape(self, category, location, max_results=20):
+        """Search Google Maps and scrape results"""
+        return self._loop.run_until_complete(
+            self.engine.search_and_scrape(category, location, max_results)
+        )
+
+    def stream_search(self, category, location, max_results=20, skip_keys=None):
+        """Yield places from one search as they are extracted (not stored)"""
+        places = self.engine.stream_search(category, location, max_results, skip_keys)
+        try:
+            while True:
+                try:
+                    yield self._loop.run_until_complete(places.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._loop.run_until_complete(places.aclose())
+
+    def scrape_place(self, url, category=None):
+        """Scrape one /maps/place/ URL (not stored)"""
+        return self._loop.run_until_complete(self.engine.scrape_place(url, category))
+
+    def scrape_urls(self, urls, category=None, reviews=False):
+        """Scrape and store known place URLs concurrently, without searching"""
+        return self._loop.run_until_complete(self.engine.scrape_urls(urls, category, reviews))
+
+    def scrape_many(self, searches):
+        """Run several (category, location, max_results) searches concurrently"""
+        return self._loop.run_until_complete(self.engine.scrape_many(searches))
+
+    def close(self):
+        """Clean up resources"""
+        try:
+            self._loop.run_until_complete(self.engine.close())
+        finally:
+            self._loop.close()
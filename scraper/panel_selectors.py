@@ -0,0 +1,323 @@
+"""
+Declarative selector tables for the Google Maps detail panel.
+
+Both the in-page JavaScript extractor and the Playwright fallback walk the
+same table, so a selector only ever has to be changed here. The order
+below is the starting order; at run time each list is reordered by its
+recorded hit rate (see utils/selector_health.py).
+
+Each field spec:
+    selectors    -- tried in order, first usable value wins
+    all_matches  -- look at every match of a selector, not just the first
+    min_length   -- shortest text accepted
+    exclude      -- reject text containing any of these (lower-case) words
+    pattern      -- regex whose first group is the value
+"""
+
+import re
+
+from utils.parsing import (
+    COORDINATE_PATTERNS, COUNT_TOKEN, PHONE_TOKEN, RATING_TOKEN, parse_count, parse_phone,
+    parse_rating, valid_coordinates
+)
+
+
+DETAIL_FIELDS = {
+    'name': {
+        'selectors': [
+            'h1.DUwDvf.lfPIob',
+            'h1.fontHeadlineLarge',
+            'h1[data-attrid="title"]',
+            'h1',
+            '.DUwDvf',
+            '.lfPIob'
+        ],
+    },
+    'address': {
+        'selectors': [
+            'button[data-item-id="address"]',
+            'div[data-item-id="address"]',
+            '.rogA2c .Io6YTe',  # New Google Maps class
+            '.rogA2c',
+            'button[jsaction*="address"]',
+            'div[aria-label*="Address"]',
+            '.fontBodyMedium:has-text("Address")',
+            '.CsEnBe[aria-label*="Address"]'
+        ],
+        'all_matches': True,
+        'min_length': 6,
+        'exclude': ['website', 'phone', 'directions', 'save'],
+    },
+    'phone': {
+        'selectors': [
+            'button[data-item-id="phone"]',
+            'div[data-item-id="phone"]',
+            'button[jsaction*="phone"]',
+            'a[href^="tel:"]',
+            'div[aria-label*="Phone"]',
+            '.fontBodyMedium:has-text("+")',
+            '.CsEnBe[aria-label*="Phone"]'
+        ],
+        'all_matches': True,
+        'pattern': PHONE_TOKEN,
+    },
+    'rating': {
+        'selectors': [
+            'div.F7nice span span[aria-hidden="true"]'
+        ],
+        'pattern': RATING_TOKEN,
+    },
+    'review_count': {
+        'selectors': [
+            'div.F7nice span span span[aria-label]'
+        ],
+        'pattern': COUNT_TOKEN,
+    },
+}
+
+IMAGE_SOURCES = {
+    'img_selector': 'img[src^="https://"]',
+    'img_host': 'googleusercontent',
+    'background_selector': 'div[role="img"].U39Pmb',
+}
+
+# Runs the whole DETAIL_FIELDS cascade in the page and returns raw strings,
+# which parse_detail_fields turns into typed values.
+DETAIL_EXTRACTOR_JS = """
+({fields, coordinates, images}) => {
+    const matchText = (spec, text) => {
+        if (!text || text.length < (spec.min_length || 1)) return null;
+        const lower = text.toLowerCase();
+        if ((spec.exclude || []).some(word => lower.includes(word))) return null;
+        if (!spec.pattern) return text;
+        const match = text.match(new RegExp(spec.pattern));
+        return match ? match[1].trim() : null;
+    };
+
+    // Returns [value, index of the selector that produced it]
+    const pick = (spec) => {
+        for (const [index, selector] of spec.selectors.entries()) {
+            let elements;
+            try {
+                elements = spec.all_matches
+                    ? Array.from(document.querySelectorAll(selector))
+                    : [document.querySelector(selector)].filter(Boolean);
+            } catch (e) {
+                continue;  // Playwright-only syntax such as :has-text
+            }
+            for (const el of elements) {
+                const value = matchText(spec, (el.innerText || el.textContent || '').trim());
+                if (value) return [value, index];
+            }
+        }
+        return [null, null];
+    };
+
+    const out = {matched: {}};
+    for (const [field, spec] of Object.entries(fields)) {
+        [out[field], out.matched[field]] = pick(spec);
+    }
+
+    out.latitude = null;
+    out.longitude = null;
+    for (const pattern of coordinates) {
+        const match = location.href.match(new RegExp(pattern));
+        if (match) {
+            out.latitude = match[1];
+            out.longitude = match[2];
+            break;
+        }
+    }
+
+    const urls = new Set();
+    document.querySelectorAll(images.img_selector).forEach(img => {
+        if (img.src && img.src.includes(images.img_host)) urls.add(img.src);
+    });
+    document.querySelectorAll(images.background_selector).forEach(el => {
+        const match = (el.style.backgroundImage || '').match(/url\\(["']?(.*?)["']?\\)/);
+        if (match && match[1].startsWith('https://')) urls.add(match[1]);
+    });
+    out.images = Array.from(urls);
+    return out;
+}
+"""
+
+
+# Review panel. Each list is tried in order, first match wins; the engine
+# reorders the lists by hit rate (utils.selector_health).
+REVIEW_SELECTORS = {
+    'tab': 'button[aria-label*="reviews"]',
+    'container': 'div[aria-label="Reviews"]',
+    'sort_button': 'button[aria-label*="Sort reviews"], button[data-value="Sort"]',
+    'sort_option': 'div[role="menuitemradio"]',
+    'expand': 'button.w8nwRe',          # "More" on truncated review text
+    'show_more': 'button[aria-label*="Show more reviews"]',
+    'cards': [
+        'div[data-review-id]',               # Most stable review card
+        'div.jftiEf',                        # Common container
+        'div[aria-label="User review"]',     # Seen in some newer layouts
+        'div[jscontroller="e6Mltc"]'         # Fallback structured container
+    ],
+    'author': ['div.KFi5wf span', '.TSUbDb .d4r55', 'div[class*="d4r55"]', 'div[class*="X5PpBb"] span'],
+    'rating': ['span[role="img"]', 'div.gws-localreviews__rating'],
+    'text': ['span.wiI7pd', '.review-full-text', '.Jtu6Td', 'div.MyEned span'],
+    'date': ['span.rsqaWe', '.dehysf'],
+}
+
+# One review-panel round trip: optionally scroll the panel and wait for it
+# to grow, expand truncated texts, then read every card from `start` on.
+# Nested cards carrying the same review id are returned once.
+REVIEW_HARVEST_JS = """
+async ({sel, start, scroll, timeout}) => {
+    const cardSelector = sel.cards.find(s => document.querySelector(s)) || sel.cards[0];
+    const cards = () => Array.from(document.querySelectorAll(cardSelector))
+        .filter(card => !card.parentElement || !card.parentElement.closest(cardSelector));
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+    if (scroll) {
+        const before = cards().length;
+        const container = document.querySelector(sel.container);
+        if (container) container.scrollBy(0, Math.max(container.clientHeight * 2, 1000));
+        else window.scrollBy(0, 1000);
+        const started = performance.now();
+        while (cards().length <= before && performance.now() - started < timeout) {
+            await sleep(100);
+        }
+        if (cards().length <= before) {
+            const more = document.querySelector(sel.show_more);
+            if (more) {
+                more.click();
+                await sleep(500);
+            }
+        }
+    }
+
+    const all = cards();
+    const fresh = all.slice(start);
+    let expanded = false;
+    fresh.forEach(card => card.querySelectorAll(sel.expand).forEach(button => {
+        button.click();
+        expanded = true;
+    }));
+    if (expanded) await sleep(150);
+
+    // Returns [element, index of the selector that found it]
+    const first = (card, selectors) => {
+        for (const [index, s] of selectors.entries()) {
+            const el = card.querySelector(s);
+            if (el) return [el, index];
+        }
+        return [null, null];
+    };
+    const text = el => el ? (el.innerText || el.textContent || '').trim() : '';
+
+    const cardIndex = sel.cards.indexOf(cardSelector);
+    return {
+        total: all.length,
+        card_selector: all.length ? cardIndex : null,
+        cards: fresh.map(card => {
+            const [author, authorAt] = first(card, sel.author);
+            const [rating, ratingAt] = first(card, sel.rating);
+            const [body, textAt] = first(card, sel.text);
+            const [date, dateAt] = first(card, sel.date);
+            return {
+                id: card.getAttribute('data-review-id')
+                    || (card.querySelector('[data-review-id]') || card).getAttribute('data-review-id'),
+                author: text(author),
+                rating: rating ? (rating.getAttribute('aria-label') || text(rating)) : '',
+                text: text(body),
+                date: text(date),
+                images: Array.from(card.querySelectorAll('img[src^="https://"]')).map(img => img.src),
+                matched: {author: authorAt, rating: ratingAt, text: textAt, date: dateAt},
+            };
+        }),
+    };
+}
+"""
+
+
+# One gallery round trip: optionally scroll the gallery and wait up to
+# `timeout` ms for new photos, then return every photo URL on the page.
+GALLERY_TICK_JS = """
+async ({images, scroll, timeout}) => {
+    const collect = () => {
+        const urls = new Set();
+        document.querySelectorAll(images.img_selector).forEach(img => {
+            if (img.src && img.src.includes(images.img_host)) urls.add(img.src);
+        });
+        document.querySelectorAll(images.background_selector).forEach(el => {
+            const match = (el.style.backgroundImage || '').match(/url\\(["']?(.*?)["']?\\)/);
+            if (match && match[1].startsWith('https://')) urls.add(match[1]);
+        });
+        return urls;
+    };
+
+    const before = collect().size;
+    if (scroll) {
+        // The nearest scrollable ancestor of a photo is the gallery
+        const photo = document.querySelector(images.background_selector)
+            || document.querySelector(images.img_selector);
+        let box = photo && photo.parentElement;
+        while (box && box.scrollHeight <= box.clientHeight + 1) box = box.parentElement;
+        if (box) box.scrollBy(0, Math.max(box.clientHeight, 1000));
+        else window.scrollBy(0, 1000);
+
+        const started = performance.now();
+        while (collect().size <= before && performance.now() - started < timeout) {
+            await new Promise(resolve => setTimeout(resolve, 150));
+        }
+    }
+    return Array.from(collect());
+}
+"""
+
+
+def extractor_args(fields=None):
+    """Argument object handed to DETAIL_EXTRACTOR_JS"""
+    return {
+        'fields': fields or DETAIL_FIELDS,
+        'coordinates': COORDINATE_PATTERNS,  # Read from the place URL
+        'images': IMAGE_SOURCES,
+    }
+
+
+def is_playwright_only(selector):
+    """True for selectors document.querySelector cannot run"""
+    return ':has-text(' in selector or ':text(' in selector
+
+
+_compiled = {}
+
+
+def match_text(spec, text):
+    """Apply a field spec's filters to one element's text; same rules as the JS"""
+    if not text or len(text) < spec.get('min_length', 1):
+        return None
+    lower = text.lower()
+    if any(word in lower for word in spec.get('exclude', [])):
+        return None
+    if not spec.get('pattern'):
+        return text
+    pattern = _compiled.get(spec['pattern'])
+    if pattern is None:
+        pattern = _compiled[spec['pattern']] = re.compile(spec['pattern'])
+    match = pattern.search(text)
+    return match.group(1).strip() if match else None
+
+
+def parse_detail_fields(raw):
+    """Convert raw extractor strings into typed place fields"""
+    parsed = {
+        'name': raw.get('name'),
+        'address': raw.get('address'),
+        'phone': parse_phone(raw.get('phone')),
+        'rating': parse_rating(raw.get('rating')),
+        'review_count': parse_count(raw.get('review_count')),
+        'latitude': None,
+        'longitude': None,
+    }
+
+    if raw.get('latitude') and raw.get('longitude'):
+        parsed['latitude'], parsed['longitude'] = valid_coordinates(raw['latitude'], raw['longitude'])
+
+    return parsed
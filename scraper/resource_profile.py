@@ -0,0 +1,109 @@
+"""
+Request-routing profiles for scraper browser contexts.
+
+Extraction reads text and attributes from the DOM, so map tiles, fonts,
+media and analytics beacons are pure overhead. The 'light' profile
+aborts them through context.route. Images are blocked as well unless
+image extraction was requested; <img src> URLs stay in the DOM either
+way, only the bytes are skipped. The 'full' profile routes nothing and
+is the baseline for comparisons:
+
+    python benchmarks/resource_profile_benchmark.py "coffee" "Kochi"
+"""
+
+import re
+
+from utils.logging_setup import get_logger
+
+log = get_logger(__name__)
+
+
+# URL fragments for requests the scraper never needs
+TILE_PATTERNS = (
+    r'/maps/vt',
+    r'/kh/v=',
+    r'khms\d*\.google',
+    r'streetviewpixels',
+)
+TRACKING_PATTERNS = (
+    r'google-analytics\.com',
+    r'googletagmanager\.com',
+    r'doubleclick\.net',
+    r'/gen_204',
+    r'/log\?',
+    r'/csi\?',
+    r'play\.google\.com/log',
+    r'/maps/preview/log',
+)
+BLOCKED_TYPES = {'font': 'fonts', 'media': 'media'}
+
+PROFILES = ('full', 'light')
+
+_TILES = re.compile('|'.join(TILE_PATTERNS))
+_TRACKING = re.compile('|'.join(TRACKING_PATTERNS))
+
+
+class ResourceProfile:
+    """Blocks unneeded requests on a context and counts what was loaded"""
+
+    def __init__(self, name='light', allow_images=False):
+        if name not in PROFILES:
+            raise ValueError(f"Unknown resource profile '{name}', expected one of {PROFILES}")
+        self.name = name
+        self.allow_images = allow_images
+        self.blocked = {'tiles': 0, 'tracking': 0, 'fonts': 0, 'media': 0, 'images': 0}
+        self.requests_allowed = 0
+        self.bytes_loaded = 0
+
+    def classify(self, resource_type, url):
+        """Category a request is blocked under, or None to let it through"""
+        if self.name == 'full':
+            return None
+        if _TRACKING.search(url):
+            return 'tracking'
+        if _TILES.search(url):
+            return 'tiles'
+        if resource_type in BLOCKED_TYPES:
+            return BLOCKED_TYPES[resource_type]
+        if resource_type == 'image' and not self.allow_images:
+            return 'images'
+        return None
+
+    async def apply(self, context):
+        """Install the profile on a new browser context"""
+        context.on('response', self._on_response)
+        if self.name != 'full':
+            await context.route('**/*', self._route)
+
+    async def _route(self, route):
+        request = route.request
+        category = self.classify(request.resource_type, request.url)
+        if category:
+            self.blocked[category] += 1
+            await route.abort()
+        else:
+            self.requests_allowed += 1
+            await route.continue_()
+
+    def _on_response(self, response):
+        # Content-Length is the transferred size; chunked responses lack it
+        # and are left out, so this slightly undercounts
+        length = response.headers.get('content-length')
+        if length and length.isdigit():
+            self.bytes_loaded += int(length)
+
+    def metrics(self):
+        return {
+            'profile': self.name,
+            'allow_images': self.allow_images,
+            'requests_allowed': self.requests_allowed,
+            'requests_blocked': sum(self.blocked.values()),
+            'blocked': dict(self.blocked),
+            'bytes_loaded': self.bytes_loaded,
+        }
+
+    def report(self):
+        stats = self.metrics()
+        blocked = ', '.join(f"{kind} {count}" for kind, count in self.blocked.items() if count)
+        log.info("🧱 Resource profile '%s': %.0f KiB loaded, %d requests blocked (%s)",
+                 self.name, stats['bytes_loaded'] / 1024, stats['requests_blocked'], blocked or 'none')
@@ -0,0 +1,235 @@
+"""
+Parsers for the JSON payloads Google Maps fetches over XHR.
+
+Scrolling the result list makes Maps request /search?tbm=map pages, and
+opening a place requests /maps/preview/place. Both carry the same nested
+place array, so reading it is far cheaper than walking the rendered DOM.
+The parsers are pure functions over response text and can be run against
+recorded fixtures without a browser:
+
+    python scraper/response_parser.py data/fixtures/maps_responses/search_coffee_kochi.txt
+
+A fixture with a <name>.expected.json next to it is checked against the
+places stored there (scraped_at aside), and the replay exits non-zero on
+a mismatch; tests/test_response_parser.py asserts the same.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utils.place_key import cid_from_feature_id, make_place_key
+
+
+SEARCH_URL_MARKERS = ('/search?tbm=map', '/search?authuser')
+PLACE_URL_MARKERS = ('/maps/preview/place',)
+
+XSSI_PREFIX = ")]}'"
+
+# Index paths into a place array
+PLACE_PATHS = {
+    'name': (11,),
+    'address': (39,),
+    'short_address': (18,),
+    'phone': (178, 0, 0),
+    'rating': (4, 7),
+    'review_count': (4, 8),
+    'latitude': (9, 2),
+    'longitude': (9, 3),
+    'categories': (13,),
+    'feature_id': (10,),
+    'place_id': (78,),
+}
+
+
+def _dig(node, path):
+    for index in path:
+        if not isinstance(node, list) or index >= len(node):
+            return None
+        node = node[index]
+    return node
+
+
+def decode_payload(text):
+    """Strip Google's XSSI guard (and the {"d": ...} wrapper) and parse JSON"""
+    text = text.strip()
+    if text.endswith('/*""*/'):
+        text = text[:-len('/*""*/')]
+    if text.startswith('{'):
+        text = json.loads(text).get('d', '')
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    return json.loads(text)
+
+
+def parse_place(place, category=None):
+    """Build the same place dict _extract_detail_panel_data produces"""
+    name = _dig(place, PLACE_PATHS['name'])
+    if not isinstance(name, str) or not name.strip():
+        return None
+
+    rating = _dig(place, PLACE_PATHS['rating'])
+    review_count = _dig(place, PLACE_PATHS['review_count'])
+    latitude = _dig(place, PLACE_PATHS['latitude'])
+    longitude = _dig(place, PLACE_PATHS['longitude'])
+    address = _dig(place, PLACE_PATHS['address']) or _dig(place, PLACE_PATHS['short_address'])
+    phone = _dig(place, PLACE_PATHS['phone'])
+    feature_id = _dig(place, PLACE_PATHS['feature_id'])
+    place_id = _dig(place, PLACE_PATHS['place_id'])
+
+    return {
+        'name': name.strip(),
+        'address': address.strip() if isinstance(address, str) else None,
+        'phone': phone.strip() if isinstance(phone, str) else None,
+        'rating': float(rating) if isinstance(rating, (int, float)) and 0 <= rating <= 5 else None,
+        'review_count': int(review_count) if isinstance(review_count, (int, float)) else None,
+        'category': category or 'general',
+        'scraped_at': datetime.now(),
+        'latitude': float(latitude) if isinstance(latitude, (int, float)) else None,
+        'longitude': float(longitude) if isinstance(longitude, (int, float)) else None,
+        'images': [],
+        'place_key': make_place_key(
+            name.strip(), latitude, longitude,
+            cid=cid_from_feature_id(feature_id) if isinstance(feature_id, str) else None,
+            place_id=place_id if isinstance(place_id, str) else None
+        ),
+    }
+
+
+def parse_search_response(text, category=None):
+    """Places from one /search?tbm=map payload, in result order"""
+    payload = decode_payload(text)
+    entries = _dig(payload, (0, 1)) or []
+    places = []
+    # The first entry describes the search itself, not a place
+    for entry in entries[1:]:
+        place = parse_place(_dig(entry, (14,)), category)
+        if place:
+            places.append(place)
+    return places
+
+
+def parse_place_response(text, category=None):
+    """The place from one /maps/preview/place payload, or None"""
+    payload = decode_payload(text)
+    return parse_place(_dig(payload, (6,)), category)
+
+
+class ResponseCollector:
+    """Captures search and place payloads from a page's network traffic"""
+
+    def __init__(self, category=None):
+        self.category = category
+        self._places = {}
+        self._pending = set()
+        self.responses_seen = 0
+        self.parse_errors = 0
+
+    def attach(self, page):
+        page.on('response', self._on_response)
+        return self
+
+    def detach(self, page):
+        page.remove_listener('response', self._on_response)
+
+    def _on_response(self, response):
+        url = response.url
+        if any(marker in url for marker in SEARCH_URL_MARKERS):
+            parser = parse_search_response
+        elif any(marker in url for marker in PLACE_URL_MARKERS):
+            parser = parse_place_response
+        else:
+            return
+        task = asyncio.ensure_future(self._consume(response, parser))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _consume(self, response, parser):
+        try:
+            text = await response.text()
+        except Exception:
+            return
+        self.responses_seen += 1
+        self.add_payload(text, parser)
+
+    def add_payload(self, text, parser=parse_search_response):
+        """Parse one payload; also used to feed recorded fixtures"""
+        try:
+            parsed = parser(text, self.category)
+        except (ValueError, TypeError, AttributeError):
+            self.parse_errors += 1
+            return
+        for place in parsed if isinstance(parsed, list) else [parsed]:
+            if not place:
+                continue
+            key = place['place_key']
+            known = self._places.get(key)
+            if known:
+                # A place payload fills gaps left by the search listing
+                known.update({k: v for k, v in place.items() if v is not None and known.get(k) is None})
+            else:
+                self._places[key] = place
+
+    async def drain(self):
+        """Wait for response bodies that are still being read"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def places(self, limit=None):
+        places = list(self._places.values())
+        return places[:limit] if limit else places
+
+
+def fixture_parser(path):
+    """Recorded place_* payloads come from /maps/preview/place, the rest from search"""
+    return parse_place_response if os.path.basename(path).startswith('place') else parse_search_response
+
+
+def parse_fixture(text, parser, category=None):
+    """Places parsed from one recorded payload, as a list"""
+    parsed = parser(text, category)
+    if isinstance(parsed, list):
+        return parsed
+    return [parsed] if parsed else []
+
+
+def expected_places(path):
+    """The places stored next to a fixture in <name>.expected.json, or None"""
+    expected_path = os.path.splitext(path)[0] + '.expected.json'
+    if not os.path.exists(expected_path):
+        return None
+    with open(expected_path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def comparable(place):
+    """A parsed place without the fields that change on every run"""
+    return {key: value for key, value in place.items() if key != 'scraped_at'}
+
+
+if __name__ == '__main__':
+    collector = ResponseCollector()
+    mismatches = 0
+    for path in sys.argv[1:]:
+        with open(path, encoding='utf-8') as fh:
+            text = fh.read()
+        parser = fixture_parser(path)
+        collector.add_payload(text, parser)
+
+        places = parse_fixture(text, parser)
+        expected = expected_places(path)
+        if expected is not None:
+            if [comparable(place) for place in places] == expected:
+                print(f"✅ {os.path.basename(path)}: {len(places)} places as expected")
+            else:
+                mismatches += 1
+                print(f"❌ {os.path.basename(path)}: parsed places differ from the expected ones")
+    for place in collector.places():
+        print(f"🔹 {place['name']} | {place['address']} | {place['phone']} | "
+              f"{place['rating']} ({place['review_count']}) | {place['latitude']}, {place['longitude']}")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,146 @@
+"""
+Adaptive scrolling of the Maps result feed.
+
+A MutationObserver installed on div[role="feed"] tracks the card count in
+the page, so each tick is one evaluate call that scrolls and resolves as
+soon as new cards render (or its wait runs out). The scroller widens its
+step and shortens its wait while cards arrive quickly, backs off when
+they don't, and stops on the target count, the "end of the list" marker,
+or a run of ticks without growth.
+"""
+
+import contextlib
+import time
+
+from utils.logging_setup import get_logger
+
+log = get_logger(__name__)
+
+
+CARD_SELECTOR = 'div.Nv2PK'
+
+_SCROLL_TICK_JS = """
+async ([distance, timeoutMs, cardSelector]) => {
+    const feed = document.querySelector('div[role="feed"]');
+    if (!feed) {
+        return {count: document.querySelectorAll(cardSelector).length, grew: false, ended: true, missing: true, waited: 0};
+    }
+
+    let watch = window.__feedWatch;
+    if (!watch || watch.feed !== feed) {
+        if (watch) watch.observer.disconnect();
+        watch = {feed: feed, count: feed.querySelectorAll(cardSelector).length, listeners: []};
+        watch.observer = new MutationObserver(() => {
+            const count = feed.querySelectorAll(cardSelector).length;
+            if (count !== watch.count) {
+                watch.count = count;
+                watch.listeners.splice(0).forEach(notify => notify());
+            }
+        });
+        watch.observer.observe(feed, {childList: true, subtree: true});
+        window.__feedWatch = watch;
+    }
+
+    const started = performance.now();
+    const grew = await new Promise(resolve => {
+        const timer = setTimeout(() => resolve(false), timeoutMs);
+        watch.listeners.push(() => { clearTimeout(timer); resolve(true); });
+        feed.scrollBy(0, distance);
+    });
+
+    const tail = feed.lastElementChild ? feed.lastElementChild.innerText || '' : '';
+    const ended = !!feed.querySelector('span.HlvSq') || /end of the list/i.test(tail);
+    return {count: watch.count, grew: grew, ended: ended, missing: false, waited: performance.now() - started};
+}
+"""
+
+
+class AdaptiveScroller:
+    """Scrolls the result feed until it saturates; see module docstring"""
+
+    def __init__(self, max_wait=4000, min_wait=400, min_distance=800, max_distance=5000,
+                 patience=3, max_ticks=60):
+        self.max_wait = max_wait
+        self.min_wait = min_wait
+        self.min_distance = min_distance
+        self.max_distance = max_distance
+        self.patience = patience
+        self.max_ticks = max_ticks
+
+    async def scroll(self, page, target=None, on_tick=None, lock=None):
+        """Scroll until `target` cards are loaded or the feed stops growing.
+
+        `on_tick(state)` is awaited after every tick and stops the scroll by
+        returning True. `lock` is held around each tick when other tasks
+        share the page. Returns a report dict with the card count, ticks,
+        time and yield; a tick that fails stops on 'error' with the
+        exception text in report['error'].
+        """
+        lock = lock or contextlib.nullcontext()
+        distance = self.min_distance
+        wait = self.max_wait // 2
+        idle_ticks = 0
+        ticks = 0
+        start_count = None
+        state = {'count': 0}
+        reason = 'max_ticks'
+        error = None
+        started = time.perf_counter()
+
+        while ticks < self.max_ticks:
+            ticks += 1
+            try:
+                async with lock:
+                    state = await page.evaluate(_SCROLL_TICK_JS, [distance, wait, CARD_SELECTOR])
+            except Exception as e:
+                log.warning("⚠️ Scroll error: %s", e)
+                reason = 'error'
+                error = str(e)
+                break
+
+            if start_count is None:
+                start_count = state['count'] - (1 if state['grew'] else 0)
+            if state['missing']:
+                reason = 'no_feed'
+                break
+            if on_tick and await on_tick(state):
+                reason = 'target'
+                break
+            if target and state['count'] >= target:
+                reason = 'target'
+                break
+            if state['ended']:
+                reason = 'end_of_list'
+                break
+
+            if state['grew']:
+                idle_ticks = 0
+                # Cards came back fast: take bigger steps and expect them sooner
+                if state['waited'] < wait / 2:
+                    distance = min(int(distance * 1.5), self.max_distance)
+                    wait = max(int(wait * 0.75), self.min_wait)
+            else:
+                idle_ticks += 1
+                if idle_ticks >= self.patience:
+                    reason = 'saturated'
+                    break
+                # Give a slow network more time before calling it saturated
+                wait = min(int(wait * 1.5), self.max_wait)
+
+        seconds = time.perf_counter() - started
+        count = state['count']
+        gained = count - (start_count or 0)
+        report = {
+            'cards': count,
+            'new_cards': gained,
+            'ticks': ticks,
+            'seconds': round(seconds, 2),
+            'cards_per_tick': round(gained / ticks, 2) if ticks else 0.0,
+            'cards_per_second': round(gained / seconds, 2) if seconds else 0.0,
+            'stop_reason': reason,
+        }
+        if error:
+            report['error'] = error
+        log.info("📜 Scrolled %d ticks in %ss: %d cards (%s/s), stopped on %s",
+                 ticks, report['seconds'], count, report['cards_per_second'], reason)
+        return report
@@ -0,0 +1,234 @@
+"""
+Multi-process scraping: shard (category, location) searches over worker
+processes that each drive their own browser.
+
+Workers only scrape. Every place is sent back over a queue to the parent,
+which is the single database writer and stores them in batches. Ctrl-C
+asks the workers to stop after the place they are on; what was already
+scraped is still written. A second Ctrl-C terminates them.
+
+    python scraper/sharded_runner.py --workers 4 --job coffee Kochi --job hotels Chennai
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from config.db_handler import DatabaseHandler
+from utils.logging_setup import get_logger, setup_logging
+from utils.metrics import get_metrics
+
+log = get_logger(__name__)
+
+
+def _worker_main(worker_id, jobs, results, stop, options):
+    """Entry point of a worker process"""
+    # Ctrl-C goes to the parent only; it tells workers to stop through `stop`.
+    # A new session keeps the terminal's SIGINT away from the browser too.
+    if hasattr(os, 'setsid'):
+        os.setsid()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Spawned, so nothing of the parent's setup carries over; logs to <process name>.log
+    setup_logging()
+    asyncio.run(_worker_loop(worker_id, jobs, results, stop, options))
+
+
+async def _worker_loop(worker_id, jobs, results, stop, options):
+    from scraper.maps_scraper import AsyncGoogleMapsScraper
+
+    stats = {'worker': worker_id, 'jobs': 0, 'failed': 0, 'places': 0, 'seconds': 0.0}
+    engine = AsyncGoogleMapsScraper(**options)
+    try:
+        await engine.start()
+    except Exception as e:
+        log.error("❌ Worker %d could not start a browser: %s", worker_id, e)
+        results.put(('exit', worker_id, stats))
+        return
+
+    try:
+        while not stop.is_set():
+            try:
+                job = jobs.get(timeout=1)
+            except queue.Empty:
+                continue
+            if job is None:
+                break
+
+            category, location, max_results = job
+            started = time.perf_counter()
+            count = 0
+            error = None
+            places = engine.stream_search(category, location, max_results)
+            try:
+                async for place in places:
+                    results.put(('place', worker_id, place))
+                    count += 1
+                    if stop.is_set():
+                        break
+            except Exception as e:
+                # stream_search re-raises engine errors, so this is a failed search
+                error = str(e) or type(e).__name__
+                stats['failed'] += 1
+                log.error("❌ Worker %d failed on %s in %s after %d places: %s",
+                          worker_id, category, location, count, e)
+            finally:
+                await places.aclose()
+
+            stats['jobs'] += 1
+            stats['places'] += count
+            stats['seconds'] += time.perf_counter() - started
+            results.put(('job', worker_id, (category, location, count, error)))
+    finally:
+        await engine.close()
+        results.put(('exit', worker_id, stats))
+
+
+class ShardedRunner:
+    """Runs searches across worker processes with one batched DB writer"""
+
+    def __init__(self, workers=None, batch_size=None, flush_interval=2.0, **scraper_options):
+        self.workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        self.batch_size = batch_size or int(os.getenv('DB_BATCH_SIZE', 500))
+        self.flush_interval = flush_interval
+        self.scraper_options = {'headless': True, **scraper_options}
+        self.worker_stats = {}
+        self.rows_written = 0
+        self.rows_inserted = 0
+        # Playwright does not survive fork(), so always spawn fresh interpreters
+        self._mp = multiprocessing.get_context('spawn')
+
+    def run(self, jobs, max_results=20):
+        """Scrape every (category, location[, max_results]) job; returns worker stats"""
+        job_queue = self._mp.Queue()
+        results = self._mp.Queue()
+        stop = self._mp.Event()
+
+        for job in jobs:
+            category, location = job[0], job[1]
+            job_queue.put((category, location, job[2] if len(job) > 2 else max_results))
+        for _ in range(self.workers):
+            job_queue.put(None)
+
+        processes = [
+            self._mp.Process(target=_worker_main, args=(i, job_queue, results, stop, self.scraper_options),
+                             name=f"scraper-worker-{i}")
+            for i in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        print(f"🚀 Started {self.workers} worker processes for {len(jobs)} searches")
+
+        started = time.perf_counter()
+        db = DatabaseHandler(batch_size=self.batch_size)
+        try:
+            self._write_results(results, processes, stop, db)
+        finally:
+            db.close()
+            # Workers flush their own metrics; these are the writer's
+            get_metrics().flush(force=True)
+            for process in processes:
+                process.join(timeout=30)
+                if process.is_alive():
+                    process.terminate()
+
+        self.report(time.perf_counter() - started)
+        return list(self.worker_stats.values())
+
+    def _write_results(self, results, processes, stop, db):
+        """Single writer: batch places from every worker into the database"""
+        batch = []
+        last_flush = time.monotonic()
+        running = set(range(len(processes)))
+
+        while running:
+            try:
+                try:
+                    kind, worker_id, payload = results.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    # A worker that died without saying goodbye is not coming back
+                    for worker_id in list(running):
+                        if not processes[worker_id].is_alive():
+                            print(f"⚠️ Worker {worker_id} exited unexpectedly")
+                            running.discard(worker_id)
+                    kind = None
+
+                if kind == 'place':
+                    batch.append(payload)
+                elif kind == 'job':
+                    category, location, count, error = payload
+                    if error:
+                        print(f"❌ Worker {worker_id}: {category} in {location} failed after {count} places: {error}")
+                    else:
+                        print(f"✅ Worker {worker_id}: {count} places for {category} in {location}")
+                elif kind == 'exit':
+                    self.worker_stats[worker_id] = payload
+                    running.discard(worker_id)
+
+                if batch and (len(batch) >= self.batch_size
+                              or time.monotonic() - last_flush >= self.flush_interval or not running):
+                    self._flush(db, batch)
+                    batch = []
+                    last_flush = time.monotonic()
+
+            except KeyboardInterrupt:
+                if stop.is_set():
+                    print("\n⚠️ Terminating workers")
+                    for process in processes:
+                        process.terminate()
+                    break
+                print("\n⚠️ Stopping after the current places (Ctrl-C again to terminate)")
+                stop.set()
+
+        if batch:
+            self._flush(db, batch)
+
+    def _flush(self, db, batch):
+        try:
+            _, inserted = db.insert_places_bulk(batch)
+            db.commit()
+            self.rows_written += len(batch)
+            self.rows_inserted += inserted
+            print(f"💾 Stored {len(batch)} places ({inserted} new)")
+        except Exception as e:
+            print(f"❌ Database error: {e}")
+            try:
+                db.conn.rollback()
+            except Exception:
+                pass
+
+    def report(self, elapsed):
+        print(f"\n📊 {self.rows_written} places written ({self.rows_inserted} new) in {elapsed:.1f}s")
+        print(f"{'worker':>6} {'jobs':>5} {'failed':>6} {'places':>7} {'busy s':>8} {'places/min':>11}")
+        for worker_id in sorted(self.worker_stats):
+            stats = self.worker_stats[worker_id]
+            rate = 60 * stats['places'] / stats['seconds'] if stats['seconds'] else 0.0
+            print(f"{worker_id:>6} {stats['jobs']:>5} {stats['failed']:>6} {stats['places']:>7} "
+                  f"{stats['seconds']:>8.1f} {rate:>11.1f}")
+
+
+def main():
+    setup_logging()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--job', nargs=2, action='append', metavar=('CATEGORY', 'LOCATION'), required=True)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: half the cores)")
+    parser.add_argument('--max-results', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv('SCRAPER_CONCURRENCY', 1)),
+                        help="pages per worker browser")
+    parser.add_argument('--mode', default=os.getenv('SCRAPER_EXTRACTION_MODE', 'click'),
+                        choices=('click', 'list', 'network'))
+    args = parser.parse_args()
+
+    runner = ShardedRunner(workers=args.workers, concurrency=args.concurrency, extraction_mode=args.mode)
+    runner.run(args.job, max_results=args.max_results)
+
+
+if __name__ == '__main__':
+    main()
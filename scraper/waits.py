@@ -0,0 +1,93 @@
+"""
+Event-driven waiting helpers for the Maps scraper.
+
+Every helper returns as soon as the page is ready and gives up once the
+step's timeout budget runs out, instead of sleeping for a fixed time.
+Throttling between places lives in RatePolicy so it can be tuned apart
+from readiness.
+"""
+
+import asyncio
+import os
+import random
+
+
+# Per-step timeout budget in milliseconds
+DEFAULT_TIMEOUTS = {
+    'cookies': 5000,
+    'search_box': 15000,
+    'results': 15000,
+    'scroll': 4000,
+    'settle': 3000,
+    'panel': 10000,
+    'back': 5000,
+    'reviews': 8000,
+    'images': 8000,
+}
+
+# Resolves true once `selector` (or <body>) has seen no mutation for quietMs,
+# false if it is still changing after timeoutMs.
+_DOM_QUIET_JS = """
+([selector, quietMs, timeoutMs]) => new Promise(resolve => {
+    const target = selector ? document.querySelector(selector) : document.body;
+    if (!target) {
+        resolve(false);
+        return;
+    }
+    let quietTimer = null;
+    let hardTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), quietMs);
+    });
+    const done = (settled) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(hardTimer);
+        resolve(settled);
+    };
+    observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+    quietTimer = setTimeout(() => done(true), quietMs);
+    hardTimer = setTimeout(() => done(false), timeoutMs);
+})
+"""
+
+class WaitBudget:
+    """Timeout budget (ms) for each scraping step"""
+
+    def __init__(self, timeouts=None):
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+
+    def get(self, step):
+        return self.timeouts.get(step, DEFAULT_TIMEOUTS['settle'])
+
+
+class RatePolicy:
+    """Randomised pause between places, separate from readiness waits"""
+
+    def __init__(self, min_delay=None, max_delay=None):
+        delay = float(os.getenv('SCRAPER_DELAY', 1.5))
+        self.min_delay = delay * 2 / 3 if min_delay is None else min_delay
+        self.max_delay = delay * 4 / 3 if max_delay is None else max_delay
+
+    async def pause(self):
+        if self.max_delay > 0:
+            await asyncio.sleep(random.uniform(self.min_delay, self.max_delay))
+
+
+async def wait_for_selector(page, selector, timeout, state='visible'):
+    """Wait for a selector and return its handle, or None on timeout"""
+    try:
+        return await page.wait_for_selector(selector, timeout=timeout, state=state)
+    except Exception:
+        return None
+
+
+async def wait_for_dom_quiet(page, selector=None, timeout=3000, quiet_ms=400):
+    """Wait until the subtree under `selector` stops mutating"""
+    try:
+        return await page.evaluate(_DOM_QUIET_JS, [selector, quiet_ms, timeout])
+    except Exception:
+        return False
@@ -0,0 +1,86 @@
+"""
+Checks utils/parsing.py against data/fixtures/parsing_cases.json, and that
+the *_TOKEN patterns the detail panel runs as JavaScript RegExp match the
+same text there as in Python.
+
+    python -m pytest tests/test_parsing.py
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utils.parsing import (
+    COORDINATE_PATTERNS, COUNT_TOKEN, PARSERS, PHONE_TOKEN, RATING_TOKEN, parse_batch, parse_records,
+)
+
+CASES_PATH = os.path.join(project_root, 'data', 'fixtures', 'parsing_cases.json')
+
+with open(CASES_PATH, encoding='utf-8') as fh:
+    CASES = json.load(fh)
+
+# Patterns the in-page extractor compiles with `new RegExp(pattern)`, and the fixture inputs to try them on
+JS_PATTERNS = {
+    'count': [COUNT_TOKEN],
+    'rating': [RATING_TOKEN],
+    'phone': [PHONE_TOKEN],
+    'coordinates': COORDINATE_PATTERNS,
+}
+
+# Prints, for each [pattern, text], the groups of the first match (or null)
+_JS_MATCH = """
+const pairs = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+console.log(JSON.stringify(pairs.map(([pattern, text]) => {
+    const match = text.match(new RegExp(pattern));
+    return match ? Array.from(match).slice(1).map(group => group === undefined ? null : group) : null;
+})));
+"""
+
+
+def expected_value(case):
+    return tuple(case['expected']) if case['kind'] == 'coordinates' else case['expected']
+
+
+@pytest.mark.parametrize('case', CASES, ids=lambda case: f"{case['kind']}:{case['input']!r}")
+def test_case(case):
+    assert PARSERS[case['kind']](case['input']) == expected_value(case)
+
+
+@pytest.mark.parametrize('kind', sorted(PARSERS))
+def test_batch_matches_single(kind):
+    texts = [case['input'] for case in CASES if case['kind'] == kind] * 2 + [None]
+    assert parse_batch(kind, texts) == [PARSERS[kind](text) for text in texts]
+
+
+def test_records():
+    table = {'rating': ('rating', 'rating_text'), 'review_count': ('count', 'reviews_text')}
+    raws = [{'rating_text': '4,5', 'reviews_text': '(1.234)'}, {'rating_text': None, 'reviews_text': '3M'}]
+    assert parse_records(raws, table) == [
+        {'rating': 4.5, 'review_count': 1234},
+        {'rating': None, 'review_count': 3_000_000},
+    ]
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+def test_tokens_match_the_same_text_in_javascript():
+    pairs = [
+        [pattern, case['input']]
+        for case in CASES
+        for pattern in JS_PATTERNS[case['kind']]
+    ]
+    result = subprocess.run(['node', '-e', _JS_MATCH], input=json.dumps(pairs),
+                            capture_output=True, text=True, encoding='utf-8', timeout=30, check=True)
+    in_page = json.loads(result.stdout)
+
+    for (pattern, text), js_groups in zip(pairs, in_page):
+        match = re.search(pattern, text)
+        py_groups = list(match.groups()) if match else None
+        assert js_groups == py_groups, f"{pattern} on {text!r}"
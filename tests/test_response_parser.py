@@ -0,0 +1,55 @@
+"""
+Replays the recorded Maps payloads in data/fixtures/maps_responses/ and
+compares the parsed places with the <name>.expected.json stored next to
+each one.
+
+    python -m pytest tests/test_response_parser.py
+"""
+
+import glob
+import os
+import sys
+
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scraper.response_parser import (
+    ResponseCollector, comparable, expected_places, fixture_parser, parse_fixture,
+)
+
+FIXTURES = sorted(glob.glob(os.path.join(project_root, 'data', 'fixtures', 'maps_responses', '*.txt')))
+
+
+def read(path):
+    with open(path, encoding='utf-8') as fh:
+        return fh.read()
+
+
+@pytest.mark.parametrize('path', FIXTURES, ids=os.path.basename)
+def test_fixture_matches_expected_places(path):
+    expected = expected_places(path)
+    assert expected is not None, f"no expected places stored for {os.path.basename(path)}"
+    places = parse_fixture(read(path), fixture_parser(path))
+    assert [comparable(place) for place in places] == expected
+
+
+def test_category_is_applied():
+    path = FIXTURES[0]
+    places = parse_fixture(read(path), fixture_parser(path), category='cafe')
+    assert places and all(place['category'] == 'cafe' for place in places)
+
+
+def test_place_payload_fills_gaps_in_search_listing():
+    collector = ResponseCollector()
+    for path in sorted(FIXTURES, key=lambda path: os.path.basename(path).startswith('place')):
+        collector.add_payload(read(path), fixture_parser(path))
+
+    assert collector.parse_errors == 0
+    places = {place['place_key']: place for place in collector.places()}
+    expected = {place['place_key']: place for path in FIXTURES for place in expected_places(path)}
+    assert places.keys() == expected.keys()
+    # The search listing lacks Coffee Beanz's phone; its place payload has it
+    beanz = next(place for place in places.values() if place['name'] == 'Coffee Beanz')
+    assert beanz['phone'] == '+91 484 236 1122'
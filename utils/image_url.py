@@ -0,0 +1,70 @@
+"""
+Canonical Google photo URLs.
+
+The same photo is served at many sizes: lh3.googleusercontent.com/p/AF1Qip...=w408-h306-k-no
+and ...=w80-h106-k-no are one image. Stripping the size options (the
+"=..." suffix, the size segment of older /s1600/photo.jpg style paths,
+or the w/h query of Street View thumbnails) gives one URL per photo,
+which is what images are deduplicated and keyed by.
+"""
+
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+GOOGLE_PHOTO_HOSTS = ('googleusercontent.com', 'ggpht.com')
+STREETVIEW_HOST = 'streetviewpixels-pa.googleapis.com'
+
+# "=w408-h306-k-no", "=s1600", "=w36-h36-p-rp-mo-br100"
+_SIZE_SUFFIX = re.compile(r'=(?:[swh]\d+|[a-z]{1,3})(?:-[a-z0-9]+)*$', re.I)
+# "/s1600/" or "/w400-h300-k-no/" right before the file name of legacy URLs
+_SIZE_SEGMENT = re.compile(r'/(?:[swh]\d+)(?:-[a-z0-9]+)*(?=/[^/]+$)', re.I)
+_STREETVIEW_SIZE_PARAMS = {'w', 'h'}
+
+
+def canonical_image_url(url):
+    """The size-independent form of a Google photo URL; other URLs are returned as they are"""
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+
+    if host.endswith(GOOGLE_PHOTO_HOSTS):
+        path = _SIZE_SUFFIX.sub('', parts.path)
+        if path == parts.path:
+            path = _SIZE_SEGMENT.sub('', path)
+        return urlunsplit(('https', parts.netloc, path, '', ''))
+
+    if host == STREETVIEW_HOST:
+        query = [(k, v) for k, v in parse_qsl(parts.query) if k not in _STREETVIEW_SIZE_PARAMS]
+        return urlunsplit(('https', parts.netloc, parts.path, urlencode(query), ''))
+
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, parts.query, ''))
+
+
+def canonical_images(urls):
+    """Canonical URLs of `urls`, deduplicated, in first-seen order"""
+    return list(dict.fromkeys(
+        canonical for canonical in (canonical_image_url(url) for url in urls or []) if canonical
+    ))
+
+
+def image_key(url):
+    """Hash of the canonical URL; primary key of the images table"""
+    return hashlib.sha1(canonical_image_url(url).encode('utf-8')).hexdigest()
+
+
+def sized_image_url(url, width):
+    """A `width` pixels wide rendition of a canonical photo URL, where the host supports it"""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.endswith(GOOGLE_PHOTO_HOSTS):
+        head, _, name = parts.path.rpartition('/')
+        if '.' in name:
+            # Legacy /.../photo.jpg paths take the size as a path segment
+            return urlunsplit(('https', parts.netloc, f"{head}/w{width}/{name}", '', ''))
+        return f"{url}=w{width}"
+    if host == STREETVIEW_HOST:
+        return f"{url}&w={width}&h={width * 3 // 4}"
+    return url
@@ -0,0 +1,84 @@
+"""
+Leveled, non-blocking logging for the scraper.
+
+Modules log through get_logger(__name__), and each entry point (main.py,
+the sharded runner and its workers, the backend, the benchmarks) calls
+setup_logging() once, so importing a module starts nothing. Records go
+onto an in-memory queue (QueueHandler), and one listener thread writes
+them out. The console gets the bare message, as the print() output did,
+and a rotating file in data/logs/ gets timestamps, process, logger and
+level. Scraping code never waits on stdout or the disk.
+
+    LOG_LEVEL      console and file level (INFO)
+    LOG_FILE       data/logs/scraper.log; worker processes write their
+                   own <process name>.log next to it, so rotation never
+                   races across processes
+    LOG_MAX_BYTES  size at which the file rotates (10 MB)
+    LOG_BACKUPS    rotated files kept (5)
+
+Per-place and per-review detail is logged at DEBUG with %-style
+arguments. When DEBUG is off it is never formatted.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import sys
+
+from dotenv import load_dotenv
+
+from utils.paths import project_path
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LOG_FILE = os.path.join(project_root, 'data', 'logs', 'scraper.log')
+
+FILE_FORMAT = '%(asctime)s %(processName)s %(name)s %(levelname)s %(message)s'
+
+_listener = None
+
+
+def setup_logging(level=None, log_file=None, console=True):
+    """Install the queue handler on the root logger; later calls are no-ops"""
+    global _listener
+    if _listener is not None:
+        return
+
+    load_dotenv()
+    level = level or os.getenv('LOG_LEVEL', 'INFO')
+    log_file = project_path(log_file or os.getenv('LOG_FILE') or DEFAULT_LOG_FILE)
+    process_name = multiprocessing.current_process().name
+    if process_name != 'MainProcess':
+        log_file = os.path.join(os.path.dirname(log_file), f"{process_name}.log")
+
+    handlers = []
+    if console:
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(logging.Formatter('%(message)s'))
+        handlers.append(stream)
+    try:
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        rotating = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+            backupCount=int(os.getenv('LOG_BACKUPS', 5)), encoding='utf-8'
+        )
+        rotating.setFormatter(logging.Formatter(FILE_FORMAT))
+        handlers.append(rotating)
+    except OSError as e:
+        print(f"⚠️ Could not open log file {log_file}: {e}")
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    root.addHandler(logging.handlers.QueueHandler(records))
+
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def get_logger(name):
+    """A module logger; its records go nowhere special until setup_logging() runs"""
+    return logging.getLogger(name)
@@ -0,0 +1,256 @@
+"""
+Structured timings and counters for the scrape pipeline.
+
+    from utils.metrics import get_metrics
+
+    metrics = get_metrics()
+    with metrics.timer('panel'):
+        ...
+    metrics.inc('rows_written', len(rows), table='places')
+
+Stage timers are histograms of seconds labelled by stage; counters take
+free-form labels. Everything is off unless SCRAPER_METRICS=1. Switched
+off, get_metrics() returns a NullMetrics whose methods do nothing, so
+call sites need no checks of their own.
+
+Each process keeps one file, <pid>-<start time>.json, in
+SCRAPER_METRICS_DIR and overwrites it atomically with its cumulative
+snapshot (at most once per SCRAPER_METRICS_INTERVAL seconds, plus once
+when the scraper closes). The directory therefore holds one small file
+per process. Files untouched for SCRAPER_METRICS_RETENTION_DAYS are
+removed when a new process starts. render_prometheus() merges the
+snapshots into the Prometheus text format, which the Flask backend
+serves on /metrics.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+from utils.logging_setup import get_logger
+from utils.paths import env_path
+
+log = get_logger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_METRICS_DIR = os.path.join(project_root, 'data', 'metrics')
+
+# Upper bounds (seconds) of the stage timer histogram buckets
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PREFIX = 'scraper_'
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class Metrics:
+    """Process-wide counters and stage histograms"""
+
+    enabled = True
+
+    def __init__(self, directory=None, interval=None):
+        self.directory = directory or env_path('SCRAPER_METRICS_DIR', DEFAULT_METRICS_DIR)
+        self.interval = float(os.getenv('SCRAPER_METRICS_INTERVAL', 30)) if interval is None else interval
+        self.started = time.time()
+        self.path = os.path.join(self.directory, f"{os.getpid()}-{int(self.started)}.json")
+        _prune(self.directory, float(os.getenv('SCRAPER_METRICS_RETENTION_DAYS', 7)) * 86400)
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def inc(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextlib.contextmanager
+    def timer(self, stage, **labels):
+        """Time the block into the stage_seconds histogram"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - started, stage=stage, **labels)
+
+    def cascade(self, group, selectors, hit):
+        """Count a selector fallback chain: selectors before index `hit` missed,
+        `hit` matched. hit=None means every selector missed."""
+        tried = selectors if hit is None else selectors[:hit + 1]
+        for i, selector in enumerate(tried):
+            self.inc('selector_hits' if i == hit else 'selector_misses', group=group, selector=selector)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'time': time.time(),
+                'pid': os.getpid(),
+                'started': self.started,
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in self.counters.items()
+                ],
+                'histograms': [
+                    {'name': name, 'labels': dict(labels), 'buckets': list(h.buckets),
+                     'counts': list(h.counts), 'sum': h.sum, 'count': h.count}
+                    for (name, labels), h in self.histograms.items()
+                ],
+            }
+
+    def flush(self, force=False):
+        """Overwrite this process's snapshot file, at most once per interval unless forced"""
+        if not force and time.monotonic() - self._last_flush < self.interval:
+            return
+        self._last_flush = time.monotonic()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write aside and rename, so a reader never sees half a snapshot
+            partial = f"{self.path}.part"
+            with open(partial, 'w', encoding='utf-8') as fh:
+                json.dump(self.snapshot(), fh)
+            os.replace(partial, self.path)
+        except OSError as e:
+            log.warning("⚠️ Could not write metrics: %s", e)
+
+
+class NullMetrics:
+    """Stand-in used when metrics are off; every method is a no-op"""
+
+    enabled = False
+    _timer = contextlib.nullcontext()
+
+    def inc(self, name, value=1, **labels):
+        pass
+
+    def observe(self, name, value, **labels):
+        pass
+
+    def timer(self, stage, **labels):
+        return self._timer
+
+    def cascade(self, group, selectors, hit):
+        pass
+
+    def snapshot(self):
+        return {}
+
+    def flush(self, force=False):
+        pass
+
+
+_metrics = None
+
+
+def get_metrics():
+    """The process-wide Metrics, or a NullMetrics when SCRAPER_METRICS is not 1"""
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics() if os.getenv('SCRAPER_METRICS', '0') == '1' else NullMetrics()
+    return _metrics
+
+
+def _prune(directory, max_age):
+    """Remove snapshot files of processes that stopped writing long ago"""
+    cutoff = time.time() - max_age
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def load_snapshots(directory=None):
+    """Latest snapshot of every process with a file in the metrics directory"""
+    directory = directory or env_path('SCRAPER_METRICS_DIR', DEFAULT_METRICS_DIR)
+    snapshots = []
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+    except FileNotFoundError:
+        return snapshots
+    for name in names:
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as fh:
+                snapshots.append(json.load(fh))
+        except (OSError, ValueError):
+            continue  # Pruned meanwhile
+    return snapshots
+
+
+def _labels(labels, extra=None):
+    labels = {**labels, **(extra or {})}
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+
+def render_prometheus(snapshots):
+    """Prometheus text exposition of the snapshots, summed across processes"""
+    counters = {}
+    histograms = {}
+    for snapshot in snapshots:
+        for counter in snapshot.get('counters', []):
+            key = _key(counter['name'], counter['labels'])
+            counters[key] = counters.get(key, 0) + counter['value']
+        for h in snapshot.get('histograms', []):
+            key = _key(h['name'], h['labels'])
+            merged = histograms.setdefault(key, {'buckets': h['buckets'], 'counts': [0] * len(h['buckets']),
+                                                 'sum': 0.0, 'count': 0})
+            merged['counts'] = [a + b for a, b in zip(merged['counts'], h['counts'])]
+            merged['sum'] += h['sum']
+            merged['count'] += h['count']
+
+    lines = []
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f"# TYPE {PREFIX}{name}_total counter")
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f"{PREFIX}{name}_total{_labels(dict(labels))} {value}")
+    for name in sorted({name for name, _ in histograms}):
+        lines.append(f"# TYPE {PREFIX}{name} histogram")
+        for (metric, labels), h in sorted(histograms.items()):
+            if metric != name:
+                continue
+            labels = dict(labels)
+            cumulative = 0
+            for bound, count in zip(h['buckets'], h['counts']):
+                cumulative += count
+                lines.append(f"{PREFIX}{name}_bucket{_labels(labels, {'le': bound})} {cumulative}")
+            lines.append(f"{PREFIX}{name}_bucket{_labels(labels, {'le': '+Inf'})} {h['count']}")
+            lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {h['sum']:.6f}")
+            lines.append(f"{PREFIX}{name}_count{_labels(labels)} {h['count']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,189 @@
+"""
+Shared parsers for the numbers, ratings, phones and coordinates Maps shows.
+
+The same value comes in many spellings depending on the UI language and
+where it is shown:
+
+    review counts   "1,234"  "1.234"  "1 234"  "1,23,456"  "(2,345)"
+                    "1.2K"  "1,2 k"  "3M"  "2,345 reviews"
+    ratings         "4.5"  "4,5"  "Rated 4.0 out of 5"  "4,0 étoiles"
+    phones          "+91 98470 12345"  "(0484) 234 5678"  "0484-2345678"
+    coordinates     ".../@9.9312,76.2673,17z"  "...!3d9.9312!4d76.2673"
+
+Every pattern is compiled once at import. Separators are read from the
+text itself rather than from a locale setting, since one page can mix
+languages: separators between groups of three digits (or in the Indian
+lakh grouping) are thousands separators, and otherwise the last one is
+the decimal point, as it is before a K/M/B suffix.
+
+Single values go through parse_count, parse_rating, parse_phone and
+parse_coordinates; parse_batch runs one of them over a whole list of raw
+strings. parse_fields applies a {field: (kind, raw key)} table to a raw
+record, and parse_records applies it to a list of records column by
+column.
+
+The *_TOKEN patterns are plain enough for JavaScript's RegExp too; the
+detail panel tables use them to pick values in the page.
+"""
+
+import re
+
+
+# Capturing patterns shared with the in-page extractor (first group is the value)
+COUNT_TOKEN = r"(\d[\d.,'\u00a0\u202f ]*\d(?:\s?[KkMmBb]\b)?|\d(?:\s?[KkMmBb]\b)?)"
+# A lone number: not a digit of "10", "12,3" or "1,000,000"
+RATING_TOKEN = r'(?<![\d.,])(\d(?:[.,]\d+)?)(?!\d|[.,]\d)'
+PHONE_TOKEN = r'(\+?\(?\d[\d\s\-().]{6,}\d)'
+
+# Place pin first; the /@ pair is the map viewport and only a fallback
+COORDINATE_PATTERNS = [
+    r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)',
+    r'/@(-?\d+\.\d+),(-?\d+\.\d+)',
+]
+
+_COUNT = re.compile(COUNT_TOKEN)
+_RATING = re.compile(RATING_TOKEN)
+_PHONE = re.compile(PHONE_TOKEN)
+_COORDINATES = [re.compile(pattern) for pattern in COORDINATE_PATTERNS]
+
+_SEPARATORS = re.compile(r"[.,'\u00a0\u202f ]")
+_THOUSANDS = re.compile(r"\d{1,3}([.,'\u00a0\u202f ])\d{3}(?:\1\d{3})*")
+_LAKHS = re.compile(r'\d{1,2}(?:,\d{2})+,\d{3}')
+_SPACES = re.compile(r'\s+')
+_NOT_DIGIT = re.compile(r'\D')
+
+MULTIPLIERS = {'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}
+
+# Digits in a dialable number, country code included (ITU E.164 allows 15)
+PHONE_DIGITS = (7, 15)
+
+
+def _to_float(number):
+    """A number written with any thousands/decimal separators, as a float"""
+    if _LAKHS.fullmatch(number) or _THOUSANDS.fullmatch(number):
+        return float(_SEPARATORS.sub('', number))
+    separators = _SEPARATORS.findall(number)
+    if not separators:
+        return float(number)
+    whole, _, fraction = number.rpartition(separators[-1])
+    return float(f"{_SEPARATORS.sub('', whole) or '0'}.{fraction}")
+
+
+def parse_count(text):
+    """A count such as a number of reviews as an int, or None"""
+    if text is None:
+        return None
+    if isinstance(text, (int, float)):
+        return int(text)
+    match = _COUNT.search(text)
+    if not match:
+        return None
+    token = match.group(1)
+    try:
+        multiplier = MULTIPLIERS.get(token[-1].lower())
+        if multiplier:
+            # "1.2K", "1,2 k": a lone separator before the suffix is the decimal point
+            number = token[:-1].rstrip()
+            if len(_SEPARATORS.findall(number)) == 1:
+                return round(float(_SEPARATORS.sub('.', number)) * multiplier)
+            return round(_to_float(number) * multiplier)
+        return round(_to_float(token))
+    except ValueError:
+        return None
+
+
+def parse_rating(text):
+    """A 0-5 star rating as a float, or None; "4.5" and "4,5" both read 4.5"""
+    if text is None:
+        return None
+    if isinstance(text, (int, float)):
+        value = float(text)
+    else:
+        match = _RATING.search(text)
+        if not match:
+            return None
+        value = float(match.group(1).replace(',', '.'))
+    return value if 0 <= value <= 5 else None
+
+
+def parse_phone(text):
+    """The first phone number in the text, with its spacing tidied, or None"""
+    if not text:
+        return None
+    for line in text.splitlines():
+        for match in _PHONE.finditer(line):
+            phone = _SPACES.sub(' ', match.group(1)).strip()
+            if PHONE_DIGITS[0] <= len(_NOT_DIGIT.sub('', phone)) <= PHONE_DIGITS[1]:
+                return phone
+    return None
+
+
+def phone_digits(phone):
+    """The dialable form of a phone number ("+91 98470 12345" -> "+919847012345")"""
+    if not phone:
+        return None
+    digits = _NOT_DIGIT.sub('', phone)
+    return f"+{digits}" if phone.lstrip().startswith('+') else digits
+
+
+def valid_coordinates(latitude, longitude):
+    """(latitude, longitude) as floats if both are in range, else (None, None)"""
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None, None
+    if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+        return latitude, longitude
+    return None, None
+
+
+def parse_coordinates(text):
+    """(latitude, longitude) from a Maps URL, or (None, None)"""
+    if text:
+        for pattern in _COORDINATES:
+            match = pattern.search(text)
+            if match:
+                coordinates = valid_coordinates(match.group(1), match.group(2))
+                if coordinates[0] is not None:
+                    return coordinates
+    return None, None
+
+
+PARSERS = {
+    'count': parse_count,
+    'rating': parse_rating,
+    'phone': parse_phone,
+    'coordinates': parse_coordinates,
+}
+
+
+def parse_batch(kind, texts):
+    """Parse a whole list of raw strings with one parser.
+
+    Maps repeats the same strings a lot ("4.5", "(12)"), so each distinct
+    string is parsed once per batch.
+    """
+    parser = PARSERS[kind]
+    seen = {}
+    results = []
+    append = results.append
+    for text in texts:
+        try:
+            append(seen[text])
+        except KeyError:
+            value = seen[text] = parser(text)
+            append(value)
+        except TypeError:  # Unhashable input
+            append(parser(text))
+    return results
+
+
+def parse_fields(raw, table):
+    """Apply a {field: (kind, raw key)} table to one raw record; returns {field: value}"""
+    return {field: PARSERS[kind](raw.get(key)) for field, (kind, key) in table.items()}
+
+
+def parse_records(raws, table):
+    """parse_fields over a list of raw records, one parse_batch per column"""
+    columns = {field: parse_batch(kind, [raw.get(key) for raw in raws]) for field, (kind, key) in table.items()}
+    return [{field: values[i] for field, values in columns.items()} for i in range(len(raws))]
@@ -0,0 +1,22 @@
+"""
+Paths of the files the scraper keeps under data/.
+
+Relative paths in .env (data/jobs.sqlite3, data/metrics, ...) are taken
+from the project root rather than from the directory a process was
+started in, so the scraper, its workers and the Flask backend all read
+and write the same files wherever each one is launched.
+"""
+
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def project_path(path):
+    """`path` made absolute, with a relative one taken from the project root"""
+    return path if os.path.isabs(path) else os.path.join(project_root, path)
+
+
+def env_path(name, default):
+    """The path set in environment variable `name`, or `default`, made absolute"""
+    return project_path(os.getenv(name) or default)
@@ -0,0 +1,65 @@
+"""
+Stable natural keys for places.
+
+Google's own identifiers are preferred: the CID (from data-cid, a cid=
+query or the 0x...:0x... feature id in a place URL) and otherwise the
+ChIJ... place id. Without either, the key is a hash of the normalized
+name and coordinates rounded to about 11 m, so small coordinate drift
+between scrapes still maps to the same row.
+"""
+
+import hashlib
+import re
+import unicodedata
+
+
+COORD_PRECISION = 4
+
+_FEATURE_ID = re.compile(r'(0x[0-9a-f]+):(0x[0-9a-f]+)', re.I)
+_CID_PARAM = re.compile(r'[?&]cid=(\d+)')
+_PLACE_ID = re.compile(r'!19s(ChIJ[\w-]+)')
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def cid_from_feature_id(feature_id):
+    """The decimal CID is the second half of a 0x...:0x... feature id"""
+    match = _FEATURE_ID.search(feature_id or '')
+    return str(int(match.group(2), 16)) if match else None
+
+
+def google_id_from_href(href):
+    """Google identifier embedded in a Maps link, prefixed with its kind"""
+    if not href:
+        return None
+    match = _CID_PARAM.search(href)
+    if match:
+        return f"cid:{match.group(1)}"
+    cid = cid_from_feature_id(href)
+    if cid:
+        return f"cid:{cid}"
+    match = _PLACE_ID.search(href)
+    if match:
+        return f"pid:{match.group(1)}"
+    return None
+
+
+def normalize_name(name):
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    return _NON_WORD.sub(' ', name.lower()).strip()
+
+
+def make_place_key(name, latitude=None, longitude=None, href=None, cid=None, place_id=None):
+    """Key used for the unique index on places.place_key"""
+    if cid:
+        return f"cid:{cid}"
+    google_id = google_id_from_href(href)
+    if google_id:
+        return google_id
+    if place_id:
+        return f"pid:{place_id}"
+
+    parts = [normalize_name(name)]
+    for value in (latitude, longitude):
+        parts.append('' if value is None else f"{round(float(value), COORD_PRECISION):.{COORD_PRECISION}f}")
+    return 'h:' + hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
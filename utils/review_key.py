@@ -0,0 +1,25 @@
+"""
+Stable keys for reviews.
+
+Google's data-review-id is preferred. Without it, the key is a hash of
+the normalized author and text. The date is left out on purpose: Maps
+shows relative dates ("2 weeks ago") that change between scrapes, and a
+key that changes would never match the stored review again.
+"""
+
+import hashlib
+
+from utils.place_key import normalize_name
+
+
+def review_content_key(author, text):
+    """Hash key of a review's author and text"""
+    parts = [normalize_name(author), normalize_name(text)]
+    return 'h:' + hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def make_review_key(review_id=None, author=None, text=None):
+    """Key used for the unique index on place_reviews (place_id, review_key)"""
+    if review_id:
+        return f"rid:{review_id}"
+    return review_content_key(author, text)
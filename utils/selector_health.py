@@ -0,0 +1,292 @@
+"""
+Hit rates of the selector fallback cascades, kept between runs.
+
+Every extractor walks a list of selectors and takes the first that
+matches. The registry counts, per cascade group and selector, how often it
+was tried and how often it won:
+
+    from utils.selector_health import get_selector_health
+
+    health = get_selector_health()
+    selectors = health.order('card', CARD_SELECTORS)
+    ...                                   # walk `selectors`, index `hit` matched
+    health.record('card', selectors, hit)
+
+order() puts the historical winners first, so a lookup stops paying for
+selectors Google's markup no longer has. A selector that has missed
+SCRAPER_SELECTOR_DEAD_AFTER times in a row is flagged dead, logged once as
+a warning (early notice of a layout change) and moved to the back of its
+list. It is still tried, and a later hit revives it.
+
+Counts live in SQLite (SCRAPER_SELECTOR_HEALTH_FILE) and are written at
+most once per SCRAPER_SELECTOR_HEALTH_INTERVAL seconds and at exit. Each
+write adds this process's deltas with an upsert, so sharded workers share
+one file. SCRAPER_SELECTOR_HEALTH=0 keeps the static order and records
+nothing.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+from utils.logging_setup import get_logger
+from utils.paths import env_path
+
+log = get_logger(__name__)
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_HEALTH_PATH = os.path.join(project_root, 'data', 'selector_health.sqlite3')
+
+# Lookups a selector needs before its own hit rate outranks the list order
+MIN_SAMPLES = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS selector_health (
+    group_name TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    miss_streak INTEGER NOT NULL DEFAULT 0,
+    last_hit REAL,
+    last_seen REAL,
+    PRIMARY KEY (group_name, selector)
+);
+"""
+
+UPSERT = """
+INSERT INTO selector_health (group_name, selector, attempts, hits, miss_streak, last_hit, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(group_name, selector) DO UPDATE SET
+    attempts = attempts + excluded.attempts,
+    hits = hits + excluded.hits,
+    miss_streak = CASE WHEN excluded.hits > 0 THEN excluded.miss_streak
+                       ELSE miss_streak + excluded.miss_streak END,
+    last_hit = COALESCE(excluded.last_hit, last_hit),
+    last_seen = excluded.last_seen
+"""
+
+
+class SelectorStats:
+    __slots__ = ('attempts', 'hits', 'miss_streak', 'last_hit', 'last_seen')
+
+    def __init__(self, attempts=0, hits=0, miss_streak=0, last_hit=None, last_seen=None):
+        self.attempts = attempts
+        self.hits = hits
+        self.miss_streak = miss_streak
+        self.last_hit = last_hit
+        self.last_seen = last_seen
+
+    def hit_rate(self):
+        # Laplace smoothing: an untried selector scores 0.5, not 0 or 1
+        return (self.hits + 1) / (self.attempts + 2)
+
+
+class SelectorHealth:
+    """Persistent per-selector hit counts that reorder fallback cascades"""
+
+    enabled = True
+
+    def __init__(self, path=None, interval=None, dead_after=None):
+        self.path = path or env_path('SCRAPER_SELECTOR_HEALTH_FILE', DEFAULT_HEALTH_PATH)
+        self.interval = float(os.getenv('SCRAPER_SELECTOR_HEALTH_INTERVAL', 30)) if interval is None else interval
+        self.dead_after = dead_after or int(os.getenv('SCRAPER_SELECTOR_DEAD_AFTER', 25))
+        self.stats = {}     # (group, selector) -> SelectorStats, persisted plus this process
+        self._pending = {}  # (group, selector) -> SelectorStats, not yet written
+        self._orders = {}   # (group, selectors) -> ordered tuple, until the next flush
+        self._flagged = set()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.executescript(SCHEMA)
+            self._load()
+        except sqlite3.Error as e:
+            log.warning("⚠️ Selector health store unavailable, using static order: %s", e)
+        self._flagged = {key for key, stats in self.stats.items() if self.is_dead(stats)}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _load(self):
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT group_name, selector, attempts, hits, miss_streak, last_hit, last_seen FROM selector_health"
+            ).fetchall()
+        finally:
+            conn.close()
+        with self._lock:
+            self.stats = {(row[0], row[1]): SelectorStats(*row[2:]) for row in rows}
+            # What this process counted but has not written yet stays on top
+            for key, delta in self._pending.items():
+                stats = self.stats.setdefault(key, SelectorStats())
+                stats.attempts += delta.attempts
+                stats.hits += delta.hits
+                stats.miss_streak = delta.miss_streak if delta.hits else stats.miss_streak + delta.miss_streak
+
+    def is_dead(self, stats):
+        return stats.miss_streak >= self.dead_after
+
+    def order(self, group, selectors):
+        """`selectors` with proven winners first and dead ones last.
+
+        Selectors without MIN_SAMPLES lookups keep the neutral score, so a
+        new or rarely reached fallback does not jump ahead of the list's own
+        order. Ties keep the list order. The result is cached until the next
+        flush, so a hot loop sorts each group once per interval.
+        """
+        cache_key = (group, tuple(selectors))
+        ordered = self._orders.get(cache_key)
+        if ordered is None:
+            def rank(item):
+                position, selector = item
+                stats = self.stats.get((group, selector))
+                if stats is None:
+                    return 0, -0.5, position
+                if self.is_dead(stats):
+                    return 1, 0, position
+                score = stats.hit_rate() if stats.attempts >= MIN_SAMPLES else 0.5
+                return 0, -score, position
+
+            ordered = tuple(selector for _, selector in sorted(enumerate(selectors), key=rank))
+            self._orders[cache_key] = ordered
+        return list(ordered)
+
+    def order_fields(self, prefix, fields):
+        """Copy of a DETAIL_FIELDS-style table with every field's selectors ordered"""
+        return {
+            field: {**spec, 'selectors': self.order(f'{prefix}.{field}', spec['selectors'])}
+            for field, spec in fields.items()
+        }
+
+    def record(self, group, selectors, hit):
+        """Count one walk of `selectors`: those before index `hit` missed,
+        `hit` matched. hit=None means every selector missed."""
+        now = time.time()
+        tried = selectors if hit is None else selectors[:hit + 1]
+        newly_dead = []
+        with self._lock:
+            for i, selector in enumerate(tried):
+                key = (group, selector)
+                for table in (self.stats, self._pending):
+                    stats = table.get(key)
+                    if stats is None:
+                        stats = table[key] = SelectorStats()
+                    stats.attempts += 1
+                    stats.last_seen = now
+                    if i == hit:
+                        stats.hits += 1
+                        stats.miss_streak = 0
+                        stats.last_hit = now
+                    else:
+                        stats.miss_streak += 1
+                stats = self.stats[key]
+                if i == hit and key in self._flagged:
+                    self._flagged.discard(key)
+                    self._orders.clear()
+                    log.info("✅ Selector revived in %s: %s", group, selector)
+                elif self.is_dead(stats) and key not in self._flagged:
+                    self._flagged.add(key)
+                    self._orders.clear()
+                    newly_dead.append(selector)
+        for selector in newly_dead:
+            log.warning("⚠️ Selector looks dead in %s (%d misses in a row): %s",
+                        group, self.stats[(group, selector)].miss_streak, selector)
+        self.flush()
+
+    def flush(self, force=False):
+        """Write pending counts, at most once per interval unless forced, and
+        pick up what other processes wrote"""
+        if not force and time.monotonic() - self._last_flush < self.interval:
+            return
+        self._last_flush = time.monotonic()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        try:
+            if pending:
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.executemany(UPSERT, [
+                            (group, selector, s.attempts, s.hits, s.miss_streak, s.last_hit, s.last_seen)
+                            for (group, selector), s in pending.items()
+                        ])
+                finally:
+                    conn.close()
+            self._load()
+        except sqlite3.Error as e:
+            log.warning("⚠️ Could not save selector health: %s", e)
+            with self._lock:
+                for key, delta in pending.items():
+                    self._pending.setdefault(key, delta)
+        self._orders.clear()
+
+    def dead(self):
+        """(group, selector, stats) of every selector currently flagged dead"""
+        return [(group, selector, stats) for (group, selector), stats in sorted(self.stats.items())
+                if self.is_dead(stats)]
+
+    def report(self):
+        """Rows for /api/selectors: every selector with its counts, grouped, in tried order"""
+        groups = {}
+        for (group, selector), stats in self.stats.items():
+            groups.setdefault(group, []).append(selector)
+        rows = []
+        for group in sorted(groups):
+            for selector in self.order(group, sorted(groups[group])):
+                stats = self.stats[(group, selector)]
+                rows.append({
+                    'group': group,
+                    'selector': selector,
+                    'attempts': stats.attempts,
+                    'hits': stats.hits,
+                    'hit_rate': round(stats.hits / stats.attempts, 3) if stats.attempts else None,
+                    'miss_streak': stats.miss_streak,
+                    'dead': self.is_dead(stats),
+                    'last_hit': stats.last_hit,
+                })
+        return rows
+
+
+class StaticSelectors:
+    """Stand-in used when the registry is off: lists keep their order"""
+
+    enabled = False
+
+    def order(self, group, selectors):
+        return list(selectors)
+
+    def order_fields(self, prefix, fields):
+        return fields
+
+    def record(self, group, selectors, hit):
+        pass
+
+    def flush(self, force=False):
+        pass
+
+    def dead(self):
+        return []
+
+    def report(self):
+        return []
+
+
+_health = None
+
+
+def get_selector_health():
+    """The process-wide SelectorHealth, or StaticSelectors when SCRAPER_SELECTOR_HEALTH=0"""
+    global _health
+    if _health is None:
+        if os.getenv('SCRAPER_SELECTOR_HEALTH', '1') == '1':
+            _health = SelectorHealth()
+            atexit.register(_health.flush, True)
+        else:
+            _health = StaticSelectors()
+    return _health